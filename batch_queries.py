@@ -0,0 +1,105 @@
+import contextlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+_worker_answer = None
+
+
+def read_queries(lines):
+    """Parses JSONL query lines into (line number, query or None, error or None), skipping blank lines."""
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            query = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(query, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        yield line_number, query, None
+
+
+def count_param(query, name, default=None, nullable=True):
+    """Returns query[name], or default if it is absent, checked to be a non-negative integer (or null if nullable)."""
+    value = query.get(name, default)
+    if value is None and nullable:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise ValueError(f"'{name}' must be a non-negative integer" + (" or null" if nullable else ""))
+    return value
+
+
+def _answer_or_error(answer, query):
+    # Any failure is reported on the query's own line rather than ending the batch.
+    try:
+        return {'result': answer(query)}
+    except Exception as e:
+        return {'error': str(e) or type(e).__name__}
+
+
+def _init_worker(make_answer, data_path):
+    global _worker_answer
+    _worker_answer = make_answer(data_path)
+
+
+def _answer_in_worker(query):
+    return _answer_or_error(_worker_answer, query)
+
+
+def answer_queries(make_answer, data_path, queries, workers=1):
+    """Answers each query with the function make_answer(data_path) returns, in input order.
+
+    Identical queries are answered once. With more than one worker the
+    distinct queries are spread over worker processes, each of which loads
+    the data once through make_answer; make_answer must therefore be a
+    module-level function.
+    """
+    distinct = {}
+    for query in queries:
+        distinct.setdefault(json.dumps(query, sort_keys=True), query)
+
+    if workers == 1 or len(distinct) < 2:
+        answer = make_answer(data_path)
+        outcomes = [_answer_or_error(answer, query) for query in distinct.values()]
+    else:
+        workers = workers or os.cpu_count() or 1
+        chunk_size = max(1, len(distinct) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(make_answer, data_path)) as pool:
+            outcomes = list(pool.map(_answer_in_worker, distinct.values(), chunksize=chunk_size))
+
+    by_key = dict(zip(distinct, outcomes))
+    return [by_key[json.dumps(query, sort_keys=True)] for query in queries]
+
+
+def run_batch(make_answer, data_path, queries_file='-', output_file='-', workers=1):
+    """Reads JSONL queries from queries_file and writes one JSONL result per query to output_file.
+
+    '-' stands for stdin and stdout. Each output line holds the query's line
+    number and the query with either its "result" or an "error". The query
+    rate is reported on stderr, so it does not mix with results on stdout.
+    """
+    start = time.perf_counter()
+    with (contextlib.nullcontext(sys.stdin) if queries_file == '-' else open(queries_file)) as f:
+        parsed = list(read_queries(f))
+    queries = [query for _, query, error in parsed if error is None]
+    outcomes = iter(answer_queries(make_answer, data_path, queries, workers))
+
+    errors = 0
+    with (contextlib.nullcontext(sys.stdout) if output_file == '-' else open(output_file, 'w')) as out:
+        for line_number, query, error in parsed:
+            record = {'line': line_number, 'query': query}
+            record.update({'error': error} if error is not None else next(outcomes))
+            errors += 'error' in record
+            out.write(json.dumps(record) + '\n')
+
+    seconds = time.perf_counter() - start
+    rate = len(parsed) / seconds if seconds else 0
+    print(f"Answered {len(parsed)} queries ({errors} errors) in {seconds:.2f}s ({rate:.1f} queries/s)",
+          file=sys.stderr)
+    return len(parsed), errors
@@ -0,0 +1,64 @@
+"""Compares two benchmarks/run.py result files stage by stage.
+
+    python benchmarks/compare.py before.json after.json
+"""
+import argparse
+import json
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(before, after, threshold=0.10):
+    """Returns (stage, before seconds, after seconds, speedup, memory ratio, flag) for stages in both runs.
+
+    flag is 'slower' when a stage takes more than threshold longer than
+    before, 'faster' when it takes more than threshold less, and '' otherwise.
+    """
+    rows = []
+    for stage, old in before['results'].items():
+        new = after['results'].get(stage)
+        if new is None:
+            continue
+        speedup = old['seconds'] / new['seconds'] if new['seconds'] else None
+        memory_ratio = None
+        if old.get('peak_memory_bytes') and new.get('peak_memory_bytes') is not None:
+            memory_ratio = new['peak_memory_bytes'] / old['peak_memory_bytes']
+        flag = ''
+        if new['seconds'] > old['seconds'] * (1 + threshold):
+            flag = 'slower'
+        elif new['seconds'] < old['seconds'] * (1 - threshold):
+            flag = 'faster'
+        rows.append((stage, old['seconds'], new['seconds'], speedup, memory_ratio, flag))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Relative change in time reported as slower or faster (default: 0.10).")
+    args = parser.parse_args()
+
+    before, after = load_results(args.before), load_results(args.after)
+    if (before['postings'], before['resumes']) != (after['postings'], after['resumes']):
+        print(f"Warning: comparing runs of different sizes "
+              f"({before['postings']} vs {after['postings']} postings, "
+              f"{before['resumes']} vs {after['resumes']} resumes)")
+
+    print(f"{'stage':<20} {'before':>10} {'after':>10} {'speedup':>8} {'memory':>8}")
+    slower = False
+    for stage, old_seconds, new_seconds, speedup, memory_ratio, flag in compare(before, after, args.threshold):
+        speedup = f"{speedup:7.2f}x" if speedup is not None else ''
+        memory_ratio = f"{memory_ratio:7.2f}x" if memory_ratio is not None else ''
+        print(f"{stage:<20} {old_seconds:9.3f}s {new_seconds:9.3f}s {speedup:>8} {memory_ratio:>8}  {flag}")
+        slower = slower or flag == 'slower'
+    if slower:
+        exit(1)
+
+
+if __name__ == '__main__':
+    main()
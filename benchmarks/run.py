@@ -0,0 +1,227 @@
+"""Benchmarks the ETL, sector classification, skill search, sector rollups, related skills, PDF rendering and ATS scoring.
+
+Runs each stage on synthetic data of the chosen scale and saves wall time,
+throughput and peak traced memory as JSON, for comparing runs with
+benchmarks/compare.py:
+
+    python benchmarks/run.py --scale 10k
+    python benchmarks/run.py --scale 1m --stages etl classify search --output before.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from django.conf import settings
+
+if not settings.configured:
+    settings.configure()
+
+import synthetic
+import load
+from resume_builder.ats import calculate_ats_score_with_feedback, get_profile_cache
+from resume_builder.ats_batch import score_resumes_against_job
+from resume_builder.rendering import renderer
+from sector_classifier import classify_titles
+from sector_rollups import build_rollups
+from skill_cooccurrence import SkillCooccurrence
+from skill_index import SkillIndex, get_skill_index
+from skill_matrix import SkillMatrix
+from skills import find_jobs_with_matched_skills
+from snapshot import load_columns
+
+SCALES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+STAGES = ['etl', 'classify', 'search', 'rollups', 'related', 'render', 'ats']
+
+
+def measure(function, items, trace_memory=True):
+    """Runs function once for timing and, if trace_memory, once more under tracemalloc.
+
+    Tracing slows allocation-heavy code down, so time and peak memory come
+    from separate runs.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - start
+
+        peak_memory = None
+        if trace_memory:
+            tracemalloc.start()
+            try:
+                function()
+                peak_memory = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+    return {
+        'seconds': round(seconds, 6),
+        'items': items,
+        'items_per_second': round(items / seconds, 2) if seconds else None,
+        'peak_memory_bytes': peak_memory,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(postings, resume_count, stages, seed=0, trace_memory=True, queries=50):
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        sources = synthetic.write_sources(directory, postings, seed)
+        output_file = os.path.join(directory, 'merged_data.csv')
+        # The later stages read the ETL output, so it is always produced.
+        with contextlib.redirect_stdout(io.StringIO()):
+            load.run_etl(sources, output_file)
+        print(f"Generated {postings} postings; merged data has {len(load_columns(output_file, ['job_title']))} rows")
+
+        if 'etl' in stages:
+            results['etl'] = measure(lambda: load.run_etl(sources, output_file), postings, trace_memory)
+
+        merged = load_columns(output_file)
+        if 'classify' in stages:
+            titles = merged['job_title']
+            results['classify'] = measure(lambda: classify_titles(titles), len(titles), trace_memory)
+
+        if 'search' in stages:
+            rng = random.Random(seed)
+            searches = [', '.join(rng.sample(synthetic.SKILL_WORDS, rng.randint(1, 3))) for _ in range(queries)]
+
+            def search():
+                for query in searches:
+                    find_jobs_with_matched_skills(query, output_file)
+
+            def baseline_search():
+                # The original find_jobs_by_skill scan, with literal matching.
+                lowered = merged['skills'].str.lower()
+                for query in searches:
+                    for skill in query.split(','):
+                        lowered.str.contains(skill.lower().strip(), regex=False, na=False)
+
+            results['search_index'] = measure(lambda: SkillIndex.from_dataframe(merged), len(merged), trace_memory)
+            get_skill_index(output_file)
+            results['search'] = measure(search, len(searches), trace_memory)
+            results['search_baseline'] = measure(baseline_search, len(searches), trace_memory)
+            # SkillIndex.match alone against the scan; it also builds the row -> matched skills map the scan leaves out.
+            index = SkillIndex.from_dataframe(merged)
+            skill_lists = [[skill.lower().strip() for skill in query.split(',')] for query in searches]
+            results['search_match'] = measure(lambda: [index.match(skills) for skills in skill_lists],
+                                              len(searches), trace_memory)
+
+        if 'rollups' in stages:
+            results['rollups'] = measure(lambda: build_rollups(merged), len(merged), trace_memory)
+
+        if 'related' in stages:
+            skill_matrix = SkillMatrix.from_skills(merged['skills'])
+
+            def build_related():
+                return SkillCooccurrence.from_skill_matrix(skill_matrix, merged['Sector'])
+
+            results['related_build'] = measure(build_related, len(merged), trace_memory)
+            cooccurrence = build_related()
+            rng = random.Random(seed)
+            lookups = [(rng.choice(synthetic.SKILL_WORDS), rng.choice([None] + cooccurrence.sectors))
+                       for _ in range(queries * 100)]
+
+            def related():
+                for skill, sector in lookups:
+                    cooccurrence.related(skill, sector)
+
+            results['related'] = measure(related, len(lookups), trace_memory)
+
+    if 'render' in stages or 'ats' in stages:
+        resumes = synthetic.resumes(resume_count, seed)
+        job_descriptions = synthetic.job_descriptions(max(1, resume_count // 10), seed)
+
+    if 'render' in stages:
+        def render():
+            for resume_data in resumes:
+                renderer.render(resume_data, io.BytesIO())
+
+        results['render'] = measure(render, len(resumes), trace_memory)
+
+    if 'ats' in stages:
+        pairs = [(resume_data, job_descriptions[index % len(job_descriptions)])
+                 for index, resume_data in enumerate(resumes)]
+
+        def score(legacy):
+            for resume_data, job_description in pairs:
+                calculate_ats_score_with_feedback(resume_data, job_description, legacy=legacy)
+
+        get_profile_cache().clear()
+        results['ats'] = measure(lambda: score(False), len(pairs), trace_memory)
+        results['ats_legacy'] = measure(lambda: score(True), len(pairs), trace_memory)
+        results['ats_batch'] = measure(lambda: score_resumes_against_job(resumes, job_descriptions[0]),
+                                       len(resumes), trace_memory)
+    return results
+
+
+def parse_scale(value):
+    try:
+        return SCALES.get(value.lower()) or int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected one of {', '.join(SCALES)} or a number of postings, got: {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the job data and resume pipelines on synthetic data.")
+    parser.add_argument('--scale', type=parse_scale, default='10k',
+                        help=f"Number of synthetic postings: {', '.join(SCALES)} or a number (default: 10k).")
+    parser.add_argument('--resumes', type=int, default=200,
+                        help="Synthetic resumes to render and score (default: 200).")
+    parser.add_argument('--queries', type=int, default=50,
+                        help="Skill searches to time; most match a large share of the postings (default: 50).")
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', dest='trace_memory', action='store_false',
+                        help="Skip the tracemalloc runs that measure peak memory.")
+    parser.add_argument('--output', help="Results file (default: benchmarks/results/<timestamp>-<scale>.json).")
+    args = parser.parse_args()
+
+    started = datetime.now(timezone.utc)
+    results = run(args.scale, args.resumes, args.stages, args.seed, args.trace_memory, args.queries)
+    report = {
+        'started': started.isoformat(),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'postings': args.scale,
+        'resumes': args.resumes,
+        'queries': args.queries,
+        'seed': args.seed,
+        'results': results,
+    }
+
+    output = args.output or os.path.join(REPO_ROOT, 'benchmarks', 'results',
+                                         f"{started.strftime('%Y%m%dT%H%M%S')}-{args.scale}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    for stage, result in results.items():
+        memory = result['peak_memory_bytes']
+        memory = f"{memory / 2**20:8.1f} MiB" if memory is not None else ''
+        print(f"{stage:<20} {result['seconds']:10.3f}s {result['items_per_second'] or 0:14.1f} items/s {memory}")
+    print(f"Results saved to '{output}'")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Reproducible synthetic job postings, resumes and job descriptions for the benchmarks."""
+import random
+import numpy as np
+import pandas as pd
+
+TITLE_WORDS = [
+    'senior', 'junior', 'lead', 'principal', 'staff', 'assistant', 'associate', 'chief', 'head', 'remote',
+    'software', 'data', 'cloud', 'backend', 'frontend', 'mobile', 'security', 'network', 'sales', 'marketing',
+    'registered', 'clinical', 'legal', 'financial', 'retail', 'warehouse', 'construction', 'research', 'graphic',
+    'engineer', 'developer', 'analyst', 'scientist', 'manager', 'nurse', 'teacher', 'designer', 'counsel',
+    'accountant', 'driver', 'chef', 'clerk', 'technician', 'administrator', 'coordinator', 'specialist',
+    'consultant', 'director', 'representative', 'worker', 'volunteer', 'architect', 'recruiter', 'cashier',
+]
+
+SKILL_WORDS = [
+    'python', 'java', 'javascript', 'typescript', 'sql', 'aws', 'azure', 'docker', 'kubernetes', 'linux',
+    'excel', 'tableau', 'power bi', 'salesforce', 'sap', 'react', 'django', 'spark', 'hadoop', 'tensorflow',
+    'patient care', 'phlebotomy', 'cpr', 'ehr', 'medication administration', 'triage', 'bls', 'acls',
+    'accounting', 'budgeting', 'forecasting', 'auditing', 'payroll', 'quickbooks', 'negotiation', 'crm',
+    'project management', 'agile', 'scrum', 'communication', 'leadership', 'teamwork', 'customer service',
+    'inventory', 'forklift', 'logistics', 'cad', 'autocad', 'photoshop', 'figma', 'seo', 'content writing',
+    'contract law', 'litigation', 'compliance', 'lesson planning', 'curriculum design', 'food safety',
+]
+
+JD_WORDS = [
+    'we', 'are', 'hiring', 'looking', 'for', 'an', 'experienced', 'team', 'player', 'who', 'will', 'build',
+    'maintain', 'scale', 'our', 'platform', 'services', 'customers', 'must', 'have', 'strong', 'experience',
+    'with', 'and', 'the', 'in', 'years', 'of', 'required', 'preferred', 'plus', 'ability', 'to', 'work',
+    'cross', 'functional', 'fast', 'paced', 'environment', 'excellent', 'communication', 'skills',
+]
+
+ACTION_VERBS = ['managed', 'led', 'developed', 'created', 'implemented', 'improved', 'increased', 'reduced',
+                'optimized', 'designed', 'maintained', 'supported']
+
+
+def _vocabulary(rng, words, size, min_words, max_words):
+    return [' '.join(rng.choice(words) for _ in range(rng.randint(min_words, max_words))) for _ in range(size)]
+
+
+def job_postings(rows, seed=0, distinct_titles=None, distinct_skill_sets=None):
+    """Returns a DataFrame of rows synthetic postings with job_title and skills columns.
+
+    Titles and skill lists are drawn from pools of distinct values so the
+    data has the repetition real postings have: by default about one
+    distinct title per four rows.
+    """
+    rng = random.Random(seed)
+    distinct_titles = distinct_titles or max(1, min(rows // 4, 500_000))
+    distinct_skill_sets = distinct_skill_sets or max(1, min(rows // 2, 200_000))
+    titles = np.array(_vocabulary(rng, TITLE_WORDS, distinct_titles, 1, 4), dtype=object)
+    skill_sets = np.array([', '.join(rng.sample(SKILL_WORDS, rng.randint(2, 12))) for _ in range(distinct_skill_sets)],
+                          dtype=object)
+
+    np_rng = np.random.default_rng(seed)
+    skills = skill_sets[np_rng.integers(0, len(skill_sets), rows)]
+    skills[np_rng.random(rows) < 0.02] = np.nan
+    return pd.DataFrame({'job_title': titles[np_rng.integers(0, len(titles), rows)], 'skills': skills})
+
+
+def write_sources(directory, rows, seed=0):
+    """Writes two CSV sources laid out like load.SOURCES and returns source dicts for them.
+
+    The second source repeats part of the first one's titles, so the ETL
+    has duplicates to drop.
+    """
+    postings = job_postings(rows, seed)
+    split = rows * 2 // 3
+    first = postings.iloc[:split].rename(columns={'job_title': 'Job Title', 'skills': 'Skills'})
+    second = postings.iloc[split // 2:].rename(columns={'skills': 'job_skills'})
+    first['Job Title'] = first['Job Title'].str.title()
+
+    sources = [
+        {'path': f'{directory}/source_a.csv', 'title_column': 'Job Title', 'skills_column': 'Skills'},
+        {'path': f'{directory}/source_b.csv', 'title_column': 'job_title', 'skills_column': 'job_skills'},
+    ]
+    first.to_csv(sources[0]['path'], index=False)
+    second.to_csv(sources[1]['path'], index=False)
+    return sources
+
+
+def resume(rng, experience_entries):
+    """Returns resume_data in the shape create-resume accepts."""
+    def sentence(words):
+        return f"{rng.choice(ACTION_VERBS)} {' '.join(rng.choice(words) for _ in range(rng.randint(6, 14)))}"
+
+    return {
+        'name': f'Candidate {rng.randint(1, 10**6)}',
+        'email': 'candidate@example.com',
+        'phone': '555-0100',
+        'linkedin': 'linkedin.com/in/candidate',
+        'summary': ' '.join(rng.choice(JD_WORDS + SKILL_WORDS) for _ in range(rng.randint(20, 50))),
+        'skills': {'technical': rng.sample(SKILL_WORDS, 8), 'soft': rng.sample(SKILL_WORDS, 4)},
+        'experience': [{
+            'title': ' '.join(rng.sample(TITLE_WORDS, 2)),
+            'company': f'Company {index}',
+            'years': f'{2000 + index}-{2001 + index}',
+            'location': 'Remote',
+            'responsibilities': [{'responsibility': sentence(JD_WORDS + SKILL_WORDS)}
+                                 for _ in range(rng.randint(2, 5))],
+        } for index in range(experience_entries)],
+        'education': [{'degree': 'BSc Computer Science', 'university': 'State University', 'year': '2015'}],
+        'certifications': [{'name': 'Certified Professional', 'year': '2020', 'issuer': 'Institute'}],
+        'projects': [{'name': 'Project', 'description': sentence(JD_WORDS),
+                      'technologies': rng.sample(SKILL_WORDS, 3)}],
+    }
+
+
+def resumes(count, seed=0, min_experience=1, max_experience=20):
+    """Returns count resumes with min_experience to max_experience experience entries each."""
+    rng = random.Random(seed)
+    return [resume(rng, rng.randint(min_experience, max_experience)) for _ in range(count)]
+
+
+def job_descriptions(count, seed=0, min_words=80, max_words=600):
+    rng = random.Random(seed)
+    words = JD_WORDS * 3 + SKILL_WORDS
+    return [' '.join(rng.choice(words) for _ in range(rng.randint(min_words, max_words))) for _ in range(count)]
@@ -0,0 +1,19 @@
+import os
+import sys
+import django
+from django.conf import settings
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [REPO_ROOT, os.path.join(REPO_ROOT, 'benchmarks')]
+
+# Enough of the project for resume_builder's models, middleware and views,
+# without resume_creator's settings, which load the job market data.
+settings.configure(
+    INSTALLED_APPS=['resume_builder'],
+    DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+    ROOT_URLCONF='resume_builder.urls',
+    ALLOWED_HOSTS=['testserver'],
+    JOB_MARKET_PRELOAD=False,
+    USE_TZ=True,
+)
+django.setup()
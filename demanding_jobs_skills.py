@@ -1,37 +1,61 @@
-import pandas as pd
-from collections import Counter
+import argparse
+from batch_queries import count_param, run_batch
+from snapshot import load_columns
+from sector_rollups import load_rollups
 
 def get_demanding_data_by_sector(sector, data_path='merged_data.csv', top_n=10):
     try:
-        merged_data = pd.read_csv(data_path)
+        rollups = load_rollups(data_path)
     except FileNotFoundError:
         print(f"Error: Could not find data file at: {data_path}")
         return {}, {}
 
-    sector_data = merged_data[merged_data['Sector'].str.lower() == sector.lower()]
+    demand = sector_demand(rollups, sector, top_n)
 
-    if sector_data.empty:
+    if demand is None:
         print(f"No job postings found for the sector: {sector}")
         return {}, {}
 
-    job_title_counts = sector_data['job_title'].value_counts().head(top_n).to_dict()
+    return demand
 
-    all_skills = []
-    for skills_list in sector_data['skills'].dropna():
-        if isinstance(skills_list, str):
-            all_skills.extend([skill.strip().lower() for skill in skills_list.split(',')])
-        elif isinstance(skills_list, list):
-            all_skills.extend([skill.strip().lower() for skill in skills_list])
+def sector_demand(rollups, sector, top_n=10):
+    """Returns the top_n (job title counts, skill counts) of a sector from its rollup, or None if it has none.
 
-    skill_counts = Counter(all_skills).most_common(top_n)
-    top_demanding_skills = dict(skill_counts)
+    The rollups hold exact counts for the top ROLLUP_TOP_K values of each
+    sector, so a larger top_n returns that many.
+    """
+    sector_rollup = rollups.get(sector.lower())
+
+    if sector_rollup is None:
+        return None
+
+    if sector_rollup['top_k'] is not None:
+        top_n = min(top_n, sector_rollup['top_k'])
+
+    job_title_counts = dict(sector_rollup['titles'][:top_n])
+    top_demanding_skills = dict(sector_rollup['skills'][:top_n])
 
     return job_title_counts, top_demanding_skills
 
-if __name__ == '__main__':
-    data_path = 'merged_data.csv'  
+def batch_answerer(data_path='merged_data.csv'):
+    """Returns a function answering one batch query, {"sector": ..., "top_n": 10}, against rollups loaded once."""
+    rollups = load_rollups(data_path)
+
+    def answer(query):
+        sector = query.get('sector')
+        if not isinstance(sector, str):
+            raise ValueError("'sector' must be a string")
+        demand = sector_demand(rollups, sector, count_param(query, 'top_n', 10, nullable=False))
+        if demand is None:
+            raise ValueError(f"No job postings found for the sector: {sector}")
+        top_jobs, top_skills = demand
+        return {'top_jobs': top_jobs, 'top_skills': top_skills}
+
+    return answer
+
+def interactive(data_path='merged_data.csv'):
     try:
-        merged_df = pd.read_csv(data_path)
+        merged_df = load_columns(data_path, ['Sector'])
         unique_sectors = sorted(merged_df['Sector'].unique())
         print("Available Sectors:")
         for sector in unique_sectors:
@@ -43,7 +67,7 @@ if __name__ == '__main__':
             if user_sector.lower() == 'exit':
                 break
 
-            top_jobs_in_sector, top_skills_in_sector = get_demanding_data_by_sector(user_sector)
+            top_jobs_in_sector, top_skills_in_sector = get_demanding_data_by_sector(user_sector, data_path)
 
             print(f"\nTop Demanding Jobs in {user_sector}:")
             if top_jobs_in_sector:
@@ -62,3 +86,23 @@ if __name__ == '__main__':
 
     except FileNotFoundError:
         print(f"Error: Could not find data file at: {data_path}. Please ensure 'merged_data.csv' is in the correct location.")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Show the most demanded jobs and skills of a sector.")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="Answer the JSONL queries in FILE ('-' for stdin) instead of prompting, "
+                             'one per line like {"sector": "Technology", "top_n": 5}.')
+    parser.add_argument('--output', default='-', help="File for the JSONL results of --batch (default: stdout).")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes for --batch (default: 1, 0 for all cores).")
+    parser.add_argument('--data', default='merged_data.csv')
+    args = parser.parse_args()
+
+    if args.batch is None:
+        interactive(args.data)
+    else:
+        try:
+            run_batch(batch_answerer, args.data, args.batch, args.output, args.workers)
+        except FileNotFoundError as e:
+            print(f"Error: Could not find file: {e.filename}")
+            exit(1)
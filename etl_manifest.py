@@ -0,0 +1,142 @@
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from snapshot import artifact_path, data_fingerprint
+
+MANIFEST_VERSION = 2
+# Element types of the manifest's array files: the row hashes of each source,
+# and the title hash and source position of each output row. The files have no
+# header, so runs that only add rows append to them.
+ARRAY_DTYPES = {'row_hashes': np.uint64, 'title_hashes': np.uint64, 'origins': np.int32}
+
+
+def hash_rows(frame):
+    """Returns a 64-bit hash of each normalized (job_title, skills) row."""
+    return pd.util.hash_pandas_object(frame[['job_title', 'skills']], index=False).to_numpy()
+
+
+def hash_titles(titles):
+    """Returns a 64-bit hash of each normalized job title."""
+    return pd.util.hash_pandas_object(pd.Series(titles, dtype=object), index=False).to_numpy()
+
+
+def _source_key(source):
+    return {'path': os.path.abspath(source['path']),
+            'title_column': source['title_column'],
+            'skills_column': source['skills_column']}
+
+
+def _array_path(manifest_dir, name):
+    return os.path.join(manifest_dir, name)
+
+
+def _read_array(manifest_dir, name, kind, count):
+    values = np.fromfile(_array_path(manifest_dir, name), dtype=ARRAY_DTYPES[kind], count=count)
+    if len(values) != count:
+        raise ValueError(f"Manifest file {name} is truncated")
+    return values
+
+
+def _write_array(manifest_dir, name, kind, values, mode):
+    with open(_array_path(manifest_dir, name), mode) as f:
+        f.write(np.asarray(values, dtype=ARRAY_DTYPES[kind]).tobytes())
+
+
+def _append_array(manifest_dir, name, kind, count, values):
+    """Appends values after the first count elements, dropping anything an interrupted run left behind."""
+    with open(_array_path(manifest_dir, name), 'r+b') as f:
+        f.truncate(count * np.dtype(ARRAY_DTYPES[kind]).itemsize)
+    _write_array(manifest_dir, name, kind, values, 'ab')
+
+
+def _write_meta(manifest_dir, meta):
+    meta_path = os.path.join(manifest_dir, 'manifest.json')
+    with open(meta_path + '.tmp', 'w') as f:
+        json.dump(meta, f)
+    os.replace(meta_path + '.tmp', meta_path)
+
+
+def load_manifest(sources, output_file):
+    """Returns the manifest of the last ETL run into output_file.
+
+    Returns None when there is no usable manifest: it is missing, written by
+    another version, built from a different list of sources, or the output
+    has changed since.
+    """
+    manifest_dir = artifact_path(output_file, 'manifest')
+    try:
+        with open(os.path.join(manifest_dir, 'manifest.json')) as f:
+            manifest = json.load(f)
+        output_fingerprint = data_fingerprint(output_file)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    if (manifest.get('version') != MANIFEST_VERSION
+            or manifest.get('output') != output_fingerprint
+            or [entry['source'] for entry in manifest['sources']] != [_source_key(source) for source in sources]):
+        return None
+
+    try:
+        manifest['origins'] = _read_array(manifest_dir, 'origins', 'origins', manifest['rows'])
+        manifest['title_hashes'] = _read_array(manifest_dir, 'title_hashes', 'title_hashes', manifest['rows'])
+        for position, entry in enumerate(manifest['sources']):
+            entry['row_hashes'] = _read_array(manifest_dir, f'source_{position}', 'row_hashes', entry['rows'])
+    except (FileNotFoundError, ValueError):
+        return None
+    return manifest
+
+
+def save_manifest(sources, output_file, source_fingerprints, row_hashes, origins, title_hashes):
+    """Records per-source fingerprints and row hashes, and the title hash and source of each output row."""
+    manifest_dir = artifact_path(output_file, 'manifest')
+    tmp_dir = manifest_dir + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    for position, hashes in enumerate(row_hashes):
+        _write_array(tmp_dir, f'source_{position}', 'row_hashes', hashes, 'wb')
+    _write_array(tmp_dir, 'origins', 'origins', origins, 'wb')
+    _write_array(tmp_dir, 'title_hashes', 'title_hashes', title_hashes, 'wb')
+    _write_meta(tmp_dir, {
+        'version': MANIFEST_VERSION,
+        'output': data_fingerprint(output_file),
+        'rows': len(origins),
+        'sources': [{'source': _source_key(source), 'fingerprint': fingerprint, 'rows': len(hashes)}
+                    for source, fingerprint, hashes in zip(sources, source_fingerprints, row_hashes)],
+    })
+
+    old_dir = manifest_dir + '.old'
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(manifest_dir):
+        os.rename(manifest_dir, old_dir)
+    os.rename(tmp_dir, manifest_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return manifest_dir
+
+
+def append_manifest(manifest, output_file, source_fingerprints, new_row_hashes, new_origins, new_title_hashes):
+    """Extends the manifest load_manifest returned after rows were appended to output_file.
+
+    new_row_hashes holds the hashes of the rows added to each source, and
+    new_origins and new_title_hashes describe the rows added to the output.
+    Only those are written; manifest.json is replaced last.
+    """
+    manifest_dir = artifact_path(output_file, 'manifest')
+    rows = manifest['rows']
+    _append_array(manifest_dir, 'origins', 'origins', rows, new_origins)
+    _append_array(manifest_dir, 'title_hashes', 'title_hashes', rows, new_title_hashes)
+    sources = []
+    for position, (entry, fingerprint, hashes) in enumerate(zip(manifest['sources'], source_fingerprints,
+                                                                new_row_hashes)):
+        _append_array(manifest_dir, f'source_{position}', 'row_hashes', entry['rows'], hashes)
+        sources.append({'source': entry['source'], 'fingerprint': fingerprint, 'rows': entry['rows'] + len(hashes)})
+
+    _write_meta(manifest_dir, {
+        'version': MANIFEST_VERSION,
+        'output': data_fingerprint(output_file),
+        'rows': rows + len(new_origins),
+        'sources': sources,
+    })
+    return manifest_dir
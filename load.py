@@ -1,104 +1,349 @@
 import warnings
 warnings.filterwarnings("ignore", category=FutureWarning)
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
-import re
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-
-nltk.download('punkt', quiet=True)
-nltk.download('stopwords', quiet=True)
-nltk.download('punkt_tab', quiet=True)
-stop_words = set(stopwords.words('english'))
+from etl_manifest import append_manifest, hash_rows, hash_titles, load_manifest, save_manifest
+from near_dedupe import merge_near_duplicates
+from sector_classifier import classify_titles
+from snapshot import CSV_NA_VALUES, append_snapshot, artifact_path, data_fingerprint, write_snapshot
+from sector_rollups import append_to_rollups, write_rollups
+from skill_cooccurrence import write_skill_cooccurrence
+from skill_matrix import append_to_skill_matrix, write_skill_matrix
+from title_dedup import TitleDeduper
 
 linkedin_path = "C:/Users/Lenovo/Desktop/CN datasets/cleaned_jobs_data.csv"
 swetha_path = "C:/Users/Lenovo/Desktop/CN datasets/2025data.csv"
 output_file = 'merged_data.csv'
 
-try:
-    df_linkedin = pd.read_csv(linkedin_path)
-    df_swetha = pd.read_csv(swetha_path)
-except FileNotFoundError as e:
-    print(f"Error loading a CSV dataset: {e}")
-    exit()
-
-df_swetha = df_swetha.rename(columns={'Job Title': 'job_title', 'Skills': 'swetha_skills'})
-df_linkedin = df_linkedin.rename(columns={'job_skills': 'linkedin_skills'})
-
-df_swetha_cleaned = df_swetha[['job_title', 'swetha_skills']].copy()
-df_linkedin_cleaned = df_linkedin[['job_title', 'linkedin_skills']].copy()
-
-df_swetha_cleaned['job_title'] = df_swetha_cleaned['job_title'].astype(str).str.lower()
-df_linkedin_cleaned['job_title'] = df_linkedin_cleaned['job_title'].astype(str).str.lower()
-
-merged_df = pd.concat([df_swetha_cleaned, df_linkedin_cleaned], ignore_index=True, sort=False)
-print(f"Total rows after initial merge: {len(merged_df)}")
-
-merged_df.drop_duplicates(subset=['job_title'], keep='first', inplace=True)
-print(f"Total rows after deduplication (based on job title): {len(merged_df)}")
-
-merged_df['skills'] = merged_df['swetha_skills'].fillna('') + ', ' + merged_df['linkedin_skills'].fillna('')
-merged_df['skills'] = merged_df['skills'].str.strip(', ').replace(r', , ', ', ', regex=True)
-
-merged_df.drop(columns=['swetha_skills', 'linkedin_skills'], errors='ignore', inplace=True)
-
-def infer_sector_from_title(title):
-    title = str(title).lower()
-    if re.search(r'software|engineer|developer|programmer|tech|it|cloud|data science|ai|machine learning|cybersecurity|\.net', title) and not re.search(r'(?<!medical\s)nurse|(?<!home\s)health|rn|lpn|cna|medical assistant|therapist|psychologist', title):
-        return 'Technology'
-    elif re.search(r'nurse|doctor|health|medical|pharma|biotech|therapist|assistant|rn|lpn|cna|medical assistant|physician|surgeon|psychiatrist|mammography|care manager|hospice|patient|clinician|caregiver', title):
-        return 'Healthcare'
-    elif re.search(r'clinical psychologist|psychologist', title):
-        return 'Healthcare' # Or consider 'Social Services' based on context
-    elif re.search(r'finance|bank|investment|analyst|trading|financial|accountant|accounting|tax|teller', title):
-        return 'Finance'
-    elif re.search(r'market|sales|business development|advertising|pr|marketing|sales|events', title):
-        return 'Marketing & Sales'
-    elif re.search(r'manufactur|engineer|production|quality|supply chain|mechanical|electrical|civil|welder|fabricator|machinist|qa', title):
-        return 'Manufacturing & Engineering'
-    elif re.search(r'educat|teacher|professor|training|instruction|lecturer|faculty|instructor|coach|tutor', title):
-        return 'Education'
-    elif re.search(r'retail|customer service|sales associate|merchandis|store|cashier|clerk|grocery', title):
-        return 'Retail & Customer Service'
-    elif re.search(r'human resources|hr|talent|recruitment|people', title):
-        return 'Human Resources'
-    elif re.search(r'legal|law|compliance|attorney|paralegal|counsel', title):
-        return 'Legal'
-    elif re.search(r'construct|architect|civil|structural|builder', title):
-        return 'Construction & Architecture'
-    elif re.search(r'research|scientist|laboratory|investigator', title):
-        return 'Research & Development'
-    elif re.search(r'design|designer|ux|ui|graphic|creative', title):
-        return 'Design'
-    elif re.search(r'project manager|program manager|agile|scrum', title):
-        return 'Project Management'
-    elif re.search(r'support|help desk|technician|administrator|operations|office assistant|administrative assistant|secretary|clerical', title):
-        return 'IT Support & Operations' # Including admin roles here for now
-    elif re.search(r'operations manager|branch manager|superintendent|director', title):
-        return 'Management'
-    elif re.search(r'restaurant|chef|cook|food|beverage|hospitality|waiter|waitress', title):
-        return 'Food & Beverage'
-    elif re.search(r'veterinarian|dentist|animal care', title):
-        return 'Animal Care'
-    elif re.search(r'warehouse|driver|logistics|transportation|supply chain|inventory', title):
-        return 'Logistics & Transportation'
-    elif re.search(r'social worker|social services|case manager', title):
-        return 'Social Services'
-    elif re.search(r'volunteer|non-profit|charity|ngo', title):
-        return 'Non-profit/Volunteer'
-    return 'Other'
-
-merged_df['Sector'] = merged_df['job_title'].apply(infer_sector_from_title)
-print("Sector column added to the merged DataFrame.")
-
-merged_df.to_csv(output_file, index=False)
-print(f"\nMerged data with job_title, skills, and sector (from CSVs only) saved to '{output_file}'")
-
-print("\nFirst 5 rows of the merged data:")
-print(merged_df.head())
-
-if 'skills' in merged_df.columns:
-    print("\nSample of skills from the merged data:")
-    print(merged_df['skills'].head(20))
-else:
-    print("\n'skills' column is still empty or not created as expected. Please check the data loading and merging steps.")
+# Sources in merge order: when a job title appears more than once, the row
+# from the earliest source wins.
+SOURCES = [
+    {'path': swetha_path, 'title_column': 'Job Title', 'skills_column': 'Skills'},
+    {'path': linkedin_path, 'title_column': 'job_title', 'skills_column': 'job_skills'},
+]
+
+# Rough in-memory size of one parsed source row, used to size chunks.
+ROW_BYTES_ESTIMATE = 2048
+
+
+def normalize_source(df, source):
+    """Selects a source's title and skills columns under the merged column names."""
+    cleaned = pd.DataFrame({
+        'job_title': df[source['title_column']].astype(str).str.lower(),
+        'skills': df[source['skills_column']],
+    })
+    return cleaned
+
+
+def clean_skills(skills):
+    skills = skills.fillna('') + ', '
+    return skills.str.strip(', ').replace(r', , ', ', ', regex=True)
+
+
+def finish_rows(merged_df):
+    """Cleans the skills text and adds the Sector column to deduplicated rows."""
+    merged_df['skills'] = clean_skills(merged_df['skills'])
+    merged_df['Sector'] = classify_titles(merged_df['job_title'])
+    return merged_df
+
+
+def read_source(source, **kwargs):
+    return pd.read_csv(source['path'], usecols=[source['title_column'], source['skills_column']], **kwargs)
+
+
+def parse_source_spec(spec):
+    """Parses a --source value of the form PATH[,TITLE_COLUMN,SKILLS_COLUMN]."""
+    parts = spec.rsplit(',', 2)
+    if len(parts) == 3:
+        path, title_column, skills_column = parts
+    elif len(parts) == 1:
+        path, title_column, skills_column = spec, 'job_title', 'skills'
+    else:
+        raise argparse.ArgumentTypeError(f"Expected PATH or PATH,TITLE_COLUMN,SKILLS_COLUMN, got: {spec}")
+    return {'path': path, 'title_column': title_column, 'skills_column': skills_column}
+
+
+def write_outputs(merged_df, output_file):
+    merged_df.to_csv(output_file, index=False)
+    print(f"\nMerged data with job_title, skills, and sector (from CSVs only) saved to '{output_file}'")
+
+    snapshot_dir = write_snapshot(merged_df, output_file)
+    print(f"Columnar snapshot of the merged data saved to '{snapshot_dir}'")
+
+    rollups_path = write_rollups(output_file)
+    print(f"Per-sector job title and skill rollups saved to '{rollups_path}'")
+
+    matrix_path = write_skill_matrix(output_file)
+    print(f"Skill vocabulary and job x skill matrix saved to '{matrix_path}'")
+
+    cooccurrence_path = write_skill_cooccurrence(output_file)
+    print(f"Skill co-occurrence counts, overall and per sector, saved to '{cooccurrence_path}'")
+
+
+def collapse_near_duplicates(merged_df, threshold, output_file):
+    """Merges near-duplicate titles and saves the cluster map next to output_file."""
+    merged_df, cluster_map = merge_near_duplicates(merged_df, threshold)
+    print(f"Total rows after near-duplicate merging (similarity >= {threshold}): {len(merged_df)}")
+
+    cluster_map_file = artifact_path(output_file, 'title_clusters.csv')
+    cluster_map.to_csv(cluster_map_file, index=False)
+    print(f"Near-duplicate title clusters saved to '{cluster_map_file}'")
+    return merged_df
+
+
+def merge_frames(frames, near_dedupe_threshold=None, output_file=output_file):
+    """Concatenates normalized sources, keeps the first row per title and classifies them."""
+    merged_df = pd.concat(frames, ignore_index=True, sort=False)
+    print(f"Total rows after initial merge: {len(merged_df)}")
+
+    merged_df.drop_duplicates(subset=['job_title'], keep='first', inplace=True)
+    print(f"Total rows after deduplication (based on job title): {len(merged_df)}")
+
+    if near_dedupe_threshold is not None:
+        merged_df = collapse_near_duplicates(merged_df, near_dedupe_threshold, output_file)
+
+    merged_df = finish_rows(merged_df)
+    print("Sector column added to the merged DataFrame.")
+    return merged_df
+
+
+def run_etl(sources=SOURCES, output_file=output_file, near_dedupe_threshold=None):
+    frames = [normalize_source(read_source(source), source) for source in sources]
+    merged_df = merge_frames(frames, near_dedupe_threshold, output_file)
+    write_outputs(merged_df, output_file)
+    return merged_df
+
+
+def _read_and_normalize(source):
+    return normalize_source(read_source(source), source)
+
+
+def run_parallel_etl(sources=SOURCES, output_file=output_file, workers=None, near_dedupe_threshold=None):
+    """Merges the sources like run_etl, spreading the work over a process pool.
+
+    Sources are parsed and normalized in parallel. Deduplication runs once on
+    the combined rows in source order, so the first occurrence of a title
+    still wins. The deduplicated rows are then split into contiguous
+    partitions for skills cleanup and sector classification. Results are
+    reassembled in partition order, so the output does not depend on which
+    worker finishes first.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        frames = list(pool.map(_read_and_normalize, sources))
+
+        merged_df = pd.concat(frames, ignore_index=True, sort=False)
+        print(f"Total rows after initial merge: {len(merged_df)}")
+
+        merged_df.drop_duplicates(subset=['job_title'], keep='first', inplace=True)
+        print(f"Total rows after deduplication (based on job title): {len(merged_df)}")
+
+        if near_dedupe_threshold is not None:
+            merged_df = collapse_near_duplicates(merged_df, near_dedupe_threshold, output_file)
+
+        partitions = [merged_df.iloc[bounds[0]:bounds[-1] + 1]
+                      for bounds in np.array_split(np.arange(len(merged_df)), workers) if len(bounds)]
+        merged_df = pd.concat(pool.map(finish_rows, partitions), sort=False) if partitions else finish_rows(merged_df)
+        print("Sector column added to the merged DataFrame.")
+
+    write_outputs(merged_df, output_file)
+    return merged_df
+
+
+def _rebuild_with_manifest(sources, output_file):
+    fingerprints = [data_fingerprint(source['path']) for source in sources]
+    frames = [normalize_source(read_source(source), source) for source in sources]
+    row_hashes = [hash_rows(frame) for frame in frames]
+
+    merged_df = merge_frames(frames)
+    offsets = np.cumsum([len(frame) for frame in frames])
+    origins = np.searchsorted(offsets, merged_df.index.to_numpy(), side='right')
+
+    write_outputs(merged_df, output_file)
+    save_manifest(sources, output_file, fingerprints, row_hashes, origins, hash_titles(merged_df['job_title']))
+    return merged_df
+
+
+def _title_origins(manifest, titles):
+    """Returns the position of the source each title came from, or -1 for titles not in the output yet.
+
+    Titles are looked up by the hashes the manifest keeps of the output's
+    normalized titles, so the output itself is not read.
+    """
+    known = manifest['title_hashes']
+    origins = np.full(len(titles), -1, dtype=np.int64)
+    if not len(known) or not len(titles):
+        return origins
+    order = np.argsort(known, kind='stable')
+    hashes = hash_titles(titles)
+    positions = np.minimum(np.searchsorted(known[order], hashes), len(known) - 1)
+    found = known[order[positions]] == hashes
+    origins[found] = manifest['origins'][order[positions[found]]]
+    return origins
+
+
+def run_incremental_etl(sources=SOURCES, output_file=output_file):
+    """Merges only the rows added to the sources since the last run.
+
+    Sources whose size and modification time match the manifest are not read.
+    A changed source is hashed row by row. When its previous rows are still
+    present in the same order, only the appended rows are deduplicated,
+    classified and appended to output_file. The snapshot, manifest and
+    sector rollups are extended with the same rows; the existing output is
+    neither read nor rewritten. Anything else falls back to a full rebuild:
+    edited or removed rows, a new title that a lower-priority source already
+    contributed, or a missing or mismatched manifest.
+    """
+    manifest = load_manifest(sources, output_file)
+    if manifest is None:
+        print("No usable ETL manifest found; rebuilding the merged data from scratch.")
+        return _rebuild_with_manifest(sources, output_file)
+
+    fingerprints, new_row_hashes, new_frames = [], [], []
+    for position, (source, entry) in enumerate(zip(sources, manifest['sources'])):
+        fingerprint = data_fingerprint(source['path'])
+        fingerprints.append(fingerprint)
+        if fingerprint == entry['fingerprint']:
+            new_row_hashes.append(np.empty(0, dtype=np.uint64))
+            continue
+
+        frame = normalize_source(read_source(source), source)
+        hashes = hash_rows(frame)
+        previous = entry['row_hashes']
+        if len(hashes) < len(previous) or not np.array_equal(hashes[:len(previous)], previous):
+            print(f"Rows changed or removed in '{source['path']}'; rebuilding the merged data from scratch.")
+            return _rebuild_with_manifest(sources, output_file)
+        new_row_hashes.append(hashes[len(previous):])
+
+        new_rows = frame.iloc[len(previous):]
+        title_origins = _title_origins(manifest, new_rows['job_title'])
+        if (title_origins > position).any():
+            print(f"New rows in '{source['path']}' override titles from a later source; rebuilding the merged data from scratch.")
+            return _rebuild_with_manifest(sources, output_file)
+        new_rows = new_rows[title_origins < 0]
+        new_frames.append(new_rows.assign(origin=position))
+
+    new_rows = pd.concat(new_frames, ignore_index=True) if new_frames else pd.DataFrame(columns=['job_title', 'skills', 'origin'])
+    new_rows = new_rows.drop_duplicates(subset=['job_title'], keep='first')
+    print(f"New rows to merge: {len(new_rows)}")
+
+    new_origins = new_rows['origin'].to_numpy(dtype=np.int32)
+    new_title_hashes = hash_titles(new_rows['job_title'])
+    if not new_rows.empty:
+        previous_output = data_fingerprint(output_file)
+        new_rows = finish_rows(new_rows.drop(columns=['origin']).reset_index(drop=True))
+        new_rows.to_csv(output_file, mode='a', header=False, index=False)
+        print(f"Appended {len(new_rows)} rows to '{output_file}'")
+
+        # Derived outputs see the rows as a reader of the CSV would.
+        new_rows = new_rows.mask(new_rows.isin(list(CSV_NA_VALUES)))
+        append_snapshot(new_rows, output_file, previous_output)
+        append_to_rollups(new_rows, output_file)
+        append_to_skill_matrix(new_rows['skills'], output_file)
+        # Rebuilt from the updated skill matrix; the sparse products are cheap next to parsing.
+        write_skill_cooccurrence(output_file)
+
+    append_manifest(manifest, output_file, fingerprints, new_row_hashes, new_origins, new_title_hashes)
+    return new_rows
+
+
+def run_streaming_etl(sources=SOURCES, output_file=output_file, memory_budget_mb=512, chunk_rows=None):
+    """Merges the sources chunk by chunk with peak memory bounded by the budget.
+
+    Half of the budget goes to the chunk being processed and half to the set
+    of job titles already written. Rows are deduplicated, classified and
+    appended to output_file one chunk at a time. The columnar snapshot, sector
+    rollups, skill matrix and skill co-occurrence counts need the whole table
+    in memory and are not written in this mode; readers fall back to the CSV.
+    """
+    memory_budget = memory_budget_mb * 1024 * 1024
+    if chunk_rows is None:
+        chunk_rows = max(1000, memory_budget // 2 // ROW_BYTES_ESTIMATE)
+    deduper = TitleDeduper(memory_budget // 2, spill_dir=os.path.dirname(os.path.abspath(output_file)))
+
+    tmp_file = output_file + '.tmp'
+    total_rows = 0
+    written_rows = 0
+    header = True
+    try:
+        for source in sources:
+            for chunk in read_source(source, chunksize=chunk_rows):
+                chunk = normalize_source(chunk, source)
+                total_rows += len(chunk)
+
+                chunk = chunk[deduper.first_occurrences(chunk['job_title'])]
+                if chunk.empty:
+                    continue
+                chunk = finish_rows(chunk.copy())
+                chunk.to_csv(tmp_file, mode='w' if header else 'a', header=header, index=False)
+                header = False
+                written_rows += len(chunk)
+        if header:
+            pd.DataFrame(columns=['job_title', 'skills', 'Sector']).to_csv(tmp_file, index=False)
+        os.replace(tmp_file, output_file)
+    finally:
+        deduper.close()
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+    print(f"Total rows read: {total_rows}")
+    print(f"Total rows after deduplication (based on job title): {written_rows}")
+    print(f"\nMerged data with job_title, skills, and sector (from CSVs only) saved to '{output_file}'")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge the job datasets into merged_data.csv.")
+    parser.add_argument('--output', default=output_file)
+    parser.add_argument('--source', dest='sources', action='append', type=parse_source_spec,
+                        metavar='PATH[,TITLE_COLUMN,SKILLS_COLUMN]',
+                        help="Input CSV to merge; repeat for each source, in priority order. "
+                             "Columns default to job_title and skills. Defaults to the built-in SOURCES.")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes for parsing and classification (default: 1, 0 for all cores).")
+    parser.add_argument('--near-dedupe', dest='near_dedupe_threshold', type=float, nargs='?', const=0.85, default=None,
+                        metavar='THRESHOLD',
+                        help="Also merge near-duplicate job titles whose estimated word-set similarity is at least "
+                             "THRESHOLD (default: 0.85), and save the title clusters for auditing.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only merge rows added to the sources since the last --incremental run.")
+    parser.add_argument('--stream', action='store_true',
+                        help="Process the sources in chunks with bounded memory instead of loading them whole.")
+    parser.add_argument('--memory-budget-mb', type=int, default=512,
+                        help="Peak memory budget for --stream (default: 512).")
+    parser.add_argument('--chunk-rows', type=int, default=None,
+                        help="Rows per chunk for --stream (default: derived from the memory budget).")
+    args = parser.parse_args()
+    if args.near_dedupe_threshold is not None and (args.stream or args.incremental):
+        parser.error("--near-dedupe needs the whole table and cannot be combined with --stream or --incremental")
+
+    sources = args.sources or SOURCES
+    try:
+        if args.stream:
+            run_streaming_etl(sources, args.output, args.memory_budget_mb, args.chunk_rows)
+            return
+        if args.incremental:
+            run_incremental_etl(sources, args.output)
+            return
+        if args.workers == 1:
+            merged_df = run_etl(sources, args.output, args.near_dedupe_threshold)
+        else:
+            merged_df = run_parallel_etl(sources, args.output, args.workers or None, args.near_dedupe_threshold)
+    except FileNotFoundError as e:
+        print(f"Error loading a CSV dataset: {e}")
+        exit()
+
+    print("\nFirst 5 rows of the merged data:")
+    print(merged_df.head())
+
+    if 'skills' in merged_df.columns:
+        print("\nSample of skills from the merged data:")
+        print(merged_df['skills'].head(20))
+    else:
+        print("\n'skills' column is still empty or not created as expected. Please check the data loading and merging steps.")
+
+
+if __name__ == '__main__':
+    main()
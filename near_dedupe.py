@@ -0,0 +1,165 @@
+import re
+import numpy as np
+import pandas as pd
+
+NUM_PERM = 128
+BANDS = 16
+BLOCK_ROWS = 100_000
+NO_WORDS = np.iinfo(np.uint32).max
+
+ABBREVIATIONS = {
+    'sr': 'senior',
+    'snr': 'senior',
+    'jr': 'junior',
+    'mgr': 'manager',
+    'eng': 'engineer',
+    'engr': 'engineer',
+    'dev': 'developer',
+    'asst': 'assistant',
+    'assoc': 'associate',
+    'admin': 'administrator',
+    'dir': 'director',
+    'coord': 'coordinator',
+    'rep': 'representative',
+    'spec': 'specialist',
+    'tech': 'technician',
+}
+
+_NON_WORD = re.compile(r'[^a-z0-9+#]+')
+
+
+def title_tokens(title):
+    """Returns the set of normalized words of a job title."""
+    words = _NON_WORD.split(str(title).lower())
+    return {ABBREVIATIONS.get(word, word) for word in words if word}
+
+
+def _token_hashes(titles):
+    """Explodes titles into (row ID, 64-bit token hash) pairs."""
+    tokens = pd.Series([sorted(title_tokens(title)) for title in titles], dtype=object).explode().dropna()
+    hashes = pd.util.hash_pandas_object(tokens, index=False).to_numpy()
+    return tokens.index.to_numpy(), hashes
+
+
+def minhash_signatures(titles, num_perm=NUM_PERM, seed=1):
+    """Computes a MinHash signature of each title's word set.
+
+    Uses num_perm multiply-shift hash functions ((a * x + b) mod 2**64) >> 32
+    with random odd a. The shift leaves 32-bit values, so signatures are
+    stored as uint32. Rows are processed in blocks so memory stays
+    proportional to the block size. Titles without words get an all-max
+    signature (NO_WORDS).
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, np.iinfo(np.int64).max, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, np.iinfo(np.int64).max, size=num_perm, dtype=np.uint64)
+
+    titles = list(titles)
+    signatures = np.full((len(titles), num_perm), NO_WORDS, dtype=np.uint32)
+    for start in range(0, len(titles), BLOCK_ROWS):
+        rows, hashes = _token_hashes(titles[start:start + BLOCK_ROWS])
+        if not len(rows):
+            continue
+        permuted = (hashes[:, None] * a + b) >> np.uint64(32)
+        group_starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+        signatures[start + rows[group_starts]] = np.minimum.reduceat(permuted, group_starts, axis=0).astype(np.uint32)
+    return signatures
+
+
+def _similarity(signatures, rows, others):
+    """Estimated Jaccard similarity of each row to the matching other row, compared a block at a time."""
+    similarity = np.empty(len(rows))
+    for start in range(0, len(rows), BLOCK_ROWS):
+        end = start + BLOCK_ROWS
+        similarity[start:end] = (signatures[rows[start:end]] == signatures[others[start:end]]).mean(axis=1)
+    return similarity
+
+
+def _find(parents, row_id):
+    root = row_id
+    while parents[root] != root:
+        root = parents[root]
+    while parents[row_id] != root:
+        parents[row_id], row_id = root, parents[row_id]
+    return root
+
+
+def cluster_titles(titles, threshold=0.85, num_perm=NUM_PERM, bands=BANDS):
+    """Groups near-duplicate titles by locality-sensitive hashing of MinHash signatures.
+
+    Signatures are split into bands. Titles that share a band land in the
+    same bucket and are compared only with the bucket's first title, so no
+    all-pairs comparison is made. A pair is merged when the estimated Jaccard
+    similarity of their word sets reaches threshold. Returns, for each title,
+    the row ID of its cluster's earliest title and the estimated similarity
+    to it.
+    """
+    signatures = minhash_signatures(titles, num_perm=num_perm)
+    rows_per_band = num_perm // bands
+    row_ids = np.arange(len(signatures))
+    has_words = signatures[:, 0] != NO_WORDS
+    parents = list(range(len(signatures)))
+
+    mixers = np.random.default_rng(0).integers(1, 1 << 63, size=rows_per_band, dtype=np.uint64) | np.uint64(1)
+
+    for band in range(bands):
+        band_signatures = signatures[:, band * rows_per_band:(band + 1) * rows_per_band]
+        # Bucket key: the band's values mixed into one wrapping 64-bit sum.
+        # Key collisions are harmless since every pair is verified below.
+        bucket_ids, _ = pd.factorize((band_signatures * mixers).sum(axis=1, dtype=np.uint64))
+        # factorize numbers buckets by first appearance, so each bucket's
+        # leader is the row where its ID first exceeds every earlier ID.
+        leaders = np.flatnonzero(np.r_[True, bucket_ids[1:] > np.maximum.accumulate(bucket_ids)[:-1]])
+        leader_of = leaders[bucket_ids]
+
+        members = row_ids[(leader_of != row_ids) & has_words]
+        if not len(members):
+            continue
+        similarity = _similarity(signatures, members, leader_of[members])
+        members = members[similarity >= threshold]
+        for member, leader in zip(members, leader_of[members]):
+            member_root, leader_root = _find(parents, member), _find(parents, leader)
+            if member_root != leader_root:
+                parents[max(member_root, leader_root)] = min(member_root, leader_root)
+
+    canonical = np.array([_find(parents, row_id) for row_id in range(len(parents))], dtype=np.int64)
+    similarity = _similarity(signatures, row_ids, canonical)
+    return canonical, similarity
+
+
+def _union_skills(skills):
+    seen = {}
+    for skills_text in skills:
+        if not isinstance(skills_text, str):
+            continue
+        for skill in skills_text.split(','):
+            skill = skill.strip()
+            if skill and skill.lower() not in seen:
+                seen[skill.lower()] = skill
+    return ', '.join(seen.values()) if seen else np.nan
+
+
+def merge_near_duplicates(merged_df, threshold=0.85):
+    """Collapses near-duplicate job titles into their earliest title.
+
+    Each cluster keeps its first row, with the skills of all its rows
+    unioned. Returns the reduced DataFrame and a cluster map with one row per
+    title in a multi-title cluster: job_title, canonical_title and the
+    estimated similarity to the canonical title.
+    """
+    merged_df = merged_df.reset_index(drop=True)
+    canonical, similarity = cluster_titles(merged_df['job_title'].tolist(), threshold=threshold)
+
+    cluster_sizes = np.bincount(canonical, minlength=len(canonical))
+    in_cluster = cluster_sizes[canonical] > 1
+    cluster_map = pd.DataFrame({
+        'job_title': merged_df['job_title'].to_numpy()[in_cluster],
+        'canonical_title': merged_df['job_title'].to_numpy()[canonical[in_cluster]],
+        'similarity': similarity[in_cluster],
+    })
+
+    reduced = merged_df[canonical == np.arange(len(canonical))].copy()
+    if in_cluster.any():
+        clustered = merged_df['skills'][in_cluster].groupby(canonical[in_cluster], sort=False).agg(_union_skills)
+        reduced.loc[clustered.index, 'skills'] = clustered
+    return reduced, cluster_map
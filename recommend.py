@@ -0,0 +1,61 @@
+import os
+import numpy as np
+from scipy import sparse
+from skill_matrix import load_skill_matrix
+from snapshot import data_fingerprint, load_columns
+
+_recommender_cache = {}
+
+
+class SkillRecommender:
+    """Ranks jobs by TF-IDF cosine similarity between their skills and a user's skills.
+
+    Skill weights are smoothed IDF over the job corpus. Each job row is L2
+    normalized once when the recommender is built. The weighted matrix is kept
+    in CSC form, so scoring a query only touches the columns of its skills.
+    """
+
+    def __init__(self, skill_matrix, job_titles):
+        self.skill_matrix = skill_matrix
+        self.job_titles = np.asarray(job_titles, dtype=object)
+
+        matrix = skill_matrix.matrix.astype(np.float32)
+        jobs = matrix.shape[0]
+        document_frequency = skill_matrix.counts()
+        self.idf = (np.log((1 + jobs) / (1 + document_frequency)) + 1).astype(np.float32)
+
+        weighted = matrix @ sparse.diags(self.idf)
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        self.matrix = sparse.csc_matrix(sparse.diags(1 / norms) @ weighted, dtype=np.float32)
+
+    def recommend(self, skills, top_k=10):
+        """Returns up to top_k (job title, score) pairs, best match first."""
+        skill_ids = sorted(set(self.skill_matrix.ids(skills)))
+        if not skill_ids or top_k <= 0:
+            return []
+
+        query = self.idf[skill_ids]
+        query = query / np.linalg.norm(query)
+        scores = self.matrix[:, skill_ids] @ query
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+        # Clip float32 rounding so an exact match scores 1.0, not 1.0000001.
+        return [(self.job_titles[row_id], min(float(scores[row_id]), 1.0)) for row_id in candidates]
+
+
+def get_recommender(data_path='merged_data.csv'):
+    """Returns a cached SkillRecommender for data_path, rebuilding it when the file changes."""
+    key = os.path.abspath(data_path)
+    fingerprint = data_fingerprint(data_path)
+    cached = _recommender_cache.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    job_titles = load_columns(data_path, ['job_title'])['job_title']
+    recommender = SkillRecommender(load_skill_matrix(data_path), job_titles)
+    _recommender_cache[key] = (fingerprint, recommender)
+    return recommender
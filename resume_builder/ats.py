@@ -0,0 +1,354 @@
+import hashlib
+import re
+import threading
+from collections import Counter, OrderedDict, defaultdict
+
+STOP_WORDS = {'the', 'and', 'for', 'with', 'this', 'that', 'have', 'has', 'had',
+              'you', 'your', 'will', 'would', 'should', 'they', 'their', 'them'}
+
+ACTION_VERBS = {'managed', 'led', 'developed', 'created', 'implemented',
+                'improved', 'increased', 'reduced', 'optimized', 'designed'}
+
+_WORD = re.compile(r'\w+')
+_WORD_RUN = re.compile(r'\w+(?:\s+\w+)*')
+_KEYWORD = re.compile(r'[a-z]{3,}')
+
+
+def resume_text_parts(resume_data):
+    """Returns the lowercased resume fields that are scored, in resume order."""
+    def parts():
+        yield resume_data.get('summary')
+
+        if resume_data.get('skills'):
+            for skill_type, skills in resume_data['skills'].items():
+                yield " ".join(skills)
+
+        if resume_data.get('experience'):
+            for exp in resume_data['experience']:
+                yield exp.get('title')
+                yield exp.get('company')
+                yield exp.get('description')
+                if exp.get('responsibilities'):
+                    for resp in exp['responsibilities']:
+                        yield resp.get('responsibility')
+
+        if resume_data.get('education'):
+            for edu in resume_data['education']:
+                yield edu.get('degree')
+                yield edu.get('university')
+                yield edu.get('description')
+
+        if resume_data.get('projects'):
+            for proj in resume_data['projects']:
+                yield proj.get('name')
+                yield proj.get('description')
+                if proj.get('technologies'):
+                    yield " ".join(proj['technologies'])
+
+    return [text.lower() for text in parts() if text]
+
+
+def word_runs(text):
+    """Splits text into runs of \\w+ tokens separated only by whitespace."""
+    return [run.split() for run in _WORD_RUN.findall(text)]
+
+
+def job_description_keywords(job_description):
+    """Returns the keywords and phrases an ATS would look for in a resume.
+
+    Keywords are words of three or more letters, other than stop words, that
+    occur more than once. Phrases are the two- and three-word chunks of each
+    whitespace-separated run of words, taken greedily from the start of the
+    run as the original phrase regex does, that occur more than once. The
+    job description is tokenized once for both.
+    """
+    word_freq = Counter()
+    phrase_freq = Counter()
+    for run in word_runs(job_description.lower()):
+        word_freq.update(run)
+        for start in range(0, len(run) - 1, 3):
+            phrase_freq[tuple(run[start:start + 3])] += 1
+
+    keywords = [word for word, count in word_freq.items()
+                if count > 1 and word not in STOP_WORDS and _KEYWORD.fullmatch(word)]
+    phrases = [phrase for phrase, count in phrase_freq.items() if count > 1]
+    return keywords, phrases
+
+
+class ResumeTokens:
+    """Word set and two-/three-word n-gram set of a resume, built in one pass.
+
+    Matching is by whole tokens: a keyword matches a word of the resume and a
+    phrase matches consecutive words within one field, so "java" no longer
+    matches "javascript". When phrase_starts is given, n-grams are only
+    built at those words, which is all a known set of phrases needs.
+    """
+
+    def __init__(self, parts, phrase_starts=None):
+        # Fields are joined with a character that is neither a word character
+        # nor whitespace, so no run of words crosses from one field into the next.
+        text = '\x00'.join(parts)
+        self.words = set(_WORD.findall(text))
+        self.ngrams = set()
+        if phrase_starts is not None and self.words.isdisjoint(phrase_starts):
+            return
+        for run in word_runs(text):
+            for start, word in enumerate(run):
+                if phrase_starts is None or word in phrase_starts:
+                    if start + 2 <= len(run):
+                        self.ngrams.add(tuple(run[start:start + 2]))
+                    if start + 3 <= len(run):
+                        self.ngrams.add(tuple(run[start:start + 3]))
+
+    def __contains__(self, keyword):
+        if isinstance(keyword, tuple):
+            return keyword in self.ngrams
+        return keyword in self.words
+
+
+def _legacy_keywords(job_description):
+    """Keywords and phrases exactly as the original scorer extracted them."""
+    # Extract keywords from job description (more sophisticated approach)
+    job_text = job_description.lower()
+    words = re.findall(r'\b[a-z]{3,}\b', job_text)  # Only words with 3+ letters
+    word_freq = defaultdict(int)
+    for word in words:
+        word_freq[word] += 1
+    keywords = {word: count for word, count in word_freq.items()
+               if word not in STOP_WORDS and count > 1}
+
+    # Also look for phrases (2-3 word sequences)
+    phrases = re.findall(r'\b(?:\w+\b\s*){2,3}', job_text)
+    phrase_freq = defaultdict(int)
+    for phrase in phrases:
+        phrase_freq[phrase] += 1
+    important_phrases = {phrase: count for phrase, count in phrase_freq.items()
+                        if count > 1 and len(phrase.split()) > 1}
+
+    return list(keywords.keys()) + list(important_phrases.keys())
+
+
+def job_description_profile(job_description, legacy=False):
+    """Returns the tuple of keywords, then phrases, that a resume is scored against.
+
+    Phrases are token tuples, or raw strings when legacy is set. The profile
+    depends only on the job description, so it can be cached and shared.
+    """
+    if legacy:
+        return tuple(_legacy_keywords(job_description))
+    keywords, phrases = job_description_keywords(job_description)
+    return tuple(keywords + phrases)
+
+
+class JobDescriptionProfileCache:
+    """LRU of job description profiles keyed by a SHA-256 of the text.
+
+    Profiles missing from the LRU are looked up in the Django cache named
+    cache_alias when one is given, so workers can share the profiles of
+    popular postings. Counts hits in the LRU, hits in the shared cache, and
+    misses.
+    """
+
+    VERSION = 1
+
+    def __init__(self, maxsize=256, cache_alias=None, timeout=None):
+        self.maxsize = maxsize
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @property
+    def shared_cache(self):
+        """The shared Django cache, looked up on each use since cache connections are per thread."""
+        if not self.cache_alias:
+            return None
+        from django.core.cache import caches
+
+        return caches[self.cache_alias]
+
+    def key(self, job_description, legacy=False):
+        digest = hashlib.sha256(job_description.encode('utf-8')).hexdigest()
+        return f"ats-profile:{self.VERSION}:{'legacy' if legacy else 'tokens'}:{digest}"
+
+    def _remember(self, key, profile):
+        self._profiles[key] = profile
+        self._profiles.move_to_end(key)
+        while len(self._profiles) > self.maxsize:
+            self._profiles.popitem(last=False)
+
+    def get(self, job_description, legacy=False):
+        """Returns the profile of job_description, computing it on a miss."""
+        key = self.key(job_description, legacy)
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is not None:
+                self._profiles.move_to_end(key)
+                self.hits += 1
+                return profile
+
+        shared_cache = self.shared_cache
+        profile = shared_cache.get(key) if shared_cache is not None else None
+        if profile is not None:
+            with self._lock:
+                self.shared_hits += 1
+                self._remember(key, profile)
+            return profile
+
+        profile = job_description_profile(job_description, legacy)
+        if shared_cache is not None:
+            shared_cache.set(key, profile, self.timeout)
+        with self._lock:
+            self.misses += 1
+            self._remember(key, profile)
+        return profile
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                'size': len(self._profiles),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+                'shared': bool(self.cache_alias),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+            self.hits = self.shared_hits = self.misses = 0
+
+
+_profile_cache = None
+_profile_cache_lock = threading.Lock()
+
+
+def get_profile_cache():
+    """Returns this process's profile cache, configured from settings on first use."""
+    global _profile_cache
+    with _profile_cache_lock:
+        if _profile_cache is None:
+            from django.conf import settings
+
+            _profile_cache = JobDescriptionProfileCache(
+                maxsize=getattr(settings, 'ATS_PROFILE_CACHE_SIZE', 256),
+                cache_alias=getattr(settings, 'ATS_PROFILE_CACHE', None),
+                timeout=getattr(settings, 'ATS_PROFILE_CACHE_TIMEOUT', None))
+        return _profile_cache
+
+
+def _legacy_matches(resume_data, all_keywords):
+    """Substring matching exactly as the original scorer did it."""
+    resume_text = "".join(f" {text}" for text in resume_text_parts(resume_data))
+
+    matched_keywords = [keyword for keyword in all_keywords if keyword in resume_text]
+    missing_keywords = [keyword for keyword in all_keywords if keyword not in resume_text]
+    has_action_verbs = any(verb in resume_text for verb in ACTION_VERBS)
+    return matched_keywords, missing_keywords, has_action_verbs
+
+
+def _token_matches(resume_data, all_keywords):
+    phrase_starts = {keyword[0] for keyword in all_keywords if isinstance(keyword, tuple)}
+    resume_tokens = ResumeTokens(resume_text_parts(resume_data), phrase_starts)
+
+    matched_keywords = []
+    missing_keywords = []
+    for keyword in all_keywords:
+        found = keyword in resume_tokens
+        if isinstance(keyword, tuple):
+            keyword = " ".join(keyword)
+        (matched_keywords if found else missing_keywords).append(keyword)
+    has_action_verbs = not ACTION_VERBS.isdisjoint(resume_tokens.words)
+    return matched_keywords, missing_keywords, has_action_verbs
+
+
+def calculate_ats_score_with_feedback(resume_data, job_description, legacy=False):
+    """Calculates ATS score and provides detailed feedback for improvement.
+
+    Keywords and phrases are matched as whole tokens in time linear in the
+    size of the resume and job description. legacy=True uses the original
+    substring matching instead and reproduces its scores exactly. The job
+    description side is cached (see get_profile_cache()), so scoring another
+    resume against a recent posting only tokenizes the resume.
+    """
+    if not job_description:
+        return {
+            'score': 0,
+            'feedback': ["No job description provided for ATS scoring."],
+            'missing_keywords': [],
+            'matched_keywords': []
+        }
+
+    # Find matches and missing keywords
+    all_keywords = get_profile_cache().get(job_description, legacy)
+    if legacy:
+        matched_keywords, missing_keywords, has_action_verbs = _legacy_matches(resume_data, all_keywords)
+    else:
+        matched_keywords, missing_keywords, has_action_verbs = _token_matches(resume_data, all_keywords)
+
+    # Calculate score
+    matched_count = len(matched_keywords)
+    total_keywords = matched_count + len(missing_keywords)
+    score = round((matched_count / total_keywords) * 100) if total_keywords > 0 else 0
+    
+    # Generate detailed feedback
+    feedback = []
+    
+    # General score feedback
+    if score >= 80:
+        feedback.append("Excellent! Your resume has strong alignment with the job description.")
+    elif score >= 60:
+        feedback.append("Good match. Your resume aligns well but could be improved further.")
+    elif score >= 40:
+        feedback.append("Moderate match. Your resume needs more optimization for this role.")
+    else:
+        feedback.append("Low match. Significant improvements needed to better align with this role.")
+    
+    # Section-specific feedback
+    if not resume_data.get('summary'):
+        feedback.append("Consider adding a professional summary that highlights your most relevant qualifications.")
+    elif len(resume_data.get('summary', '').split()) < 20:
+        feedback.append("Your summary could be more detailed. Aim for 3-4 sentences highlighting key qualifications.")
+    
+    if not resume_data.get('skills'):
+        feedback.append("Add a skills section with relevant hard and soft skills from the job description.")
+    elif len(matched_keywords) < total_keywords * 0.5:
+        feedback.append("Your skills section could better match the job requirements. Add more relevant skills.")
+    
+    if not resume_data.get('experience'):
+        feedback.append("No work experience listed. Include relevant experience, even if from internships or projects.")
+    else:
+        # Check for action verbs in experience descriptions
+        if not has_action_verbs:
+            feedback.append("Use more action verbs in your experience descriptions (e.g., 'managed', 'developed', 'implemented').")
+    
+    # Missing keywords feedback
+    if missing_keywords:
+        feedback.append(f"Consider adding these missing keywords: {', '.join(missing_keywords[:10])}" + 
+                       ("..." if len(missing_keywords) > 10 else ""))
+    
+    # Formatting feedback
+    feedback.append("Keep your resume format simple and clean for best ATS compatibility.")
+    feedback.append("Use standard section headings like 'Professional Experience' and 'Education'.")
+    
+    return {
+        'score': score,
+        'feedback': feedback,
+        'missing_keywords': missing_keywords,
+        'matched_keywords': matched_keywords
+    }
+
+def ats_summary(ats_results):
+    return {
+        'ats_score': ats_results['score'],
+        'feedback': ats_results['feedback'],
+        'missing_keywords': ats_results['missing_keywords'],
+        'matched_keywords': ats_results['matched_keywords'],
+        'status': 'success'
+    }
@@ -0,0 +1,110 @@
+from .ats import ResumeTokens, calculate_ats_score_with_feedback, get_profile_cache, resume_text_parts
+
+
+def _bitset(ids):
+    """Builds an int with the given bits set, in one pass over a byte buffer."""
+    if not ids:
+        return 0
+    buffer = bytearray(max(ids) // 8 + 1)
+    for bit in ids:
+        buffer[bit >> 3] |= 1 << (bit & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+class KeywordVocabulary:
+    """Numbers the keywords and phrases of a set of job description profiles.
+
+    Each profile becomes a Python int bitset over the shared vocabulary, and
+    each resume a bitset of the vocabulary entries it contains, so matching
+    a resume against a posting is one AND and a bit count.
+    """
+
+    def __init__(self, profiles):
+        self.ids = {}
+        self.profile_ids = []
+        self.profile_bits = []
+        for profile in profiles:
+            ids = [self.ids.setdefault(keyword, len(self.ids)) for keyword in profile]
+            self.profile_ids.append(ids)
+            self.profile_bits.append(_bitset(ids))
+        self.keywords = list(self.ids)
+        self.phrase_starts = {keyword[0] for keyword in self.keywords if isinstance(keyword, tuple)}
+
+    def resume_bits(self, resume_data):
+        """Tokenizes a resume once and returns the bitset of vocabulary entries in it."""
+        resume_tokens = ResumeTokens(resume_text_parts(resume_data), self.phrase_starts)
+        ids = self.ids
+        return _bitset([ids[word] for word in resume_tokens.words & ids.keys()] +
+                       [ids[ngram] for ngram in resume_tokens.ngrams if ngram in ids])
+
+    def missing(self, profile_index, resume_bits, top_missing):
+        """Returns up to top_missing unmatched keywords of a profile, in profile order."""
+        missing = []
+        for keyword_id in self.profile_ids[profile_index]:
+            if len(missing) >= top_missing:
+                break
+            if not resume_bits >> keyword_id & 1:
+                keyword = self.keywords[keyword_id]
+                missing.append(" ".join(keyword) if isinstance(keyword, tuple) else keyword)
+        return missing
+
+    def score(self, profile_index, resume_bits, top_missing=10):
+        profile_bits = self.profile_bits[profile_index]
+        keyword_count = profile_bits.bit_count()
+        matched_count = (profile_bits & resume_bits).bit_count()
+        return {
+            'score': round((matched_count / keyword_count) * 100) if keyword_count > 0 else 0,
+            'matched_count': matched_count,
+            'keyword_count': keyword_count,
+            'missing_keywords': self.missing(profile_index, resume_bits, top_missing),
+        }
+
+
+def _profiles(job_descriptions):
+    profile_cache = get_profile_cache()
+    return [profile_cache.get(job_description) if job_description else ()
+            for job_description in job_descriptions]
+
+
+def _legacy_score(resume_data, job_description, top_missing):
+    """Scores one pair with the original substring matching, shaped like KeywordVocabulary.score()."""
+    ats_results = calculate_ats_score_with_feedback(resume_data, job_description, legacy=True)
+    matched_count = len(ats_results['matched_keywords'])
+    return {
+        'score': ats_results['score'],
+        'matched_count': matched_count,
+        'keyword_count': matched_count + len(ats_results['missing_keywords']),
+        'missing_keywords': ats_results['missing_keywords'][:top_missing],
+    }
+
+
+def score_resume_against_jobs(resume_data, job_descriptions, top_missing=10, legacy=False):
+    """Scores one resume against many job descriptions.
+
+    Returns one result per job description, in input order, with the same
+    score calculate_ats_score_with_feedback gives and the first top_missing
+    missing keywords. The resume is tokenized once for the whole batch.
+
+    legacy=True (settings.ATS_LEGACY_MATCHING) scores with the original
+    substring matching instead. That does not reduce to token bitsets, so
+    each pair goes through calculate_ats_score_with_feedback(legacy=True)
+    and costs a full scan of the resume text per keyword.
+    """
+    if legacy:
+        return [_legacy_score(resume_data, job_description, top_missing) for job_description in job_descriptions]
+    vocabulary = KeywordVocabulary(_profiles(job_descriptions))
+    resume_bits = vocabulary.resume_bits(resume_data)
+    return [vocabulary.score(index, resume_bits, top_missing) for index in range(len(job_descriptions))]
+
+
+def score_resumes_against_job(resumes, job_description, top_missing=10, legacy=False):
+    """Scores many resumes against one job description.
+
+    Returns one result per resume, in input order, shaped as in
+    score_resume_against_jobs(), legacy included. The job description is
+    analysed once.
+    """
+    if legacy:
+        return [_legacy_score(resume_data, job_description, top_missing) for resume_data in resumes]
+    vocabulary = KeywordVocabulary(_profiles([job_description]))
+    return [vocabulary.score(0, vocabulary.resume_bits(resume_data), top_missing) for resume_data in resumes]
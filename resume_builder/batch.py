@@ -0,0 +1,139 @@
+import base64
+import io
+import json
+import os
+import threading
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from .ats import ats_summary, calculate_ats_score_with_feedback
+from .rendering import renderer
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def render_pool_workers():
+    return getattr(settings, 'RESUME_RENDER_WORKERS', None) or os.cpu_count() or 1
+
+
+def get_render_pool():
+    """Returns the process pool shared by batch requests, starting it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=render_pool_workers())
+        return _pool
+
+
+def reset_render_pool(broken_pool):
+    """Drops a pool whose worker died so the next get_render_pool() starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is broken_pool:
+            _pool = None
+    broken_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def render_resume_item(item):
+    """Renders one batch item in a worker process.
+
+    Returns (pdf_bytes, ats_results) or raises; the caller turns exceptions
+    into a per-item error.
+    """
+    if not isinstance(item, dict):
+        raise ValueError("Each item must be an object with 'resume_data' and 'job_description'.")
+    resume_data = item.get('resume_data', {})
+    job_description = item.get('job_description', "")
+
+    output = io.BytesIO()
+    renderer.render(resume_data, output)
+    ats_results = calculate_ats_score_with_feedback(resume_data, job_description,
+                                                    legacy=getattr(settings, 'ATS_LEGACY_MATCHING', False))
+    return output.getvalue(), ats_results
+
+
+def render_batch(items):
+    """Yields (index, pdf_bytes, ats_results, error) as each item finishes.
+
+    At most twice the pool size is in flight at once, so finished PDFs are
+    handed back while the rest of the batch renders and the whole batch is
+    never held in memory. Results come in completion order.
+    """
+    pool = get_render_pool()
+    window = 2 * render_pool_workers()
+    pending = {}
+    next_index = 0
+
+    while next_index < len(items) or pending:
+        while next_index < len(items) and len(pending) < window:
+            try:
+                pending[pool.submit(render_resume_item, items[next_index])] = next_index
+            except BrokenProcessPool:
+                reset_render_pool(pool)
+                pool = get_render_pool()
+                continue
+            next_index += 1
+
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            index = pending.pop(future)
+            try:
+                pdf_bytes, ats_results = future.result()
+            except BrokenProcessPool as e:
+                reset_render_pool(pool)
+                pool = get_render_pool()
+                yield index, None, None, f"Worker process failed: {e}"
+            except Exception as e:
+                yield index, None, None, str(e)
+            else:
+                yield index, pdf_bytes, ats_results, None
+
+
+def stream_ndjson(items):
+    """Streams one JSON line per item, shaped like the create-resume JSON response."""
+    for index, pdf_bytes, ats_results, error in render_batch(items):
+        if error is not None:
+            line = {'index': index, 'status': 'error', 'error': error}
+        else:
+            line = {'index': index, 'pdf': base64.b64encode(pdf_bytes).decode('utf-8'), **ats_summary(ats_results)}
+        yield json.dumps(line) + '\n'
+
+
+class _ChunkSink:
+    """Write-only file object for ZipFile that hands back what was written so far."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_zip(items):
+    """Streams a ZIP archive with resume_<n>.pdf and resume_<n>.json per item.
+
+    A failed item gets resume_<n>.error.json instead. Each entry is emitted
+    as soon as its item finishes.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for index, pdf_bytes, ats_results, error in render_batch(items):
+            name = f"resume_{index:04d}"
+            if error is not None:
+                archive.writestr(f"{name}.error.json", json.dumps({'index': index, 'error': error}))
+            else:
+                archive.writestr(f"{name}.pdf", pdf_bytes)
+                archive.writestr(f"{name}.json", json.dumps({'index': index, **ats_results}))
+            yield sink.drain()
+    yield sink.drain()
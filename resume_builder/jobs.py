@@ -0,0 +1,193 @@
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from django.core.cache import caches
+from .batch import reset_render_pool, get_render_pool, render_resume_item
+
+
+class QueueFull(Exception):
+    """Raised when too many render jobs are already queued or running."""
+
+
+# How often a long-poll re-reads a job that another process is running.
+SHARED_POLL_INTERVAL = 0.25
+
+
+class RenderJob:
+    """One asynchronous resume render, backed by a future on the render pool."""
+
+    def __init__(self, future):
+        self.id = uuid.uuid4().hex
+        self.future = future
+        self.submitted_at = time.time()
+        self.finished_at = None
+        self.size = 0
+
+    @property
+    def status(self):
+        if not self.future.done():
+            return 'running' if self.future.running() else 'queued'
+        if self.future.cancelled() or self.future.exception() is not None:
+            return 'failed'
+        return 'done'
+
+    @property
+    def error(self):
+        if self.future.cancelled():
+            return 'Job was cancelled'
+        exception = self.future.exception() if self.future.done() else None
+        return str(exception) if exception is not None else None
+
+    @property
+    def ats_results(self):
+        return self.future.result()[1]
+
+    def result(self):
+        """Returns (pdf_bytes, ats_results) of a finished job."""
+        return self.future.result()
+
+
+class StoredJob:
+    """A job as recorded in the shared cache, possibly by another worker process."""
+
+    def __init__(self, job_id, record, cache_alias):
+        self.id = job_id
+        self.status = record['status']
+        self.error = record.get('error')
+        self.ats_results = record.get('ats_results')
+        self.cache_alias = cache_alias
+
+    def result(self):
+        """Returns (pdf_bytes, ats_results) of a finished job; pdf_bytes is None once the cache dropped it."""
+        return caches[self.cache_alias].get(_pdf_key(self.id)), self.ats_results
+
+
+def _record_key(job_id):
+    return f'resume-job:{job_id}'
+
+
+def _pdf_key(job_id):
+    return f'resume-job:{job_id}:pdf'
+
+
+class RenderJobQueue:
+    """Tracks render jobs submitted to the shared render process pool.
+
+    Jobs live in this process's memory. Finished jobs are kept for ttl
+    seconds, and once their PDFs take more than max_bytes the oldest are
+    dropped. The queue refuses new jobs once max_pending are unfinished.
+    With a cache_alias (naming a Django cache every worker process can
+    reach), each job's status, ATS results and PDF are mirrored there, so
+    status and PDF requests can reach any process and outlive the local
+    copy. Without one, they must reach the process that accepted the job.
+    """
+
+    def __init__(self, max_pending=100, ttl=600, max_bytes=50 * 1024 * 1024, cache_alias=None):
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.cache_alias = cache_alias
+        self._jobs = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def shared_cache(self):
+        """The shared Django cache, looked up on each use since cache connections are per thread."""
+        return caches[self.cache_alias] if self.cache_alias else None
+
+    def _drop(self, job_id):
+        self._bytes -= self._jobs.pop(job_id).size
+
+    def _expire(self, now):
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and now - job.finished_at > self.ttl:
+                self._drop(job_id)
+
+    def _evict(self):
+        finished = sorted((job for job in self._jobs.values() if job.finished_at is not None),
+                          key=lambda job: job.finished_at)
+        for job in finished:
+            if self._bytes <= self.max_bytes:
+                break
+            self._drop(job.id)
+
+    def _finished(self, job):
+        job.finished_at = time.time()
+        if job.status == 'done':
+            job.size = len(job.result()[0])
+        with self._lock:
+            if job.id in self._jobs:
+                self._bytes += job.size
+                self._evict()
+        shared_cache = self.shared_cache
+        if shared_cache is not None:
+            record = {'status': job.status, 'error': job.error,
+                      'ats_results': job.ats_results if job.status == 'done' else None}
+            entries = {_record_key(job.id): record}
+            if job.status == 'done':
+                entries[_pdf_key(job.id)] = job.result()[0]
+            shared_cache.set_many(entries, timeout=self.ttl)
+
+    def submit(self, item):
+        """Queues one {"resume_data", "job_description"} item and returns its RenderJob."""
+        with self._lock:
+            self._expire(time.time())
+            pending = sum(1 for job in self._jobs.values() if not job.future.done())
+            if pending >= self.max_pending:
+                raise QueueFull(f'{pending} render jobs are already pending')
+            pool = get_render_pool()
+            try:
+                future = pool.submit(render_resume_item, item)
+            except BrokenProcessPool:
+                reset_render_pool(pool)
+                future = get_render_pool().submit(render_resume_item, item)
+            job = RenderJob(future)
+            self._jobs[job.id] = job
+        shared_cache = self.shared_cache
+        if shared_cache is not None:
+            shared_cache.set(_record_key(job.id), {'status': 'queued'}, timeout=self.ttl)
+        job.future.add_done_callback(lambda future: self._finished(job))
+        return job
+
+    def get(self, job_id):
+        """Returns the job with job_id, or None if it is unknown or expired."""
+        with self._lock:
+            self._expire(time.time())
+            job = self._jobs.get(job_id)
+        if job is None and self.cache_alias:
+            record = self.shared_cache.get(_record_key(job_id))
+            if record is not None:
+                job = StoredJob(job_id, record, self.cache_alias)
+        return job
+
+    async def wait(self, job, timeout):
+        """Waits up to timeout seconds for job to finish without holding a thread. Returns its latest state."""
+        if isinstance(job, RenderJob):
+            if timeout > 0 and not job.future.done():
+                await asyncio.wait([asyncio.wrap_future(job.future)], timeout=timeout)
+            return job
+        deadline = time.monotonic() + timeout
+        while job.status in ('queued', 'running') and time.monotonic() < deadline:
+            await asyncio.sleep(min(SHARED_POLL_INTERVAL, deadline - time.monotonic()))
+            job = self.get(job.id) or job
+        return job
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = RenderJobQueue(max_pending=getattr(settings, 'RESUME_JOB_MAX_PENDING', 100),
+                                    ttl=getattr(settings, 'RESUME_JOB_TTL', 600),
+                                    max_bytes=getattr(settings, 'RESUME_JOB_MAX_BYTES', 50 * 1024 * 1024),
+                                    cache_alias=getattr(settings, 'RESUME_JOB_CACHE', None))
+        return _queue
@@ -0,0 +1,78 @@
+import time
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from resume_builder.models import Job, JobSkill, Skill, canonical_skills, sector_key
+
+
+class Command(BaseCommand):
+    help = "Replaces the Job, Skill and JobSkill tables with the contents of merged_data.csv."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='merged_data.csv',
+                            help="Merged job data written by load.py (default: merged_data.csv).")
+        parser.add_argument('--chunk-rows', type=int, default=50_000,
+                            help="CSV rows read per chunk (default: 50000).")
+        parser.add_argument('--batch-size', type=int, default=5_000,
+                            help="Rows per bulk INSERT statement (default: 5000).")
+
+    def handle(self, *args, path, chunk_rows, batch_size, **options):
+        if connection.vendor == 'sqlite':
+            # WAL lets the API keep reading while the import writes; NORMAL
+            # is durable enough for a table that can be rebuilt from the CSV.
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode=WAL')
+                cursor.execute('PRAGMA synchronous=NORMAL')
+
+        try:
+            chunks = pd.read_csv(path, usecols=['job_title', 'skills', 'Sector'], chunksize=chunk_rows)
+        except FileNotFoundError:
+            raise CommandError(f"File '{path}' not found.")
+        except ValueError as e:
+            raise CommandError(f"'{path}' is not merged job data: {e}")
+
+        start = time.perf_counter()
+        rows = 0
+        with transaction.atomic():
+            # Plain DELETEs: the ORM would load every primary key to cascade.
+            with connection.cursor() as cursor:
+                for model in (JobSkill, Job, Skill):
+                    cursor.execute(f'DELETE FROM {connection.ops.quote_name(model._meta.db_table)}')
+
+            # IDs are assigned here rather than read back after each insert,
+            # so JobSkill rows can be built without another query.
+            skill_ids = {}
+            titles = set()
+            next_job_id = 1
+            for chunk in chunks:
+                jobs = []
+                job_skills = []
+                new_skills = []
+                for title, skills_text, sector in chunk.itertuples(index=False):
+                    if not isinstance(title, str) or title in titles:
+                        continue
+                    titles.add(title)
+                    skills_text = skills_text if isinstance(skills_text, str) else ''
+                    sector = sector if isinstance(sector, str) else ''
+                    # bulk_create skips Job.save(), which would fill sector_key.
+                    jobs.append(Job(id=next_job_id, title=title, sector=sector, sector_key=sector_key(sector),
+                                    skills_text=skills_text))
+                    for name in canonical_skills(skills_text):
+                        skill_id = skill_ids.get(name)
+                        if skill_id is None:
+                            skill_id = skill_ids[name] = len(skill_ids) + 1
+                            new_skills.append(Skill(id=skill_id, name=name))
+                        job_skills.append(JobSkill(job_id=next_job_id, skill_id=skill_id))
+                    next_job_id += 1
+
+                Job.objects.bulk_create(jobs, batch_size=batch_size)
+                Skill.objects.bulk_create(new_skills, batch_size=batch_size)
+                JobSkill.objects.bulk_create(job_skills, batch_size=batch_size)
+                rows += len(chunk)
+                elapsed = time.perf_counter() - start
+                self.stdout.write(f"Imported {rows} rows ({rows / elapsed:.0f} rows/s)")
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {len(titles)} jobs with {len(skill_ids)} distinct skills from '{path}' "
+            f"in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:.0f} rows/s)"))
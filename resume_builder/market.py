@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+from django.conf import settings
+from demanding_jobs_skills import sector_demand
+from sector_rollups import load_rollups
+from skill_cooccurrence import load_skill_cooccurrence
+from skill_index import SkillIndex
+from snapshot import data_fingerprint, load_columns
+
+
+class JobMarketData:
+    """One loaded version of the merged job data: skill index, sector rollups and skill co-occurrence.
+
+    Never modified after it is built, so request threads can read it without
+    locking while a newer version is loaded.
+    """
+
+    def __init__(self, data_path):
+        # Taken before reading, so a file replaced mid-load is noticed on the next check.
+        self.fingerprint = data_fingerprint(data_path)
+        self.skill_index = SkillIndex.from_dataframe(load_columns(data_path, ['job_title', 'skills']))
+        self.rollups = load_rollups(data_path)
+        self.cooccurrence = load_skill_cooccurrence(data_path)
+        self.loaded_at = time.time()
+
+    def find_jobs(self, skills, mode='substring', match='any'):
+        """Returns (job title, matched skills) pairs ranked like skills.find_jobs_with_matched_skills."""
+        search_skills = [skill.lower().strip() for skill in skills]
+        return self.skill_index.rank(self.skill_index.match(search_skills, mode=mode, match=match))
+
+    def sectors(self):
+        """Returns (sector name, job count) pairs, largest sector first."""
+        counts = [(rollup['name'], rollup['jobs']) for rollup in self.rollups.values()]
+        return sorted(counts, key=lambda item: (-item[1], item[0]))
+
+    def sector_demand(self, sector, top_n=10):
+        """Returns (title counts, skill counts) like get_demanding_data_by_sector, or None for an unknown sector."""
+        return sector_demand(self.rollups, sector, top_n)
+
+
+class JobMarketService:
+    """Keeps the job data for data_path loaded and swaps in a new version when the file changes.
+
+    start() loads the data on a daemon thread, which then checks the file's
+    size and mtime every poll_interval seconds and, if they changed, loads
+    the new data alongside the old one. Until the first load finishes, data
+    is None.
+    Replacing the data attribute is a single assignment, so a request sees
+    either the old version or the new one. If loading fails, for any reason,
+    the old version keeps serving, status() reports the error and the
+    watcher keeps polling.
+    """
+
+    def __init__(self, data_path, poll_interval=30):
+        self.data_path = data_path
+        self.poll_interval = poll_interval
+        self.data = None
+        self.last_error = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def reload_if_changed(self):
+        """Loads the data if the file changed since the current version. Returns True if it swapped."""
+        with self._reload_lock:
+            try:
+                fingerprint = data_fingerprint(self.data_path)
+            except FileNotFoundError:
+                self.last_error = f"Could not find data file at: {self.data_path}"
+                return False
+            if self.data is not None and self.data.fingerprint == fingerprint:
+                return False
+            try:
+                data = JobMarketData(self.data_path)
+            except (FileNotFoundError, KeyError, ValueError) as e:
+                self.last_error = f"Could not load {self.data_path}: {e}"
+                print(f"Error: {self.last_error}")
+                return False
+            self.data = data
+            self.last_error = None
+            return True
+
+    def start(self):
+        """Starts loading the data in the background and watching the file for changes."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name='job-market-watcher', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self):
+        while True:
+            # Whatever goes wrong, the old version keeps serving and the next poll retries.
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                self.last_error = f"Could not load {self.data_path}: {type(e).__name__}: {e}"
+                print(f"Error: {self.last_error}")
+            if not self.poll_interval or self._stop.wait(self.poll_interval):
+                break
+
+    def status(self):
+        data = self.data
+        return {
+            'data_path': str(self.data_path),
+            'loaded': data is not None,
+            'loaded_at': data.loaded_at if data is not None else None,
+            'jobs': len(data.skill_index) if data is not None else 0,
+            'sectors': len(data.rollups) if data is not None else 0,
+            'error': self.last_error,
+        }
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_job_market_service(start=True):
+    """Returns this process's JobMarketService, started on first use unless start is False."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            data_path = getattr(settings, 'JOB_MARKET_DATA_PATH', 'merged_data.csv')
+            _service = JobMarketService(os.fspath(data_path),
+                                        poll_interval=getattr(settings, 'JOB_MARKET_POLL_INTERVAL', 30))
+            if start:
+                _service.start()
+        return _service
+
+
+def preload_job_market():
+    """Starts loading the job data in the background if settings.JOB_MARKET_PRELOAD is set.
+
+    Called by wsgi.py and asgi.py, so only processes that serve requests
+    load the data, and the first request does not have to start it.
+    """
+    if getattr(settings, 'JOB_MARKET_PRELOAD', True):
+        get_job_market_service()
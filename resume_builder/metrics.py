@@ -0,0 +1,224 @@
+import bisect
+import contextvars
+import cProfile
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+
+# Upper bounds in seconds, as in the Prometheus client's default buckets.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_stages = contextvars.ContextVar('resume_metrics_stages', default=None)
+# Held while a request runs under cProfile; only one profiler can be active at a time.
+_profile_lock = threading.Lock()
+
+
+class Histogram:
+    """Latency histogram with fixed buckets, safe to update from several threads."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += seconds
+            self.count += 1
+
+    def snapshot(self):
+        """Returns (cumulative counts per bucket including +Inf, sum, count)."""
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative = []
+        running = 0
+        for bucket_count in counts:
+            running += bucket_count
+            cumulative.append(running)
+        return cumulative, total, count
+
+
+class MetricsRegistry:
+    """Request and per-stage latency histograms, keyed by endpoint."""
+
+    def __init__(self):
+        self.requests = {}
+        self.stages = {}
+        self.responses = {}
+        self._lock = threading.Lock()
+
+    def _histogram(self, histograms, key):
+        histogram = histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = histograms.setdefault(key, Histogram())
+        return histogram
+
+    def record(self, endpoint, status, seconds, stages):
+        self._histogram(self.requests, endpoint).observe(seconds)
+        for stage, stage_seconds in stages:
+            self._histogram(self.stages, (endpoint, stage)).observe(stage_seconds)
+        with self._lock:
+            self.responses[endpoint, status] = self.responses.get((endpoint, status), 0) + 1
+
+    def render(self):
+        """Returns the metrics in the Prometheus text exposition format."""
+        lines = [
+            '# HELP resume_api_requests_total Responses by endpoint and status code.',
+            '# TYPE resume_api_requests_total counter',
+        ]
+        with self._lock:
+            responses = sorted(self.responses.items())
+            requests = sorted(self.requests.items())
+            stages = sorted(self.stages.items())
+        for (endpoint, status), count in responses:
+            lines.append(f'resume_api_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+
+        lines += [
+            '# HELP resume_api_request_duration_seconds Request latency by endpoint.',
+            '# TYPE resume_api_request_duration_seconds histogram',
+        ]
+        for endpoint, histogram in requests:
+            lines += _histogram_lines('resume_api_request_duration_seconds', f'endpoint="{endpoint}"', histogram)
+
+        lines += [
+            '# HELP resume_api_stage_duration_seconds Latency of each timed stage within a request.',
+            '# TYPE resume_api_stage_duration_seconds histogram',
+        ]
+        for (endpoint, stage), histogram in stages:
+            lines += _histogram_lines('resume_api_stage_duration_seconds',
+                                      f'endpoint="{endpoint}",stage="{stage}"', histogram)
+        return '\n'.join(lines) + '\n'
+
+
+def _histogram_lines(name, labels, histogram):
+    cumulative, total, count = histogram.snapshot()
+    lines = [f'{name}_bucket{{{labels},le="{bound}"}} {bucket_count}'
+             for bound, bucket_count in zip(histogram.buckets, cumulative)]
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative[-1]}')
+    lines.append(f'{name}_sum{{{labels}}} {total}')
+    lines.append(f'{name}_count{{{labels}}} {count}')
+    return lines
+
+
+registry = MetricsRegistry()
+
+
+@contextmanager
+def timed(stage):
+    """Times a block as a named stage of the current request.
+
+    Outside a request handled by RequestMetricsMiddleware (for example in
+    a render worker process) this does nothing.
+    """
+    stages = _stages.get()
+    if stages is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages.append((stage, time.perf_counter() - start))
+
+
+class RequestMetricsMiddleware:
+    """Times every request and the stages it marks with timed().
+
+    Adds a Server-Timing header, records latency histograms per endpoint and
+    stage in the module registry, and, when METRICS_PROFILE_SAMPLE_RATE is
+    above zero, runs that share of requests under cProfile and keeps the
+    profiles of those slower than METRICS_PROFILE_SLOW_MS.
+
+    Works in both sync and async middleware chains, so async views such as
+    the job long-poll are not moved to a thread. Only one profiler can run
+    in a process at a time, so a sampled request that finds another one
+    running goes unprofiled. Under ASGI a profile also covers whatever other
+    requests ran on the event loop while it was awaiting.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'METRICS_PROFILE_SAMPLE_RATE', 0.0)
+        self.slow_seconds = getattr(settings, 'METRICS_PROFILE_SLOW_MS', 1000) / 1000
+        self.profile_dir = getattr(settings, 'METRICS_PROFILE_DIR', None)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stages = []
+        token = _stages.set(stages)
+        profiler = self.start_profile()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            seconds = time.perf_counter() - start
+            self.stop_profile(profiler)
+            _stages.reset(token)
+        return self.finish(request, response, seconds, stages, profiler)
+
+    async def __acall__(self, request):
+        stages = []
+        token = _stages.set(stages)
+        profiler = self.start_profile()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            seconds = time.perf_counter() - start
+            self.stop_profile(profiler)
+            _stages.reset(token)
+        return self.finish(request, response, seconds, stages, profiler)
+
+    def start_profile(self):
+        """Returns an enabled profiler for a sampled request, or None."""
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return None
+        if not _profile_lock.acquire(blocking=False):
+            return None
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def stop_profile(self, profiler):
+        if profiler is not None:
+            profiler.disable()
+            _profile_lock.release()
+
+    def finish(self, request, response, seconds, stages, profiler):
+        match = request.resolver_match
+        endpoint = match.view_name if match is not None else 'unmatched'
+        registry.record(endpoint, response.status_code, seconds, stages)
+        if profiler is not None and seconds >= self.slow_seconds:
+            self.save_profile(profiler, endpoint)
+
+        timings = [f'{stage};dur={stage_seconds * 1000:.2f}' for stage, stage_seconds in stages]
+        timings.append(f'total;dur={seconds * 1000:.2f}')
+        response['Server-Timing'] = ', '.join(timings)
+        return response
+
+    def save_profile(self, profiler, endpoint):
+        if not self.profile_dir:
+            return
+        os.makedirs(self.profile_dir, exist_ok=True)
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{endpoint.replace(':', '_')}-{os.getpid()}-{random.getrandbits(32):08x}.prof"
+        profiler.dump_stats(os.path.join(self.profile_dir, name))
+
+
+def metrics_view(request):
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
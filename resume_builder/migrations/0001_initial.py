@@ -0,0 +1,102 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+# External-content FTS5 index over job titles and skills. Triggers keep it in
+# step with resume_builder_job, so ORM writes and bulk imports update it.
+FTS_STATEMENTS = [
+    """CREATE VIRTUAL TABLE resume_builder_job_fts USING fts5(
+        title, skills_text, content='resume_builder_job', content_rowid='id'
+    )""",
+    """CREATE TRIGGER resume_builder_job_fts_insert AFTER INSERT ON resume_builder_job BEGIN
+        INSERT INTO resume_builder_job_fts(rowid, title, skills_text)
+        VALUES (new.id, new.title, new.skills_text);
+    END""",
+    """CREATE TRIGGER resume_builder_job_fts_delete AFTER DELETE ON resume_builder_job BEGIN
+        INSERT INTO resume_builder_job_fts(resume_builder_job_fts, rowid, title, skills_text)
+        VALUES ('delete', old.id, old.title, old.skills_text);
+    END""",
+    """CREATE TRIGGER resume_builder_job_fts_update AFTER UPDATE ON resume_builder_job BEGIN
+        INSERT INTO resume_builder_job_fts(resume_builder_job_fts, rowid, title, skills_text)
+        VALUES ('delete', old.id, old.title, old.skills_text);
+        INSERT INTO resume_builder_job_fts(rowid, title, skills_text)
+        VALUES (new.id, new.title, new.skills_text);
+    END""",
+]
+
+FTS_DROP_STATEMENTS = [
+    'DROP TRIGGER IF EXISTS resume_builder_job_fts_update',
+    'DROP TRIGGER IF EXISTS resume_builder_job_fts_delete',
+    'DROP TRIGGER IF EXISTS resume_builder_job_fts_insert',
+    'DROP TABLE IF EXISTS resume_builder_job_fts',
+]
+
+
+def sqlite_has_fts5(schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return False
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+def create_job_fts(apps, schema_editor):
+    # Other databases, or SQLite builds without FTS5, fall back to substring
+    # search in JobQuerySet.search().
+    if not sqlite_has_fts5(schema_editor):
+        return
+    for statement in FTS_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+def drop_job_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in FTS_DROP_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=500, unique=True)),
+                ('sector', models.CharField(max_length=100)),
+                ('sector_key', models.CharField(db_index=True, editable=False, max_length=100)),
+                ('skills_text', models.TextField(blank=True)),
+            ],
+            options={
+                'ordering': ['title'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_skills', to='resume_builder.job')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_skills', to='resume_builder.skill')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['skill', 'job'], name='jobskill_skill_job_idx')],
+                'constraints': [models.UniqueConstraint(fields=('job', 'skill'), name='unique_job_skill')],
+            },
+        ),
+        migrations.RunPython(create_job_fts, drop_job_fts),
+    ]
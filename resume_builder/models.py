@@ -1,3 +1,125 @@
-from django.db import models
+from django.db import connection, models
+from django.db.models import Count
+from django.db.models.expressions import RawSQL
 
-# Create your models here.
+# External-content FTS5 index over Job.title and Job.skills_text, created by
+# migration 0001 on SQLite and kept in sync with the job table by triggers.
+JOB_FTS_TABLE = 'resume_builder_job_fts'
+
+
+def has_job_fts():
+    """Whether the FTS5 index exists, looked up once per database connection rather than per search."""
+    if connection.vendor != 'sqlite':
+        return False
+    found = getattr(connection, 'resume_builder_has_job_fts', None)
+    if found is None:
+        found = connection.resume_builder_has_job_fts = JOB_FTS_TABLE in connection.introspection.table_names()
+    return found
+
+
+def sector_key(sector):
+    """Normalizes a sector name for lookups, matching the lowercased keys of the sector rollups."""
+    return sector.lower()
+
+
+def fts_query(query):
+    """Turns free text into an FTS5 query matching jobs that contain every term.
+
+    Each whitespace-separated term becomes an FTS5 string, with embedded
+    double quotes doubled, so operators (AND, OR, NOT, NEAR), column filters,
+    prefixes and stray punctuation are searched as plain text instead of
+    being parsed as FTS5 syntax.
+    """
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+def canonical_skills(skills_text):
+    """Splits a comma-separated skills string into distinct lowercased skill names, in order."""
+    if not isinstance(skills_text, str):
+        return []
+    return list(dict.fromkeys(skill.strip().lower() for skill in skills_text.split(',') if skill.strip()))
+
+
+class JobQuerySet(models.QuerySet):
+    def with_skills(self, skills, match='any'):
+        """Jobs having any (or all) of the given skills, compared as canonical skill names."""
+        names = set(canonical_skills(','.join(skills)))
+        jobs = self.filter(job_skills__skill__name__in=names)
+        if match == 'all':
+            jobs = jobs.annotate(matched_skills=Count('job_skills', distinct=True)).filter(matched_skills=len(names))
+        return jobs.distinct()
+
+    def search(self, query):
+        """Full-text search over titles and skills.
+
+        query is plain text, not FTS5 syntax: where the FTS5 index exists,
+        jobs must contain every term of it as a token (see fts_query());
+        otherwise it is matched as a case-insensitive substring. A query
+        without any terms matches nothing.
+        """
+        if not query.split():
+            return self.none()
+        if has_job_fts():
+            return self.filter(id__in=RawSQL(f'SELECT rowid FROM {JOB_FTS_TABLE} WHERE {JOB_FTS_TABLE} MATCH %s',
+                                             [fts_query(query)]))
+        return self.filter(models.Q(title__icontains=query) | models.Q(skills_text__icontains=query))
+
+
+class SkillQuerySet(models.QuerySet):
+    def most_common(self, sector=None, top_n=10):
+        """Skills annotated with job_count, most frequent first, optionally within one sector."""
+        skills = self
+        if sector is not None:
+            skills = skills.filter(job_skills__job__sector_key=sector_key(sector))
+        return skills.annotate(job_count=Count('job_skills')).order_by('-job_count', 'name')[:top_n]
+
+
+class Job(models.Model):
+    title = models.CharField(max_length=500, unique=True)
+    sector = models.CharField(max_length=100)
+    # sector_key(sector), kept up to date by save() and set by import_jobs.
+    sector_key = models.CharField(max_length=100, db_index=True, editable=False)
+    # The skills exactly as in merged_data.csv; JobSkill holds them parsed.
+    skills_text = models.TextField(blank=True)
+
+    objects = JobQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['title']
+
+    def save(self, *args, **kwargs):
+        self.sector_key = sector_key(self.sector)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.title
+
+
+class Skill(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+
+    objects = SkillQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class JobSkill(models.Model):
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='job_skills')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='job_skills')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'skill'], name='unique_job_skill'),
+        ]
+        indexes = [
+            # (job, skill) is covered by the unique constraint; this one serves
+            # "jobs with skill X" lookups.
+            models.Index(fields=['skill', 'job'], name='jobskill_skill_job_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.job} - {self.skill}'
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from django.conf import settings
+from django.core.cache import caches
+
+RENDER_CACHE_VERSION = 1
+
+
+def render_key(resume_data, job_description, legacy=False):
+    """Returns a SHA-256 of the canonical JSON of a render request.
+
+    Key order and whitespace of the submitted JSON do not change the key.
+    The ATS matching mode is part of the key since it changes the scores.
+    """
+    payload = {
+        'version': RENDER_CACHE_VERSION,
+        'legacy': bool(legacy),
+        'resume_data': resume_data,
+        'job_description': job_description,
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class DiskRenderCache:
+    """Keeps rendered PDFs and their ATS results as files in a directory.
+
+    Each entry is <key>.pdf plus <key>.json. Hits touch the entry. After each
+    store the directory is measured, and while its entries exceed max_bytes
+    the least recently used are deleted. Measuring the directory rather than
+    counting this process's writes keeps the budget when several worker
+    processes share it, and lets any of them evict the others' entries.
+    """
+
+    def __init__(self, directory, max_bytes=100 * 1024 * 1024):
+        self.directory = str(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key, ext):
+        return os.path.join(self.directory, key + ext)
+
+    def get(self, key):
+        """Returns (pdf_bytes, ats_results) for key, or None."""
+        try:
+            with open(self._path(key, '.json')) as f:
+                ats_results = json.load(f)
+            with open(self._path(key, '.pdf'), 'rb') as f:
+                pdf_bytes = f.read()
+        except (FileNotFoundError, ValueError):
+            return None
+        try:
+            os.utime(self._path(key, '.pdf'))
+        except FileNotFoundError:
+            pass
+        return pdf_bytes, ats_results
+
+    def _write(self, path, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def set(self, key, pdf_bytes, ats_results):
+        results = json.dumps(ats_results).encode('utf-8')
+        if len(pdf_bytes) + len(results) > self.max_bytes:
+            return
+        # The PDF goes first: an entry only counts once its JSON exists.
+        self._write(self._path(key, '.pdf'), pdf_bytes)
+        self._write(self._path(key, '.json'), results)
+        with self._lock:
+            self._evict()
+
+    def entries(self):
+        """Returns {key: (bytes on disk, last used)} for every entry in the directory, whoever wrote it."""
+        entries = {}
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                key, ext = os.path.splitext(entry.name)
+                if ext not in ('.pdf', '.json'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                size, last_used = entries.get(key, (0, 0))
+                entries[key] = (size + stat.st_size, stat.st_mtime if ext == '.pdf' else last_used)
+        return entries
+
+    def _evict(self):
+        entries = self.entries()
+        total = sum(size for size, _ in entries.values())
+        for key in sorted(entries, key=lambda key: entries[key][1]):
+            if total <= self.max_bytes:
+                break
+            for ext in ('.json', '.pdf'):
+                try:
+                    os.remove(self._path(key, ext))
+                except FileNotFoundError:
+                    pass
+            total -= entries[key][0]
+
+
+class DjangoRenderCache:
+    """Keeps rendered PDFs in the Django cache named alias, which handles eviction.
+
+    Entries larger than max_entry_bytes are not stored.
+    """
+
+    def __init__(self, alias, max_entry_bytes=5 * 1024 * 1024, timeout=None):
+        self.alias = alias
+        self.max_entry_bytes = max_entry_bytes
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        """Looked up on each use since cache connections are per thread."""
+        return caches[self.alias]
+
+    def get(self, key):
+        return self.cache.get(f'resume-pdf:{key}')
+
+    def set(self, key, pdf_bytes, ats_results):
+        if len(pdf_bytes) <= self.max_entry_bytes:
+            self.cache.set(f'resume-pdf:{key}', (pdf_bytes, ats_results), self.timeout)
+
+
+_render_cache = None
+_render_cache_lock = threading.Lock()
+
+
+def get_render_cache():
+    """Returns the render cache configured in settings, or None when it is disabled."""
+    global _render_cache
+    with _render_cache_lock:
+        if _render_cache is None:
+            alias = getattr(settings, 'RESUME_RENDER_CACHE_ALIAS', None)
+            directory = getattr(settings, 'RESUME_RENDER_CACHE_DIR', None)
+            max_bytes = getattr(settings, 'RESUME_RENDER_CACHE_MAX_BYTES', 100 * 1024 * 1024)
+            if alias:
+                _render_cache = DjangoRenderCache(alias,
+                                                  timeout=getattr(settings, 'RESUME_RENDER_CACHE_TIMEOUT', None))
+            elif directory:
+                _render_cache = DiskRenderCache(directory, max_bytes)
+            else:
+                _render_cache = False
+        return _render_cache or None
@@ -0,0 +1,217 @@
+import threading
+from collections import OrderedDict
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import Paragraph
+from reportlab.lib.units import inch
+from .metrics import timed
+
+# --- ATS-Optimized Styling ---
+# Built once per process. These are new styles derived from the sample
+# stylesheet, so the shared 'Normal' style is never mutated.
+NORMAL_STYLE = ParagraphStyle(
+    'ResumeNormal',
+    parent=getSampleStyleSheet()['Normal'],
+    fontName='Helvetica',
+    fontSize=11,  # Slightly larger for better readability
+    leading=12,
+    spaceAfter=6
+)
+
+BOLD_STYLE = ParagraphStyle(
+    'Bold',
+    parent=NORMAL_STYLE,
+    fontName='Helvetica-Bold',
+    spaceAfter=6
+)
+
+SECTION_STYLE = ParagraphStyle(
+    'Section',
+    parent=NORMAL_STYLE,
+    fontName='Helvetica-Bold',
+    fontSize=12,
+    spaceAfter=12,
+    spaceBefore=12
+)
+
+
+class ResumeRenderer:
+    """Renders ATS-friendly resume PDFs.
+
+    One renderer is shared by all requests. It holds no per-request state:
+    each render gets its own canvas. Wrapped paragraphs are cached per thread
+    in a small LRU keyed by text and style, so repeated strings such as
+    section headings are laid out once per thread, not once per request.
+    """
+
+    def __init__(self, pagesize=letter, cache_size=512):
+        self.pagesize = pagesize
+        self.text_width = pagesize[0] - 2 * inch
+        self.cache_size = cache_size
+        self._local = threading.local()
+
+    def _paragraph(self, canvas_obj, text, style):
+        cache = getattr(self._local, 'paragraphs', None)
+        if cache is None:
+            cache = self._local.paragraphs = OrderedDict()
+
+        key = (text, style.name)
+        para = cache.get(key)
+        if para is not None:
+            cache.move_to_end(key)
+            return para
+
+        para = Paragraph(text, style)
+        para.wrapOn(canvas_obj, self.text_width, self.pagesize[1])
+        cache[key] = para
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return para
+
+    def draw_plain_text(self, canvas_obj, x, y, text, style=NORMAL_STYLE):
+        """Draws plain text on the canvas."""
+        para = self._paragraph(canvas_obj, text, style)
+        para.drawOn(canvas_obj, x, y - para.height)
+        return y - para.height - style.spaceAfter
+
+    def add_section_title(self, canvas_obj, y, title):
+        """Adds a plain section title."""
+        return self.draw_plain_text(canvas_obj, 100, y, title.upper(), SECTION_STYLE)
+
+    def add_bullet_point(self, canvas_obj, y, text):
+        """Adds a plain bullet point."""
+        return self.draw_plain_text(canvas_obj, 120, y, f"• {text}", NORMAL_STYLE)
+
+    def render(self, resume_data, output):
+        """Renders resume_data as a one-page PDF written to output (a path or file-like object)."""
+        with timed('layout'):
+            p = self._layout(resume_data, output)
+        with timed('pdf_save'):
+            # Finalize PDF
+            p.showPage()
+            p.save()
+
+    def _layout(self, resume_data, output):
+        p = canvas.Canvas(output, pagesize=self.pagesize)
+        draw_plain_text = self.draw_plain_text
+        normal, bold_style = NORMAL_STYLE, BOLD_STYLE
+
+        # --- Populate the PDF with ATS-optimized content ---
+        y = 750  # Initial vertical position
+
+        # Header with name and contact info
+        y = draw_plain_text(p, 100, y, resume_data.get('name', '').upper(), bold_style)
+
+        contact_info = f"{resume_data.get('email', '')} | {resume_data.get('phone', '')}"
+        if resume_data.get('linkedin'):
+            contact_info += f" | LinkedIn: {resume_data['linkedin']}"
+        if resume_data.get('portfolio'):
+            contact_info += f" | Portfolio: {resume_data['portfolio']}"
+        y = draw_plain_text(p, 100, y, contact_info, normal)
+        y -= 20
+
+        # Summary/Objective - optimized for keywords
+        if resume_data.get('summary'):
+            y = self.add_section_title(p, y, "PROFESSIONAL SUMMARY")
+            summary = resume_data['summary']
+            # Ensure summary ends with a period
+            if not summary.strip().endswith('.'):
+                summary += '.'
+            y = draw_plain_text(p, 100, y, summary, normal)
+            y -= 10
+
+        # Core Competencies/Key Skills section
+        if resume_data.get('skills'):
+            y = self.add_section_title(p, y, "CORE COMPETENCIES")
+            skills_text = []
+            for skill_type, skills in resume_data['skills'].items():
+                skills_text.extend(skills)
+            # Group skills in chunks of 3-4 for better readability
+            skill_groups = [skills_text[i:i+4] for i in range(0, len(skills_text), 4)]
+            for group in skill_groups:
+                y = draw_plain_text(p, 100, y, " • " + " • ".join(group), normal)
+            y -= 10
+
+        # Professional Experience - optimized with action verbs
+        if resume_data.get('experience'):
+            y = self.add_section_title(p, y, "PROFESSIONAL EXPERIENCE")
+            for exp in resume_data['experience']:
+                title = exp.get('title', '')
+                company = exp.get('company', '')
+                years = exp.get('years', '')
+                location = exp.get('location', '')
+
+                # Format experience header
+                exp_header = f"{title.upper()}"
+                if company:
+                    exp_header += f", {company}"
+                if location:
+                    exp_header += f" ({location})"
+                if years:
+                    exp_header += f" | {years}"
+
+                y = draw_plain_text(p, 100, y, exp_header, bold_style)
+
+                # Format responsibilities with action verbs
+                if exp.get('responsibilities'):
+                    for resp in exp.get('responsibilities', []):
+                        responsibility = resp.get('responsibility', '')
+                        # Ensure responsibility starts with action verb
+                        if responsibility and not responsibility[0].isupper():
+                            responsibility = responsibility[0].upper() + responsibility[1:]
+                        y = self.add_bullet_point(p, y, responsibility)
+                y -= 10
+
+        # Education - plain format
+        if resume_data.get('education'):
+            y = self.add_section_title(p, y, "EDUCATION")
+            for edu in resume_data['education']:
+                degree = edu.get('degree', '')
+                university = edu.get('university', '')
+                year = edu.get('year', '')
+                gpa = edu.get('gpa', '')
+
+                edu_text = f"{degree.upper()}"
+                if university:
+                    edu_text += f", {university}"
+                if year:
+                    edu_text += f" ({year})"
+                if gpa:
+                    edu_text += f" | GPA: {gpa}"
+
+                y = draw_plain_text(p, 100, y, edu_text, bold_style)
+
+                if edu.get('description'):
+                    y = draw_plain_text(p, 100, y, edu['description'], normal)
+                y -= 10
+
+        # Certifications
+        if resume_data.get('certifications'):
+            y = self.add_section_title(p, y, "CERTIFICATIONS")
+            for cert in resume_data['certifications']:
+                cert_text = f"{cert.get('name', '').upper()}"
+                if cert.get('year'):
+                    cert_text += f" ({cert.get('year')})"
+                if cert.get('issuer'):
+                    cert_text += f", {cert.get('issuer')}"
+                y = draw_plain_text(p, 100, y, cert_text, normal)
+            y -= 10
+
+        # Projects - focused on technologies and outcomes
+        if resume_data.get('projects'):
+            y = self.add_section_title(p, y, "KEY PROJECTS")
+            for proj in resume_data['projects']:
+                y = draw_plain_text(p, 100, y, f"{proj.get('name', '').upper()}", bold_style)
+                if proj.get('description'):
+                    y = draw_plain_text(p, 100, y, proj['description'], normal)
+                if proj.get('technologies'):
+                    y = draw_plain_text(p, 100, y,
+                                        f"Technologies: {', '.join(proj['technologies'])}",
+                                        normal)
+                y -= 10
+
+        return p
+
+
+renderer = ResumeRenderer()
@@ -0,0 +1,143 @@
+# calculate_ats_score_with_feedback as resume_builder/views.py had it before the ATS
+# scorer moved to resume_builder/ats.py, copied verbatim. The legacy mode
+# there must give exactly these results.
+import re
+from collections import defaultdict
+
+def calculate_ats_score_with_feedback(resume_data, job_description):
+    """Calculates ATS score and provides detailed feedback for improvement."""
+    if not job_description:
+        return {
+            'score': 0,
+            'feedback': ["No job description provided for ATS scoring."],
+            'missing_keywords': [],
+            'matched_keywords': []
+        }
+
+    # Extract keywords from job description (more sophisticated approach)
+    job_text = job_description.lower()
+    words = re.findall(r'\b[a-z]{3,}\b', job_text)  # Only words with 3+ letters
+    word_freq = defaultdict(int)
+    for word in words:
+        if len(word) > 2:  # Ignore very short words
+            word_freq[word] += 1
+    
+    # Remove common stop words
+    stop_words = {'the', 'and', 'for', 'with', 'this', 'that', 'have', 'has', 'had', 
+                 'you', 'your', 'will', 'would', 'should', 'they', 'their', 'them'}
+    keywords = {word: count for word, count in word_freq.items() 
+               if word not in stop_words and count > 1}
+    
+    # Also look for phrases (2-3 word sequences)
+    phrases = re.findall(r'\b(?:\w+\b\s*){2,3}', job_text)
+    phrase_freq = defaultdict(int)
+    for phrase in phrases:
+        phrase_freq[phrase] += 1
+    important_phrases = {phrase: count for phrase, count in phrase_freq.items() 
+                        if count > 1 and len(phrase.split()) > 1}
+
+    # Combine keywords and phrases
+    all_keywords = list(keywords.keys()) + list(important_phrases.keys())
+    
+    # Analyze resume content
+    resume_text = ""
+    
+    # Helper function to collect resume text
+    def add_to_resume_text(text):
+        nonlocal resume_text
+        if text:
+            resume_text += f" {text.lower()}"
+    
+    # Process each section of the resume
+    add_to_resume_text(resume_data.get('summary'))
+    
+    if resume_data.get('skills'):
+        for skill_type, skills in resume_data['skills'].items():
+            add_to_resume_text(" ".join(skills))
+    
+    if resume_data.get('experience'):
+        for exp in resume_data['experience']:
+            add_to_resume_text(exp.get('title'))
+            add_to_resume_text(exp.get('company'))
+            add_to_resume_text(exp.get('description'))
+            if exp.get('responsibilities'):
+                for resp in exp['responsibilities']:
+                    add_to_resume_text(resp.get('responsibility'))
+    
+    if resume_data.get('education'):
+        for edu in resume_data['education']:
+            add_to_resume_text(edu.get('degree'))
+            add_to_resume_text(edu.get('university'))
+            add_to_resume_text(edu.get('description'))
+    
+    if resume_data.get('projects'):
+        for proj in resume_data['projects']:
+            add_to_resume_text(proj.get('name'))
+            add_to_resume_text(proj.get('description'))
+            if proj.get('technologies'):
+                add_to_resume_text(" ".join(proj['technologies']))
+    
+    # Find matches and missing keywords
+    matched_keywords = []
+    missing_keywords = []
+    
+    for keyword in all_keywords:
+        if keyword in resume_text:
+            matched_keywords.append(keyword)
+        else:
+            missing_keywords.append(keyword)
+    
+    # Calculate score
+    total_keywords = len(all_keywords)
+    matched_count = len(matched_keywords)
+    score = round((matched_count / total_keywords) * 100) if total_keywords > 0 else 0
+    
+    # Generate detailed feedback
+    feedback = []
+    
+    # General score feedback
+    if score >= 80:
+        feedback.append("Excellent! Your resume has strong alignment with the job description.")
+    elif score >= 60:
+        feedback.append("Good match. Your resume aligns well but could be improved further.")
+    elif score >= 40:
+        feedback.append("Moderate match. Your resume needs more optimization for this role.")
+    else:
+        feedback.append("Low match. Significant improvements needed to better align with this role.")
+    
+    # Section-specific feedback
+    if not resume_data.get('summary'):
+        feedback.append("Consider adding a professional summary that highlights your most relevant qualifications.")
+    elif len(resume_data.get('summary', '').split()) < 20:
+        feedback.append("Your summary could be more detailed. Aim for 3-4 sentences highlighting key qualifications.")
+    
+    if not resume_data.get('skills'):
+        feedback.append("Add a skills section with relevant hard and soft skills from the job description.")
+    elif len(matched_keywords) < total_keywords * 0.5:
+        feedback.append("Your skills section could better match the job requirements. Add more relevant skills.")
+    
+    if not resume_data.get('experience'):
+        feedback.append("No work experience listed. Include relevant experience, even if from internships or projects.")
+    else:
+        # Check for action verbs in experience descriptions
+        action_verbs = {'managed', 'led', 'developed', 'created', 'implemented', 
+                       'improved', 'increased', 'reduced', 'optimized', 'designed'}
+        has_action_verbs = any(verb in resume_text for verb in action_verbs)
+        if not has_action_verbs:
+            feedback.append("Use more action verbs in your experience descriptions (e.g., 'managed', 'developed', 'implemented').")
+    
+    # Missing keywords feedback
+    if missing_keywords:
+        feedback.append(f"Consider adding these missing keywords: {', '.join(missing_keywords[:10])}" + 
+                       ("..." if len(missing_keywords) > 10 else ""))
+    
+    # Formatting feedback
+    feedback.append("Keep your resume format simple and clean for best ATS compatibility.")
+    feedback.append("Use standard section headings like 'Professional Experience' and 'Education'.")
+    
+    return {
+        'score': score,
+        'feedback': feedback,
+        'missing_keywords': missing_keywords,
+        'matched_keywords': matched_keywords
+    }
@@ -0,0 +1,76 @@
+import json
+import random
+import pytest
+from django.test import Client
+import synthetic
+from resume_builder import ats
+from resume_builder.ats import calculate_ats_score_with_feedback
+from resume_builder.ats_batch import score_resume_against_jobs, score_resumes_against_job
+
+JOB_DESCRIPTIONS = synthetic.job_descriptions(6, min_words=20, max_words=200) + [
+    'Machine learning engineer. Machine learning and data pipelines; machine learning daily.',
+    'Python developer with SQL. Python and SQL daily.',
+    '',
+]
+RESUMES = synthetic.resumes(12, max_experience=4) + [
+    {'name': 'Jane Doe', 'summary': 'Python developer building machine learning data pipelines with SQL.'},
+    {},
+]
+
+
+@pytest.fixture(autouse=True)
+def profile_cache(monkeypatch):
+    monkeypatch.setattr(ats, '_profile_cache', ats.JobDescriptionProfileCache())
+
+
+def expected_result(resume_data, job_description, top_missing):
+    ats_results = calculate_ats_score_with_feedback(resume_data, job_description)
+    matched_count = len(ats_results['matched_keywords'])
+    return {'score': ats_results['score'], 'matched_count': matched_count,
+            'keyword_count': matched_count + len(ats_results['missing_keywords']),
+            'missing_keywords': ats_results['missing_keywords'][:top_missing]}
+
+
+@pytest.mark.parametrize('top_missing', [0, 3, 1000])
+def test_one_resume_against_many_jobs_matches_the_single_scorer(top_missing):
+    for resume_data in RESUMES:
+        assert score_resume_against_jobs(resume_data, JOB_DESCRIPTIONS, top_missing) == [
+            expected_result(resume_data, job_description, top_missing) for job_description in JOB_DESCRIPTIONS]
+
+
+@pytest.mark.parametrize('top_missing', [0, 3, 1000])
+def test_many_resumes_against_one_job_match_the_single_scorer(top_missing):
+    for job_description in JOB_DESCRIPTIONS:
+        assert score_resumes_against_job(RESUMES, job_description, top_missing) == [
+            expected_result(resume_data, job_description, top_missing) for resume_data in RESUMES]
+
+
+def test_generated_pairs_match_the_single_scorer():
+    rng = random.Random(1)
+    job_descriptions = synthetic.job_descriptions(20, seed=1)
+    resumes = synthetic.resumes(40, seed=1)
+    for resume_data in resumes:
+        job_description = rng.choice(job_descriptions)
+        assert score_resumes_against_job([resume_data], job_description, 1000) == [
+            expected_result(resume_data, job_description, 1000)]
+
+
+def post(body):
+    return Client().post('/ats/score-batch/', data=json.dumps(body), content_type='application/json')
+
+
+def test_endpoint_ranks_results_by_score():
+    response = post({'resume_data': RESUMES[-2], 'job_descriptions': JOB_DESCRIPTIONS, 'top_missing': 2})
+    assert response.status_code == 200
+    results = response.json()['results']
+    assert [result['score'] for result in results] == sorted((result['score'] for result in results), reverse=True)
+    for result in results:
+        assert result == {'index': result['index'],
+                          **expected_result(RESUMES[-2], JOB_DESCRIPTIONS[result['index']], 2)}
+
+
+@pytest.mark.parametrize('top_missing', [True, False, -1, 2.5, '3', None])
+def test_endpoint_rejects_a_top_missing_that_is_not_a_count(top_missing):
+    response = post({'resumes': RESUMES[:2], 'job_description': JOB_DESCRIPTIONS[0], 'top_missing': top_missing})
+    assert response.status_code == 400
+    assert response.json() == {'error': "'top_missing' must be a non-negative integer"}
@@ -0,0 +1,75 @@
+import random
+import pytest
+import synthetic
+from .baseline_ats import calculate_ats_score_with_feedback as baseline_score
+from resume_builder import ats
+from resume_builder.ats_batch import score_resume_against_jobs, score_resumes_against_job
+
+FULL_RESUME = {
+    'summary': 'Senior data engineer who designed and optimized Python pipelines on AWS for analytics teams.',
+    'skills': {'technical': ['Python', 'SQL', 'Apache Spark', 'AWS'], 'soft': ['Communication']},
+    'experience': [{
+        'title': 'Data Engineer', 'company': 'Acme Corp', 'description': 'Built the data platform.',
+        'responsibilities': [{'responsibility': 'Led the migration to Spark, reducing costs by 30%.'},
+                             {'responsibility': None}],
+    }],
+    'education': [{'degree': 'BSc Computer Science', 'university': 'State University', 'description': None}],
+    'projects': [{'name': 'ETL toolkit', 'description': 'Open-source data-quality checks.',
+                  'technologies': ['Python', 'dbt']}],
+}
+RESUMES = [
+    FULL_RESUME,
+    {},
+    {'summary': 'Short summary.', 'skills': {}, 'experience': []},
+    {'summary': 'Nurse', 'experience': [{'title': 'Nurse', 'company': 'Hospital'}]},
+    {'skills': {'languages': ['Español', 'Français', 'C++', 'C#']}, 'projects': [{'name': 'café-app'}]},
+    {'experience': [{'title': 'Manager', 'responsibilities': [{'responsibility': 'Managed a team of 12'}]}]},
+]
+JOB_DESCRIPTIONS = [
+    '',
+    'Python',
+    'We need a data engineer. The data engineer will build data pipelines with Python and SQL. '
+    'Python, SQL and Spark experience required; AWS experience is a plus. Data pipelines run on AWS.',
+    'Registered Nurse\nRegistered Nurse wanted for night shifts.\tNight shifts pay more. Nurse, nurse, NURSE!',
+    'C++ and C# developer; C++/C# code reviews. Café staff: café café. Français français, 2024 2024 2024.',
+    ' '.join(['alpha beta gamma delta'] * 3 + [f'keyword{n} keyword{n}' for n in range(15)]),
+    'the and for with this that the and for with manager manager  managed   managed team team',
+]
+
+
+@pytest.fixture(autouse=True)
+def profile_cache(monkeypatch):
+    monkeypatch.setattr(ats, '_profile_cache', ats.JobDescriptionProfileCache())
+
+
+@pytest.mark.parametrize('job_description', JOB_DESCRIPTIONS)
+@pytest.mark.parametrize('resume_data', RESUMES)
+def test_legacy_mode_matches_the_original_scorer(resume_data, job_description):
+    expected = baseline_score(resume_data, job_description)
+    assert ats.calculate_ats_score_with_feedback(resume_data, job_description, legacy=True) == expected
+    # A second call is answered from the profile cache.
+    assert ats.calculate_ats_score_with_feedback(resume_data, job_description, legacy=True) == expected
+
+
+def test_legacy_mode_matches_the_original_scorer_on_generated_resumes():
+    rng = random.Random(0)
+    job_descriptions = synthetic.job_descriptions(10, min_words=20, max_words=200)
+    for resume_data in synthetic.resumes(30, max_experience=4):
+        job_description = rng.choice(job_descriptions)
+        assert (ats.calculate_ats_score_with_feedback(resume_data, job_description, legacy=True)
+                == baseline_score(resume_data, job_description))
+
+
+def test_legacy_batch_scores_match_the_original_scorer():
+    for resume_data in RESUMES:
+        results = score_resume_against_jobs(resume_data, JOB_DESCRIPTIONS, top_missing=3, legacy=True)
+        for job_description, result in zip(JOB_DESCRIPTIONS, results):
+            expected = baseline_score(resume_data, job_description)
+            assert result == {'score': expected['score'], 'matched_count': len(expected['matched_keywords']),
+                              'keyword_count': len(expected['matched_keywords'] + expected['missing_keywords']),
+                              'missing_keywords': expected['missing_keywords'][:3]}
+
+    for job_description in JOB_DESCRIPTIONS:
+        results = score_resumes_against_job(RESUMES, job_description, legacy=True)
+        assert [result['score'] for result in results] == [
+            baseline_score(resume_data, job_description)['score'] for resume_data in RESUMES]
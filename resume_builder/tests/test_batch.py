@@ -0,0 +1,87 @@
+import io
+import json
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from django.test import Client, override_settings
+from resume_builder import batch
+from resume_builder.ats import ats_summary, calculate_ats_score_with_feedback
+
+RESUME = {'name': 'Jane Doe', 'summary': 'Python developer', 'skills': {'technical': ['Python', 'SQL']}}
+ITEMS = [
+    {'resume_data': RESUME, 'job_description': 'Python developer with SQL. Python and SQL daily.'},
+    'not an object',
+    {'resume_data': dict(RESUME, name='John Roe'), 'job_description': 'Docker and Kubernetes. Docker daily.'},
+    {'resume_data': 'not an object either', 'job_description': ''},
+]
+
+
+@pytest.fixture(autouse=True)
+def pool(monkeypatch):
+    """Renders batch items on threads, with a window small enough for items to queue."""
+    executor = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(batch, 'get_render_pool', lambda: executor)
+    with override_settings(RESUME_RENDER_WORKERS=1):
+        yield executor
+    executor.shutdown()
+
+
+def post(body, **headers):
+    return Client().post('/create-resumes/batch/', data=json.dumps(body), content_type='application/json', **headers)
+
+
+def expected_summary(index):
+    item = ITEMS[index]
+    return ats_summary(calculate_ats_score_with_feedback(item['resume_data'], item['job_description']))
+
+
+def test_zip_has_a_pdf_and_json_per_item_and_an_error_entry_per_failure():
+    response = post({'items': ITEMS})
+    assert response.status_code == 200 and response['Content-Type'] == 'application/zip'
+    assert response['Content-Disposition'] == 'attachment; filename="resumes.zip"'
+    assert response.streaming
+
+    with zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content))) as archive:
+        assert archive.testzip() is None
+        assert sorted(archive.namelist()) == ['resume_0000.json', 'resume_0000.pdf', 'resume_0001.error.json',
+                                              'resume_0002.json', 'resume_0002.pdf', 'resume_0003.error.json']
+        for index in (0, 2):
+            assert archive.read(f'resume_{index:04d}.pdf').startswith(b'%PDF')
+            ats_results = json.loads(archive.read(f'resume_{index:04d}.json'))
+            assert ats_results.pop('index') == index
+            assert ats_summary(ats_results) == expected_summary(index)
+        assert json.loads(archive.read('resume_0001.error.json')) == {
+            'index': 1, 'error': "Each item must be an object with 'resume_data' and 'job_description'."}
+        assert json.loads(archive.read('resume_0003.error.json'))['index'] == 3
+
+
+@pytest.mark.parametrize('fields, headers', [({'format': 'ndjson'}, {}), ({}, {'HTTP_ACCEPT': 'application/x-ndjson'})])
+def test_ndjson_has_one_line_per_item(fields, headers):
+    response = post({'items': ITEMS, **fields}, **headers)
+    assert response.status_code == 200 and response['Content-Type'] == 'application/x-ndjson'
+
+    lines = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+    by_index = {line.pop('index'): line for line in lines}
+    assert sorted(by_index) == [0, 1, 2, 3]
+    for index in (0, 2):
+        assert by_index[index].pop('pdf')
+        assert by_index[index] == expected_summary(index)
+    assert by_index[1]['status'] == by_index[3]['status'] == 'error'
+    assert by_index[1]['error'] == "Each item must be an object with 'resume_data' and 'job_description'."
+
+
+@pytest.mark.parametrize('body, error', [
+    ({'items': []}, "'items' must be a non-empty list"),
+    ({'items': {'resume_data': RESUME}}, "'items' must be a non-empty list"),
+    ([ITEMS[0]], "'items' must be a non-empty list"),
+    ({'items': ITEMS, 'format': 'tar'}, "'format' must be 'zip' or 'ndjson'"),
+])
+def test_bad_batches_are_rejected(body, error):
+    response = post(body)
+    assert response.status_code == 400 and response.json() == {'error': error}
+
+
+def test_batch_size_is_limited():
+    with override_settings(RESUME_BATCH_MAX_ITEMS=3):
+        response = post({'items': ITEMS})
+    assert response.status_code == 400 and response.json() == {'error': 'At most 3 items per batch'}
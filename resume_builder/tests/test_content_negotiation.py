@@ -0,0 +1,97 @@
+import json
+import pytest
+from django.test import Client, override_settings
+from resume_builder import render_cache, views
+from resume_builder.ats import ats_summary, calculate_ats_score_with_feedback
+from resume_builder.views import preferred_response_type
+
+BODY = {
+    'resume_data': {'name': 'Jane Doe', 'email': 'jane@example.com', 'summary': 'Python developer',
+                    'skills': {'technical': ['Python', 'SQL']}},
+    'job_description': 'Python developer with SQL and Docker. Python, SQL and Docker daily.',
+}
+
+
+def post(**headers):
+    return Client().post('/create-resume/', data=json.dumps(BODY), content_type='application/json', **headers)
+
+
+@pytest.fixture(autouse=True)
+def no_cache(monkeypatch):
+    monkeypatch.setattr(render_cache, '_render_cache', None)
+    with override_settings(RESUME_RENDER_CACHE_DIR=None, RESUME_RENDER_CACHE_ALIAS=None):
+        yield
+    render_cache._render_cache = None
+
+
+@pytest.fixture(scope='module')
+def ats_results():
+    return calculate_ats_score_with_feedback(BODY['resume_data'], BODY['job_description'])
+
+
+@pytest.mark.parametrize('accept, expected', [
+    ('', 'application/json'),
+    ('*/*', 'application/json'),
+    ('application/*', 'application/json'),
+    ('application/pdf', 'application/pdf'),
+    ('application/pdf, application/json', 'application/pdf'),
+    ('application/json;q=0.5, application/pdf;q=0.9', 'application/pdf'),
+    ('multipart/*', 'multipart/mixed'),
+    ('multipart/mixed;q=0.9, application/json;q=0.5', 'multipart/mixed'),
+    ('text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8', 'application/json'),
+    ('application/pdf, */*;q=0.1', 'application/pdf'),
+    ('*/*, application/json;q=0', 'application/pdf'),
+    ('APPLICATION/PDF; Q=1', 'application/pdf'),
+    ('text/html', None),
+    ('application/json;q=0', None),
+    ('application/*;q=0, multipart/mixed;q=0', None),
+])
+def test_preferred_response_type(accept, expected):
+    assert preferred_response_type(accept) == expected
+
+
+def test_json_response_embeds_the_pdf_and_ats_results(ats_results):
+    response = post(HTTP_ACCEPT='application/json')
+    assert response.status_code == 200 and response['Content-Type'] == 'application/json'
+    body = response.json()
+    assert body.pop('pdf')
+    assert body == ats_summary(ats_results)
+
+
+def test_pdf_response_sends_the_ats_results_as_headers(ats_results):
+    response = post(HTTP_ACCEPT='application/pdf')
+    assert response.status_code == 200 and response['Content-Type'] == 'application/pdf'
+    assert response.content.startswith(b'%PDF')
+    assert response['Content-Disposition'] == 'attachment; filename="resume.pdf"'
+    assert response['Vary'] == 'Accept'
+    assert float(response['X-ATS-Score']) == ats_results['score']
+    assert json.loads(response['X-ATS-Feedback']) == ats_results['feedback']
+    assert json.loads(response['X-ATS-Missing-Keywords']) == ats_results['missing_keywords']
+    assert json.loads(response['X-ATS-Matched-Keywords']) == ats_results['matched_keywords']
+    assert ats_results['missing_keywords'] and ats_results['matched_keywords']
+
+
+def test_multipart_response_has_a_json_part_and_a_pdf_part(ats_results):
+    response = post(HTTP_ACCEPT='multipart/mixed')
+    assert response.status_code == 200
+    content_type, _, boundary = response['Content-Type'].partition('; boundary=')
+    assert content_type == 'multipart/mixed'
+    boundary = boundary.strip('"').encode()
+
+    parts = response.content.split(b'--' + boundary)
+    assert parts[0] == b'' and parts[-1] == b'--\r\n'
+    json_headers, _, json_part = parts[1].partition(b'\r\n\r\n')
+    pdf_headers, _, pdf_part = parts[2].partition(b'\r\n\r\n')
+    assert b'Content-Type: application/json' in json_headers
+    assert json.loads(json_part) == ats_summary(ats_results)
+    assert b'Content-Type: application/pdf' in pdf_headers
+    assert pdf_part.startswith(b'%PDF') and pdf_part.endswith(b'\r\n')
+    assert 'X-ATS-Score' not in response
+
+
+@pytest.mark.parametrize('accept', ['text/html', 'application/json;q=0, application/pdf;q=0'])
+def test_unsupported_accept_is_not_acceptable(monkeypatch, accept):
+    monkeypatch.setattr(views.renderer, 'render', lambda *args: pytest.fail('rendered a refused response'))
+    response = post(HTTP_ACCEPT=accept)
+    assert response.status_code == 406
+    assert response.json() == {'error': 'Can only respond with application/json, application/pdf, multipart/mixed'}
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from django.core.cache import caches
+from django.test import Client, override_settings
+from resume_builder import jobs, views
+
+
+def fake_render(item):
+    if item.get('fail'):
+        raise ValueError('bad resume')
+    return b'%PDF' + b'x' * item['size'], {'score': item['size']}
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(jobs, 'get_render_pool', lambda: executor)
+    monkeypatch.setattr(jobs, 'render_resume_item', fake_render)
+    yield executor
+    executor.shutdown()
+
+
+def run(queue, item):
+    # Done callbacks run in order, so this one fires after the queue has recorded the job.
+    finished = threading.Event()
+    job = queue.submit(item)
+    job.future.add_done_callback(lambda future: finished.set())
+    finished.wait()
+    return job
+
+
+def test_oldest_finished_jobs_are_evicted_over_max_bytes(pool):
+    queue = jobs.RenderJobQueue(max_bytes=250)
+    first = run(queue, {'size': 96})
+    second = run(queue, {'size': 96})
+    assert queue.get(first.id) is first and queue.get(second.id) is second
+
+    third = run(queue, {'size': 96})
+    assert queue.get(first.id) is None
+    assert queue.get(second.id) is second and queue.get(third.id) is third
+
+
+@pytest.fixture
+def job_cache():
+    with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                                   'jobs': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                            'LOCATION': 'resume-jobs'}}):
+        yield 'jobs'
+        caches['jobs'].clear()
+
+
+def test_shared_cache_serves_jobs_of_other_processes(pool, job_cache):
+    accepting = jobs.RenderJobQueue(cache_alias=job_cache)
+    other = jobs.RenderJobQueue(cache_alias=job_cache)
+    done = run(accepting, {'size': 10})
+    failed = run(accepting, {'fail': True})
+
+    job = other.get(done.id)
+    assert isinstance(job, jobs.StoredJob)
+    assert (job.status, job.ats_results) == ('done', {'score': 10})
+    assert job.result() == done.result()
+    assert (other.get(failed.id).status, other.get(failed.id).error) == ('failed', 'bad resume')
+    assert other.get('unknown') is None
+
+
+def test_wait_polls_the_shared_cache_until_done(pool, job_cache, monkeypatch):
+    accepting = jobs.RenderJobQueue(cache_alias=job_cache)
+    other = jobs.RenderJobQueue(cache_alias=job_cache)
+    monkeypatch.setattr(jobs, 'SHARED_POLL_INTERVAL', 0.01)
+    blocker = pool.submit(asyncio.run, asyncio.sleep(0.1))
+    queued = accepting.submit({'size': 5})
+
+    job = other.get(queued.id)
+    assert job.status == 'queued'
+    job = asyncio.run(other.wait(job, 5))
+    blocker.result()
+    assert (job.status, job.ats_results) == ('done', {'score': 5})
+
+
+def test_pdf_request_for_a_job_whose_pdf_expired_is_gone(pool, job_cache, monkeypatch):
+    accepting = jobs.RenderJobQueue(cache_alias=job_cache)
+    other = jobs.RenderJobQueue(cache_alias=job_cache)
+    monkeypatch.setattr(views, 'get_job_queue', lambda: other)
+    ats_results = {'score': 10, 'feedback': [], 'missing_keywords': [], 'matched_keywords': ['python']}
+    monkeypatch.setattr(jobs, 'render_resume_item', lambda item: (b'%PDF' + b'x' * item['size'], ats_results))
+    done = run(accepting, {'size': 10})
+
+    response = Client().get(f'/resume-jobs/{done.id}/pdf/')
+    assert response.status_code == 200 and response.content == done.result()[0]
+    assert response['X-ATS-Score'] == '10'
+
+    caches[job_cache].delete(jobs._pdf_key(done.id))
+    response = Client().get(f'/resume-jobs/{done.id}/pdf/')
+    assert response.status_code == 410
+    assert response.json() == {'job_id': done.id, 'status': 'expired', 'error': 'The PDF of this job has expired'}
+    assert Client().get('/resume-jobs/unknown/pdf/').status_code == 404
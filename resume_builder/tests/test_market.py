@@ -0,0 +1,92 @@
+import time
+import pandas as pd
+import pytest
+from django.test import Client, override_settings
+from django.urls import resolve
+from resume_builder import market
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    data_path = tmp_path / 'merged_data.csv'
+    pd.DataFrame({
+        'job_title': ['Volunteer Coordinator', 'Fundraiser', 'Data Analyst'],
+        'skills': ['outreach, care', 'outreach, events', 'python, sql'],
+        'Sector': ['Non-profit/Volunteer', 'Non-profit/Volunteer', 'Technology'],
+    }).to_csv(data_path, index=False)
+    service = market.JobMarketService(str(data_path), poll_interval=0)
+    monkeypatch.setattr(market, '_service', service)
+    return service
+
+
+def loaded(service):
+    service.start()
+    service._thread.join()
+    return service
+
+
+def test_sector_names_with_slashes_resolve():
+    match = resolve('/sectors/Non-profit/Volunteer/')
+    assert (match.url_name, match.kwargs) == ('sector_demand', {'sector': 'Non-profit/Volunteer'})
+
+
+def test_sector_demand_for_a_sector_with_a_slash(service):
+    loaded(service)
+    response = Client().get('/sectors/non-profit/volunteer/')
+    assert response.status_code == 200
+    assert response.json()['sector'] == 'Non-profit/Volunteer'
+    assert response.json()['top_skills'] == {'outreach': 2, 'care': 1, 'events': 1}
+
+
+def test_endpoints_answer_503_until_the_data_is_loaded(service):
+    response = Client().get('/sectors/')
+    assert response.status_code == 503
+
+    loaded(service)
+    assert service.status()['loaded']
+    assert Client().get('/sectors/').json()['sectors'] == [{'name': 'Non-profit/Volunteer', 'jobs': 2},
+                                                          {'name': 'Technology', 'jobs': 1}]
+
+
+@pytest.mark.parametrize('preload', [False, True])
+def test_preload_starts_loading_only_when_configured(tmp_path, monkeypatch, preload):
+    monkeypatch.setattr(market, '_service', None)
+    with override_settings(JOB_MARKET_PRELOAD=preload, JOB_MARKET_DATA_PATH=tmp_path / 'missing.csv',
+                           JOB_MARKET_POLL_INTERVAL=0):
+        market.preload_job_market()
+    if preload:
+        market._service._thread.join()
+        assert market._service.status()['error'].startswith('Could not find data file')
+    else:
+        assert market._service is None
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_failed_reload_keeps_the_old_data_and_the_watcher(tmp_path, monkeypatch):
+    data_path = tmp_path / 'merged_data.csv'
+    frame = pd.DataFrame({'job_title': ['Nurse'], 'skills': ['care'], 'Sector': ['Healthcare']})
+    frame.to_csv(data_path, index=False)
+    service = market.JobMarketService(str(data_path), poll_interval=0.01)
+    service.start()
+    wait_for(lambda: service.data is not None)
+    old_data = service.data
+
+    def unreadable(path):
+        raise PermissionError(13, 'Permission denied', path)
+
+    monkeypatch.setattr(market, 'JobMarketData', unreadable)
+    pd.concat([frame, frame.assign(job_title='Doctor')]).to_csv(data_path, index=False)
+    wait_for(lambda: service.last_error is not None)
+    assert 'PermissionError' in service.status()['error']
+    assert service.data is old_data and service._thread.is_alive()
+
+    monkeypatch.undo()
+    wait_for(lambda: service.data is not old_data)
+    service.stop()
+    assert service.status()['jobs'] == 2 and service.status()['error'] is None
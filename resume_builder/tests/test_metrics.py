@@ -0,0 +1,65 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from asgiref.sync import iscoroutinefunction
+from django.http import HttpResponse
+from resume_builder import metrics
+
+
+def view(request):
+    with metrics.timed('render'):
+        return HttpResponse('ok')
+
+
+async def async_view(request):
+    with metrics.timed('render'):
+        await asyncio.sleep(0)
+    return HttpResponse('ok')
+
+
+def request():
+    return SimpleNamespace(resolver_match=SimpleNamespace(view_name='resume:test'))
+
+
+@pytest.fixture
+def saved_profiles(monkeypatch):
+    saved = []
+    monkeypatch.setattr(metrics.RequestMetricsMiddleware, 'save_profile',
+                        lambda self, profiler, endpoint: saved.append(endpoint))
+    return saved
+
+
+def profiled(middleware):
+    middleware.sample_rate = 1.0
+    middleware.slow_seconds = 0
+    return middleware
+
+
+def test_sync_chain(saved_profiles):
+    middleware = profiled(metrics.RequestMetricsMiddleware(view))
+    assert not iscoroutinefunction(middleware)
+
+    response = middleware(request())
+    assert response['Server-Timing'].startswith('render;dur=')
+    assert saved_profiles == ['resume:test']
+
+
+def test_async_chain_awaits_the_view(saved_profiles):
+    middleware = profiled(metrics.RequestMetricsMiddleware(async_view))
+    assert iscoroutinefunction(middleware)
+
+    response = asyncio.run(middleware(request()))
+    assert response['Server-Timing'].startswith('render;dur=')
+    assert saved_profiles == ['resume:test']
+
+
+def test_sampled_request_goes_unprofiled_while_another_profile_runs(saved_profiles):
+    middleware = profiled(metrics.RequestMetricsMiddleware(async_view))
+
+    async def overlapping():
+        return await asyncio.gather(middleware(request()), middleware(request()))
+
+    responses = asyncio.run(overlapping())
+    assert all('total;dur=' in response['Server-Timing'] for response in responses)
+    assert saved_profiles == ['resume:test']
+    assert not metrics._profile_lock.locked()
@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, setup_databases, teardown_databases
+from resume_builder.models import Job, Skill, fts_query, has_job_fts
+
+
+@pytest.fixture(scope='module')
+def jobs(tmp_path_factory):
+    databases = setup_databases(verbosity=0, interactive=False)
+    data_path = tmp_path_factory.mktemp('jobs') / 'merged_data.csv'
+    pd.DataFrame({
+        'job_title': ['Data Analyst', 'Nurse', 'Volunteer Coordinator', 'Élève Manager', 'C++ OR Java Developer'],
+        'skills': ['Python, SQL', 'care, empathy', 'outreach, care', 'menus, care', 'C++, java'],
+        'Sector': ['Technology', 'Healthcare', 'Non-profit/Volunteer', 'ÉDUCATION', 'Technology'],
+    }).to_csv(data_path, index=False)
+    call_command('import_jobs', str(data_path), stdout=open('/dev/null', 'w'))
+    yield
+    teardown_databases(databases, verbosity=0)
+
+
+def names(skills):
+    return [(skill.name, skill.job_count) for skill in skills]
+
+
+def test_most_common_matches_sectors_case_insensitively(jobs):
+    assert names(Skill.objects.most_common('non-profit/volunteer')) == [('care', 1), ('outreach', 1)]
+    assert names(Skill.objects.most_common('éducation')) == [('care', 1), ('menus', 1)]
+    assert names(Skill.objects.most_common('technology', top_n=1)) == [('c++', 1)]
+    assert names(Skill.objects.most_common('Unknown')) == []
+
+
+def test_saving_a_job_updates_its_sector_key(jobs):
+    job = Job.objects.get(title='Nurse')
+    job.sector = 'Public HEALTH'
+    job.save()
+    assert Job.objects.get(title='Nurse').sector_key == 'public health'
+    job.sector = 'Healthcare'
+    job.save()
+
+
+def test_fts_query_quotes_every_term():
+    assert fts_query('data  analyst') == '"data" "analyst"'
+    assert fts_query('C++ OR "java" title:x*') == '"C++" "OR" """java""" "title:x*"'
+
+
+@pytest.mark.parametrize('query, titles', [
+    ('analyst', ['Data Analyst']),
+    ('care', ['Nurse', 'Volunteer Coordinator', 'Élève Manager']),
+    ('care outreach', ['Volunteer Coordinator']),
+    ('OR', ['C++ OR Java Developer']),
+    ('"java', ['C++ OR Java Developer']),
+    ('title:analyst', []),
+    ('NEAR( AND', []),
+    ('   ', []),
+])
+def test_search_treats_the_query_as_plain_text(jobs, query, titles):
+    assert has_job_fts()
+    assert sorted(job.title for job in Job.objects.search(query)) == sorted(titles)
+
+
+def test_search_checks_for_the_index_once_per_connection(jobs):
+    list(Job.objects.search('nurse'))
+    with CaptureQueriesContext(connection) as queries:
+        assert [job.title for job in Job.objects.search('nurse')] == ['Nurse']
+    assert len(queries) == 1
@@ -0,0 +1,75 @@
+import threading
+import pytest
+from django.core.cache import caches
+from django.test import override_settings
+from resume_builder import ats
+from resume_builder.ats import JobDescriptionProfileCache, job_description_profile
+
+POSTINGS = ['Python developer with SQL. Python and SQL daily.', 'Registered nurse. Patient care and triage.',
+            'Accountant with Excel. Excel and bookkeeping.']
+
+
+@pytest.fixture
+def profile_cache_alias():
+    with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                                   'profiles': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                                'LOCATION': 'ats-profiles'}}):
+        yield 'profiles'
+        caches['profiles'].clear()
+
+
+def test_stats_count_hits_misses_and_evictions():
+    cache = JobDescriptionProfileCache(maxsize=2)
+    assert cache.stats() == {'size': 0, 'maxsize': 2, 'hits': 0, 'shared_hits': 0, 'misses': 0, 'hit_rate': 0.0,
+                             'shared': False}
+    assert cache.get(POSTINGS[0]) == job_description_profile(POSTINGS[0])
+    cache.get(POSTINGS[0])
+    cache.get(POSTINGS[0], legacy=True)
+    assert cache.get(POSTINGS[0], legacy=True) == job_description_profile(POSTINGS[0], legacy=True)
+    assert cache.stats() == {'size': 2, 'maxsize': 2, 'hits': 2, 'shared_hits': 0, 'misses': 2, 'hit_rate': 0.5,
+                             'shared': False}
+
+    # The least recently used profile makes room for a new one.
+    cache.get(POSTINGS[0])
+    cache.get(POSTINGS[1])
+    cache.get(POSTINGS[0], legacy=True)
+    stats = cache.stats()
+    assert (stats['size'], stats['hits'], stats['misses']) == (2, 3, 4)
+
+    cache.clear()
+    assert cache.stats()['size'] == cache.stats()['hits'] == cache.stats()['misses'] == 0
+
+
+def test_profiles_are_shared_between_caches_through_the_alias(profile_cache_alias):
+    first = JobDescriptionProfileCache(cache_alias=profile_cache_alias)
+    second = JobDescriptionProfileCache(cache_alias=profile_cache_alias)
+    for posting in POSTINGS:
+        first.get(posting)
+    assert [second.get(posting) for posting in POSTINGS] == [job_description_profile(posting) for posting in POSTINGS]
+    second.get(POSTINGS[0])
+    assert first.stats()['misses'] == 3
+    assert second.stats() == {'size': 3, 'maxsize': 256, 'hits': 1, 'shared_hits': 3, 'misses': 0, 'hit_rate': 1.0,
+                              'shared': True}
+
+
+def test_shared_cache_is_looked_up_in_each_thread(profile_cache_alias):
+    cache = JobDescriptionProfileCache(maxsize=0, cache_alias=profile_cache_alias)
+    cache.get(POSTINGS[0])
+    assert cache.shared_cache is caches[profile_cache_alias]
+
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append((cache.shared_cache, cache.get(POSTINGS[0]))))
+    thread.start()
+    thread.join()
+    assert seen[0][0] is not cache.shared_cache
+    assert seen[0][1] == job_description_profile(POSTINGS[0])
+    assert (cache.stats()['shared_hits'], cache.stats()['misses']) == (1, 1)
+
+
+def test_get_profile_cache_reads_the_settings(monkeypatch, profile_cache_alias):
+    monkeypatch.setattr(ats, '_profile_cache', None)
+    with override_settings(ATS_PROFILE_CACHE=profile_cache_alias, ATS_PROFILE_CACHE_SIZE=8):
+        profile_cache = ats.get_profile_cache()
+    assert ats.get_profile_cache() is profile_cache
+    assert (profile_cache.cache_alias, profile_cache.maxsize) == (profile_cache_alias, 8)
+    assert profile_cache.stats()['shared']
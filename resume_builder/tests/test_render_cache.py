@@ -0,0 +1,137 @@
+import base64
+import json
+import os
+import time
+import pytest
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.test import Client, override_settings
+from resume_builder import render_cache, views
+from resume_builder.render_cache import DiskRenderCache
+
+BODY = {
+    'resume_data': {'name': 'Jane Doe', 'email': 'jane@example.com', 'summary': 'Python developer',
+                    'skills': {'technical': ['Python', 'SQL']}},
+    'job_description': 'Python developer with SQL. Python and SQL daily.',
+}
+
+
+def post(body=BODY, **headers):
+    return Client().post('/create-resume/', data=json.dumps(body), content_type='application/json', **headers)
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Records the output object of every render."""
+    outputs = []
+    render = views.renderer.render
+
+    def counting_render(resume_data, output):
+        outputs.append(output)
+        render(resume_data, output)
+
+    monkeypatch.setattr(views.renderer, 'render', counting_render)
+    return outputs
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(render_cache, '_render_cache', None)
+    with override_settings(RESUME_RENDER_CACHE_DIR=tmp_path / 'render_cache', RESUME_RENDER_CACHE_ALIAS=None):
+        yield tmp_path / 'render_cache'
+    render_cache._render_cache = None
+
+
+@pytest.fixture
+def no_cache(monkeypatch):
+    monkeypatch.setattr(render_cache, '_render_cache', None)
+    with override_settings(RESUME_RENDER_CACHE_DIR=None, RESUME_RENDER_CACHE_ALIAS=None):
+        yield
+    render_cache._render_cache = None
+
+
+def test_weak_etag_per_representation(no_cache):
+    json_etag = post()['ETag']
+    pdf_etag = post(HTTP_ACCEPT='application/pdf')['ETag']
+    assert json_etag.startswith('W/"') and json_etag.endswith('-json"')
+    assert pdf_etag == json_etag.replace('-json"', '-pdf"')
+    assert post(dict(BODY, job_description='Other'))['ETag'] != json_etag
+
+
+@pytest.mark.parametrize('if_none_match', ['{etag}', '{strong}', '"other", {etag}', '*'])
+def test_matching_if_none_match_fails_the_precondition(no_cache, renders, if_none_match):
+    etag = post()['ETag']
+    renders.clear()
+    response = post(HTTP_IF_NONE_MATCH=if_none_match.format(etag=etag, strong=etag.removeprefix('W/')))
+    assert response.status_code == 412
+    assert response['ETag'] == etag
+    assert renders == []
+
+
+def test_other_if_none_match_renders(no_cache):
+    assert post(HTTP_IF_NONE_MATCH='W/"other"').status_code == 200
+
+
+def test_without_a_cache_the_pdf_is_rendered_into_the_response(no_cache, renders):
+    response = post(HTTP_ACCEPT='application/pdf')
+    assert response.status_code == 200 and response.content.startswith(b'%PDF')
+    assert len(renders) == 1 and isinstance(renders[0], HttpResponse)
+    assert base64.b64decode(post().json()['pdf']).startswith(b'%PDF')
+
+
+def test_cache_hit_skips_the_render(cache_dir, renders):
+    first = post(HTTP_ACCEPT='application/pdf')
+    second = post(HTTP_ACCEPT='application/pdf')
+    assert len(renders) == 1
+    assert second.content == first.content and second['X-ATS-Score'] == first['X-ATS-Score']
+    key = views.render_key(BODY['resume_data'], BODY['job_description'])
+    assert sorted(os.listdir(cache_dir)) == [f'{key}.json', f'{key}.pdf']
+
+    post(dict(BODY, job_description='Something else entirely'), HTTP_ACCEPT='application/pdf')
+    assert len(renders) == 2
+
+
+def touch(cache, key, age):
+    when = time.time() - age
+    os.utime(os.path.join(cache.directory, key + '.pdf'), (when, when))
+
+
+def test_eviction_drops_least_recently_used_entries(tmp_path):
+    cache = DiskRenderCache(tmp_path, max_bytes=3000)
+    for score, (key, age) in enumerate([('a', 30), ('b', 20), ('c', 10)]):
+        cache.set(key, b'x' * 900, {'score': score})
+        touch(cache, key, age)
+    # A hit makes the oldest entry the most recently used.
+    cache.get('a')
+
+    cache.set('d', b'x' * 900, {'score': 3})
+    assert set(cache.entries()) == {'a', 'c', 'd'}
+    assert cache.get('b') is None and cache.get('a') == (b'x' * 900, {'score': 0})
+
+
+def test_eviction_counts_entries_of_other_processes(tmp_path):
+    first = DiskRenderCache(tmp_path, max_bytes=3000)
+    second = DiskRenderCache(tmp_path, max_bytes=3000)
+    first.set('a', b'x' * 900, {})
+    second.set('b', b'x' * 900, {})
+    touch(first, 'a', 20)
+    touch(second, 'b', 10)
+
+    first.set('c', b'x' * 900, {})
+    first.set('d', b'x' * 900, {})
+    assert set(second.entries()) == {'b', 'c', 'd'}
+    assert sum(size for size, _ in first.entries().values()) <= 3000
+
+
+def test_django_cache_alias_is_looked_up_on_each_use(monkeypatch, renders):
+    monkeypatch.setattr(render_cache, '_render_cache', None)
+    with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                                   'renders': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                               'LOCATION': 'resume-renders'}},
+                           RESUME_RENDER_CACHE_ALIAS='renders', RESUME_RENDER_CACHE_DIR=None):
+        first = post(HTTP_ACCEPT='application/pdf')
+        second = post(HTTP_ACCEPT='application/pdf')
+        assert len(renders) == 1 and second.content == first.content
+        assert render_cache.get_render_cache().alias == 'renders'
+        caches['renders'].clear()
+    render_cache._render_cache = None
@@ -0,0 +1,55 @@
+import io
+import threading
+import pytest
+from reportlab import rl_config
+from reportlab.pdfgen import canvas
+import synthetic
+from resume_builder.rendering import BOLD_STYLE, NORMAL_STYLE, ResumeRenderer
+
+
+@pytest.fixture
+def invariant(monkeypatch):
+    """Leaves the creation date and document ID out of PDFs, so equal layouts give equal bytes."""
+    monkeypatch.setattr(rl_config, 'invariant', 1)
+
+
+def render(renderer, resume_data):
+    output = io.BytesIO()
+    renderer.render(resume_data, output)
+    return output.getvalue()
+
+
+def test_cached_paragraphs_give_the_same_pdf(invariant):
+    resumes = synthetic.resumes(5, max_experience=6)
+    # Each resume twice, so the second render reuses the first one's paragraphs.
+    resumes = [resume for resume in resumes for _ in range(2)]
+    uncached, cached = ResumeRenderer(cache_size=0), ResumeRenderer()
+    expected = [render(uncached, resume) for resume in resumes]
+    assert [render(cached, resume) for resume in resumes] == expected
+    assert len(cached._local.paragraphs) > len(resumes)
+    assert len(uncached._local.paragraphs) == 0
+
+
+def test_cache_is_an_lru_bounded_by_cache_size():
+    renderer = ResumeRenderer(cache_size=2)
+    canvas_obj = canvas.Canvas(io.BytesIO())
+    first = renderer._paragraph(canvas_obj, 'first', NORMAL_STYLE)
+    renderer._paragraph(canvas_obj, 'second', NORMAL_STYLE)
+    assert renderer._paragraph(canvas_obj, 'first', NORMAL_STYLE) is first
+    renderer._paragraph(canvas_obj, 'third', NORMAL_STYLE)
+    assert list(renderer._local.paragraphs) == [('first', 'ResumeNormal'), ('third', 'ResumeNormal')]
+    # The same text in another style is a separate entry.
+    assert renderer._paragraph(canvas_obj, 'first', BOLD_STYLE) is not first
+
+    render(renderer, synthetic.resumes(1, min_experience=5)[0])
+    assert len(renderer._local.paragraphs) == 2
+
+
+def test_each_thread_has_its_own_cache():
+    renderer = ResumeRenderer()
+    render(renderer, synthetic.resumes(1)[0])
+    other = []
+    thread = threading.Thread(target=lambda: other.append(getattr(renderer._local, 'paragraphs', None)))
+    thread.start()
+    thread.join()
+    assert renderer._local.paragraphs and other == [None]
@@ -3,4 +3,16 @@ from . import views  # Import from current app
 
 urlpatterns = [
     path('create-resume/', views.create_ats_friendly_resume, name='create_resume'),
+    path('create-resumes/batch/', views.create_ats_friendly_resumes_batch, name='create_resumes_batch'),
+    path('resume-jobs/', views.submit_resume_job, name='submit_resume_job'),
+    path('resume-jobs/<str:job_id>/', views.resume_job_status, name='resume_job_status'),
+    path('resume-jobs/<str:job_id>/pdf/', views.resume_job_pdf, name='resume_job_pdf'),
+    path('ats/score-batch/', views.score_ats_batch, name='score_ats_batch'),
+    path('ats/profile-cache/', views.ats_profile_cache_stats, name='ats_profile_cache_stats'),
+    path('jobs/search/', views.search_jobs_by_skill, name='search_jobs_by_skill'),
+    path('sectors/', views.list_sectors, name='list_sectors'),
+    # path, not str: sector names such as 'Non-profit/Volunteer' contain slashes.
+    path('sectors/<path:sector>/', views.sector_demand, name='sector_demand'),
+    path('skills/related/', views.related_skills, name='related_skills'),
+    path('job-market/', views.job_market_status, name='job_market_status'),
 ]
\ No newline at end of file
@@ -1,204 +1,166 @@
-from django.http import HttpResponse, JsonResponse
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import Paragraph
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.conf import settings
 import json
 from django.views.decorators.csrf import csrf_exempt
-from reportlab.lib.units import inch
 import base64
-import re
-from collections import defaultdict
+import io
+from .ats import ats_summary, calculate_ats_score_with_feedback, get_profile_cache
+from .ats_batch import score_resume_against_jobs, score_resumes_against_job
+from .batch import stream_ndjson, stream_zip
+from .jobs import QueueFull, get_job_queue
+from .market import get_job_market_service
+from .metrics import timed
+from .render_cache import get_render_cache, render_key
+from .rendering import renderer
+
+RESPONSE_TYPES = ('application/json', 'application/pdf', 'multipart/mixed')
+
+
+def preferred_response_type(accept_header):
+    """Picks the response type for create-resume from an Accept header, or None if none is acceptable.
+
+    JSON (with the PDF base64-encoded) stays the default for existing clients
+    and for */*; application/pdf or multipart/mixed are chosen only when the
+    client asks for them with a higher quality value, or names them where
+    JSON only matches a wildcard. Each type takes the quality of its most
+    specific range, so "*/*, application/pdf;q=0" rules out the PDF.
+    """
+    if not accept_header.strip():
+        return 'application/json'
+    ranks = {}
+    for position, media_range in enumerate(accept_header.split(',')):
+        media_type, _, params = media_range.strip().partition(';')
+        media_type = media_type.strip().lower()
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        for order, response_type in enumerate(RESPONSE_TYPES):
+            if media_type == response_type:
+                specificity = 2
+            elif media_type == response_type.split('/')[0] + '/*':
+                specificity = 1
+            elif media_type == '*/*':
+                specificity = 0
+            else:
+                continue
+            if response_type not in ranks or specificity > ranks[response_type][1]:
+                ranks[response_type] = (quality, specificity, -position, -order)
+    acceptable = {response_type: rank for response_type, rank in ranks.items() if rank[0] > 0}
+    return max(acceptable, key=acceptable.get) if acceptable else None
+
+
+def add_ats_headers(response, ats_results):
+    """Sends the ATS results alongside a raw PDF body, JSON-encoded where needed."""
+    response['X-ATS-Score'] = str(ats_results['score'])
+    response['X-ATS-Feedback'] = json.dumps(ats_results['feedback'])
+    response['X-ATS-Missing-Keywords'] = json.dumps(ats_results['missing_keywords'])
+    response['X-ATS-Matched-Keywords'] = json.dumps(ats_results['matched_keywords'])
+
+
+ETAG_SUFFIXES = {'application/json': 'json', 'application/pdf': 'pdf', 'multipart/mixed': 'mixed'}
+
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison of etag against an If-None-Match header, as RFC 9110 requires for it."""
+    if if_none_match.strip() == '*':
+        return True
+    return etag.removeprefix('W/') in (tag.strip().removeprefix('W/') for tag in if_none_match.split(','))
+
+
+def render_resume(resume_data, job_description, key, legacy):
+    """Returns (pdf_bytes, ats_results), from the render cache when possible.
+
+    pdf_bytes is None when no render cache is configured: there is nothing
+    to store, so the caller renders straight into its response with
+    write_pdf() instead of copying the PDF out of a buffer.
+    """
+    render_cache = get_render_cache()
+    if render_cache is not None:
+        with timed('cache'):
+            cached = render_cache.get(key)
+        if cached is not None:
+            return cached
+
+    # Calculate ATS Score and detailed feedback
+    with timed('ats'):
+        ats_results = calculate_ats_score_with_feedback(resume_data, job_description, legacy=legacy)
+    if render_cache is None:
+        return None, ats_results
+    output = io.BytesIO()
+    renderer.render(resume_data, output)
+    pdf_bytes = output.getvalue()
+    with timed('cache_store'):
+        render_cache.set(key, pdf_bytes, ats_results)
+    return pdf_bytes, ats_results
+
+
+def write_pdf(output, resume_data, pdf_bytes):
+    """Writes the PDF render_resume() returned to output, rendering it there if it was not buffered."""
+    if pdf_bytes is None:
+        renderer.render(resume_data, output)
+    else:
+        output.write(pdf_bytes)
+
 
 @csrf_exempt
 def create_ats_friendly_resume(request):
     if request.method == 'POST':
         try:
+            response_type = preferred_response_type(request.headers.get('Accept', ''))
+            if response_type is None:
+                return JsonResponse({'error': f"Can only respond with {', '.join(RESPONSE_TYPES)}"}, status=406)
+
             # Parse the JSON data
-            data = json.loads(request.body.decode('utf-8'))
+            with timed('parse'):
+                data = json.loads(request.body.decode('utf-8'))
             resume_data = data.get('resume_data', {})
             job_description = data.get('job_description', "")
 
-            # Set up the PDF response
-            response = HttpResponse(content_type='application/pdf')
-            response['Content-Disposition'] = 'attachment; filename="resume.pdf"'
-            p = canvas.Canvas(response, pagesize=letter)
-
-            # --- ATS-Optimized Styling ---
-            styles = getSampleStyleSheet()
-            normal = styles['Normal']
-            normal.fontName = 'Helvetica'
-            normal.fontSize = 11  # Slightly larger for better readability
-            normal.leading = 12
-            normal.spaceAfter = 6
-
-            bold_style = ParagraphStyle(
-                'Bold',
-                parent=normal,
-                fontName='Helvetica-Bold',
-                spaceAfter=6
-            )
-
-            section_style = ParagraphStyle(
-                'Section',
-                parent=normal,
-                fontName='Helvetica-Bold',
-                fontSize=12,
-                spaceAfter=12,
-                spaceBefore=12
-            )
-
-            # --- Helper functions ---
-            def draw_plain_text(canvas_obj, x, y, text, style=normal):
-                """Draws plain text on the canvas."""
-                para = Paragraph(text, style)
-                para.wrapOn(canvas_obj, letter[0] - 2 * inch, letter[1])
-                para.drawOn(canvas_obj, x, y - para.height)
-                return y - para.height - style.spaceAfter
-
-            def add_section_title(y, title):
-                """Adds a plain section title."""
-                return draw_plain_text(p, 100, y, title.upper(), section_style)
-
-            def add_bullet_point(y, text):
-                """Adds a plain bullet point."""
-                return draw_plain_text(p, 120, y, f"• {text}", normal)
-
-            # --- Populate the PDF with ATS-optimized content ---
-            y = 750  # Initial vertical position
-
-            # Header with name and contact info
-            y = draw_plain_text(p, 100, y, resume_data.get('name', '').upper(), bold_style)
-            
-            contact_info = f"{resume_data.get('email', '')} | {resume_data.get('phone', '')}"
-            if resume_data.get('linkedin'):
-                contact_info += f" | LinkedIn: {resume_data['linkedin']}"
-            if resume_data.get('portfolio'):
-                contact_info += f" | Portfolio: {resume_data['portfolio']}"
-            y = draw_plain_text(p, 100, y, contact_info, normal)
-            y -= 20
-
-            # Summary/Objective - optimized for keywords
-            if resume_data.get('summary'):
-                y = add_section_title(y, "PROFESSIONAL SUMMARY")
-                summary = resume_data['summary']
-                # Ensure summary ends with a period
-                if not summary.strip().endswith('.'):
-                    summary += '.'
-                y = draw_plain_text(p, 100, y, summary, normal)
-                y -= 10
-
-            # Core Competencies/Key Skills section
-            if resume_data.get('skills'):
-                y = add_section_title(y, "CORE COMPETENCIES")
-                skills_text = []
-                for skill_type, skills in resume_data['skills'].items():
-                    skills_text.extend(skills)
-                # Group skills in chunks of 3-4 for better readability
-                skill_groups = [skills_text[i:i+4] for i in range(0, len(skills_text), 4)]
-                for group in skill_groups:
-                    y = draw_plain_text(p, 100, y, " • " + " • ".join(group), normal)
-                y -= 10
-
-            # Professional Experience - optimized with action verbs
-            if resume_data.get('experience'):
-                y = add_section_title(y, "PROFESSIONAL EXPERIENCE")
-                for exp in resume_data['experience']:
-                    title = exp.get('title', '')
-                    company = exp.get('company', '')
-                    years = exp.get('years', '')
-                    location = exp.get('location', '')
-                    
-                    # Format experience header
-                    exp_header = f"{title.upper()}"
-                    if company:
-                        exp_header += f", {company}"
-                    if location:
-                        exp_header += f" ({location})"
-                    if years:
-                        exp_header += f" | {years}"
-                    
-                    y = draw_plain_text(p, 100, y, exp_header, bold_style)
-                    
-                    # Format responsibilities with action verbs
-                    if exp.get('responsibilities'):
-                        for resp in exp.get('responsibilities', []):
-                            responsibility = resp.get('responsibility', '')
-                            # Ensure responsibility starts with action verb
-                            if responsibility and not responsibility[0].isupper():
-                                responsibility = responsibility[0].upper() + responsibility[1:]
-                            y = add_bullet_point(y, responsibility)
-                    y -= 10
-
-            # Education - plain format
-            if resume_data.get('education'):
-                y = add_section_title(y, "EDUCATION")
-                for edu in resume_data['education']:
-                    degree = edu.get('degree', '')
-                    university = edu.get('university', '')
-                    year = edu.get('year', '')
-                    gpa = edu.get('gpa', '')
-                    
-                    edu_text = f"{degree.upper()}"
-                    if university:
-                        edu_text += f", {university}"
-                    if year:
-                        edu_text += f" ({year})"
-                    if gpa:
-                        edu_text += f" | GPA: {gpa}"
-                    
-                    y = draw_plain_text(p, 100, y, edu_text, bold_style)
-                    
-                    if edu.get('description'):
-                        y = draw_plain_text(p, 100, y, edu['description'], normal)
-                    y -= 10
-
-            # Certifications
-            if resume_data.get('certifications'):
-                y = add_section_title(y, "CERTIFICATIONS")
-                for cert in resume_data['certifications']:
-                    cert_text = f"{cert.get('name', '').upper()}"
-                    if cert.get('year'):
-                        cert_text += f" ({cert.get('year')})"
-                    if cert.get('issuer'):
-                        cert_text += f", {cert.get('issuer')}"
-                    y = draw_plain_text(p, 100, y, cert_text, normal)
-                y -= 10
-
-            # Projects - focused on technologies and outcomes
-            if resume_data.get('projects'):
-                y = add_section_title(y, "KEY PROJECTS")
-                for proj in resume_data['projects']:
-                    y = draw_plain_text(p, 100, y, f"{proj.get('name', '').upper()}", bold_style)
-                    if proj.get('description'):
-                        y = draw_plain_text(p, 100, y, proj['description'], normal)
-                    if proj.get('technologies'):
-                        y = draw_plain_text(p, 100, y, 
-                                           f"Technologies: {', '.join(proj['technologies'])}", 
-                                           normal)
-                    y -= 10
-
-            # Calculate ATS Score and detailed feedback
-            ats_results = calculate_ats_score_with_feedback(resume_data, job_description)
-            ats_score = ats_results['score']
-            feedback = ats_results['feedback']
-            missing_keywords = ats_results['missing_keywords']
-            matched_keywords = ats_results['matched_keywords']
-
-            # Finalize PDF
-            p.showPage()
-            p.save()
-            pdf_bytes = response.getvalue()
-            pdf_base64 = base64.b64encode(pdf_bytes).decode('utf-8')
-
-            return JsonResponse({
-                'pdf': pdf_base64,
-                'ats_score': ats_score,
-                'feedback': feedback,
-                'missing_keywords': missing_keywords,
-                'matched_keywords': matched_keywords,
-                'status': 'success'
-            })
+            # Identical submissions share a key. The ETag is weak since a
+            # re-rendered PDF need not be byte-identical. A POST whose
+            # If-None-Match matches fails its precondition (RFC 9110, 13.1.2),
+            # so a client can skip a render it already has.
+            legacy = getattr(settings, 'ATS_LEGACY_MATCHING', False)
+            key = render_key(resume_data, job_description, legacy)
+            etag = f'W/"{key}-{ETAG_SUFFIXES[response_type]}"'
+            if etag_matches(request.headers.get('If-None-Match', ''), etag):
+                response = HttpResponse(status=412)
+                response['ETag'] = etag
+                response['Vary'] = 'Accept'
+                return response
+
+            pdf_bytes, ats_results = render_resume(resume_data, job_description, key, legacy)
+
+            if response_type == 'multipart/mixed':
+                boundary = key[:32]
+                response = HttpResponse(content_type=f'multipart/mixed; boundary="{boundary}"')
+                response.write(f'--{boundary}\r\nContent-Type: application/json\r\n\r\n')
+                response.write(json.dumps(ats_summary(ats_results)))
+                response.write(f'\r\n--{boundary}\r\nContent-Type: application/pdf\r\n'
+                               f'Content-Disposition: attachment; filename="resume.pdf"\r\n\r\n')
+                write_pdf(response, resume_data, pdf_bytes)
+                response.write(f'\r\n--{boundary}--\r\n')
+            elif response_type == 'application/pdf':
+                response = HttpResponse(content_type='application/pdf')
+                response['Content-Disposition'] = 'attachment; filename="resume.pdf"'
+                write_pdf(response, resume_data, pdf_bytes)
+                add_ats_headers(response, ats_results)
+            else:
+                if pdf_bytes is None:
+                    output = io.BytesIO()
+                    renderer.render(resume_data, output)
+                    pdf_bytes = output.getbuffer()
+                with timed('encode'):
+                    pdf_base64 = base64.b64encode(pdf_bytes).decode('utf-8')
+                    response = JsonResponse({'pdf': pdf_base64, **ats_summary(ats_results)})
+            response['ETag'] = etag
+            response['Vary'] = 'Accept'
+            return response
 
         except json.JSONDecodeError:
             return JsonResponse({'error': 'Invalid JSON data'}, status=400)
@@ -207,140 +169,282 @@ def create_ats_friendly_resume(request):
     else:
         return JsonResponse({'error': 'Method not allowed'}, status=405)
 
-def calculate_ats_score_with_feedback(resume_data, job_description):
-    """Calculates ATS score and provides detailed feedback for improvement."""
-    if not job_description:
-        return {
-            'score': 0,
-            'feedback': ["No job description provided for ATS scoring."],
-            'missing_keywords': [],
-            'matched_keywords': []
-        }
-
-    # Extract keywords from job description (more sophisticated approach)
-    job_text = job_description.lower()
-    words = re.findall(r'\b[a-z]{3,}\b', job_text)  # Only words with 3+ letters
-    word_freq = defaultdict(int)
-    for word in words:
-        if len(word) > 2:  # Ignore very short words
-            word_freq[word] += 1
-    
-    # Remove common stop words
-    stop_words = {'the', 'and', 'for', 'with', 'this', 'that', 'have', 'has', 'had', 
-                 'you', 'your', 'will', 'would', 'should', 'they', 'their', 'them'}
-    keywords = {word: count for word, count in word_freq.items() 
-               if word not in stop_words and count > 1}
-    
-    # Also look for phrases (2-3 word sequences)
-    phrases = re.findall(r'\b(?:\w+\b\s*){2,3}', job_text)
-    phrase_freq = defaultdict(int)
-    for phrase in phrases:
-        phrase_freq[phrase] += 1
-    important_phrases = {phrase: count for phrase, count in phrase_freq.items() 
-                        if count > 1 and len(phrase.split()) > 1}
-
-    # Combine keywords and phrases
-    all_keywords = list(keywords.keys()) + list(important_phrases.keys())
-    
-    # Analyze resume content
-    resume_text = ""
-    
-    # Helper function to collect resume text
-    def add_to_resume_text(text):
-        nonlocal resume_text
-        if text:
-            resume_text += f" {text.lower()}"
-    
-    # Process each section of the resume
-    add_to_resume_text(resume_data.get('summary'))
-    
-    if resume_data.get('skills'):
-        for skill_type, skills in resume_data['skills'].items():
-            add_to_resume_text(" ".join(skills))
-    
-    if resume_data.get('experience'):
-        for exp in resume_data['experience']:
-            add_to_resume_text(exp.get('title'))
-            add_to_resume_text(exp.get('company'))
-            add_to_resume_text(exp.get('description'))
-            if exp.get('responsibilities'):
-                for resp in exp['responsibilities']:
-                    add_to_resume_text(resp.get('responsibility'))
-    
-    if resume_data.get('education'):
-        for edu in resume_data['education']:
-            add_to_resume_text(edu.get('degree'))
-            add_to_resume_text(edu.get('university'))
-            add_to_resume_text(edu.get('description'))
-    
-    if resume_data.get('projects'):
-        for proj in resume_data['projects']:
-            add_to_resume_text(proj.get('name'))
-            add_to_resume_text(proj.get('description'))
-            if proj.get('technologies'):
-                add_to_resume_text(" ".join(proj['technologies']))
-    
-    # Find matches and missing keywords
-    matched_keywords = []
-    missing_keywords = []
-    
-    for keyword in all_keywords:
-        if keyword in resume_text:
-            matched_keywords.append(keyword)
-        else:
-            missing_keywords.append(keyword)
-    
-    # Calculate score
-    total_keywords = len(all_keywords)
-    matched_count = len(matched_keywords)
-    score = round((matched_count / total_keywords) * 100) if total_keywords > 0 else 0
-    
-    # Generate detailed feedback
-    feedback = []
-    
-    # General score feedback
-    if score >= 80:
-        feedback.append("Excellent! Your resume has strong alignment with the job description.")
-    elif score >= 60:
-        feedback.append("Good match. Your resume aligns well but could be improved further.")
-    elif score >= 40:
-        feedback.append("Moderate match. Your resume needs more optimization for this role.")
-    else:
-        feedback.append("Low match. Significant improvements needed to better align with this role.")
-    
-    # Section-specific feedback
-    if not resume_data.get('summary'):
-        feedback.append("Consider adding a professional summary that highlights your most relevant qualifications.")
-    elif len(resume_data.get('summary', '').split()) < 20:
-        feedback.append("Your summary could be more detailed. Aim for 3-4 sentences highlighting key qualifications.")
-    
-    if not resume_data.get('skills'):
-        feedback.append("Add a skills section with relevant hard and soft skills from the job description.")
-    elif len(matched_keywords) < total_keywords * 0.5:
-        feedback.append("Your skills section could better match the job requirements. Add more relevant skills.")
-    
-    if not resume_data.get('experience'):
-        feedback.append("No work experience listed. Include relevant experience, even if from internships or projects.")
+
+BATCH_FORMATS = {'application/zip': 'zip', 'application/x-ndjson': 'ndjson'}
+
+
+@csrf_exempt
+def create_ats_friendly_resumes_batch(request):
+    """Renders many resumes in one request across the render process pool.
+
+    Expects {"items": [{"resume_data": ..., "job_description": ...}, ...]}.
+    Streams back a ZIP archive (the default) or NDJSON, one entry per item as
+    it finishes; the "format" field or the Accept header picks between them.
+    A failed item gets an error entry and does not stop the batch.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    try:
+        data = json.loads(request.body.decode('utf-8'))
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON data'}, status=400)
+
+    items = data.get('items') if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return JsonResponse({'error': "'items' must be a non-empty list"}, status=400)
+    max_items = getattr(settings, 'RESUME_BATCH_MAX_ITEMS', 1000)
+    if len(items) > max_items:
+        return JsonResponse({'error': f'At most {max_items} items per batch'}, status=400)
+
+    batch_format = data.get('format')
+    if batch_format is None:
+        accept = request.headers.get('Accept', '')
+        batch_format = next((fmt for media_type, fmt in BATCH_FORMATS.items() if media_type in accept), 'zip')
+    if batch_format == 'ndjson':
+        response = StreamingHttpResponse(stream_ndjson(items), content_type='application/x-ndjson')
+    elif batch_format == 'zip':
+        response = StreamingHttpResponse(stream_zip(items), content_type='application/zip')
+        response['Content-Disposition'] = 'attachment; filename="resumes.zip"'
     else:
-        # Check for action verbs in experience descriptions
-        action_verbs = {'managed', 'led', 'developed', 'created', 'implemented', 
-                       'improved', 'increased', 'reduced', 'optimized', 'designed'}
-        has_action_verbs = any(verb in resume_text for verb in action_verbs)
-        if not has_action_verbs:
-            feedback.append("Use more action verbs in your experience descriptions (e.g., 'managed', 'developed', 'implemented').")
-    
-    # Missing keywords feedback
-    if missing_keywords:
-        feedback.append(f"Consider adding these missing keywords: {', '.join(missing_keywords[:10])}" + 
-                       ("..." if len(missing_keywords) > 10 else ""))
-    
-    # Formatting feedback
-    feedback.append("Keep your resume format simple and clean for best ATS compatibility.")
-    feedback.append("Use standard section headings like 'Professional Experience' and 'Education'.")
-    
-    return {
-        'score': score,
-        'feedback': feedback,
-        'missing_keywords': missing_keywords,
-        'matched_keywords': matched_keywords
-    }
\ No newline at end of file
+        return JsonResponse({'error': "'format' must be 'zip' or 'ndjson'"}, status=400)
+    response['Vary'] = 'Accept'
+    return response
+
+
+def job_status(job):
+    if job.status == 'done':
+        return {'job_id': job.id, **ats_summary(job.ats_results), 'status': 'done',
+                'pdf_url': f'/api/resume-jobs/{job.id}/pdf/'}
+    if job.status == 'failed':
+        return {'job_id': job.id, 'status': 'failed', 'error': job.error}
+    return {'job_id': job.id, 'status': job.status}
+
+
+@csrf_exempt
+def submit_resume_job(request):
+    """Queues a resume render and returns its job ID without waiting for it.
+
+    Takes the same body as create-resume. Poll the status URL (optionally
+    with ?wait=SECONDS to long-poll), then fetch the PDF once it is done.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    try:
+        data = json.loads(request.body.decode('utf-8'))
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON data'}, status=400)
+    try:
+        job = get_job_queue().submit(data)
+    except QueueFull as e:
+        response = JsonResponse({'error': str(e)}, status=503)
+        response['Retry-After'] = '5'
+        return response
+
+    status_url = f'/api/resume-jobs/{job.id}/'
+    response = JsonResponse({'job_id': job.id, 'status': job.status, 'status_url': status_url}, status=202)
+    response['Location'] = status_url
+    return response
+
+
+async def resume_job_status(request, job_id):
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    queue = get_job_queue()
+    job = queue.get(job_id)
+    if job is None:
+        return JsonResponse({'error': 'Unknown job'}, status=404)
+    try:
+        wait = float(request.GET.get('wait', 0))
+    except ValueError:
+        return JsonResponse({'error': "'wait' must be a number of seconds"}, status=400)
+    job = await queue.wait(job, min(max(wait, 0), getattr(settings, 'RESUME_JOB_MAX_WAIT', 30)))
+    return JsonResponse(job_status(job))
+
+
+def resume_job_pdf(request, job_id):
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return JsonResponse({'error': 'Unknown job'}, status=404)
+    if job.status != 'done':
+        return JsonResponse(job_status(job), status=409)
+
+    pdf_bytes, ats_results = job.result()
+    if pdf_bytes is None:
+        # The job record outlived its PDF in the shared cache.
+        return JsonResponse({'job_id': job.id, 'status': 'expired', 'error': 'The PDF of this job has expired'},
+                            status=410)
+    response = HttpResponse(pdf_bytes, content_type='application/pdf')
+    response['Content-Disposition'] = 'attachment; filename="resume.pdf"'
+    add_ats_headers(response, ats_results)
+    return response
+
+
+def ats_profile_cache_stats(request):
+    """Reports hit/miss counts of this process's job description profile cache."""
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    return JsonResponse(get_profile_cache().stats())
+
+
+@csrf_exempt
+def score_ats_batch(request):
+    """Scores without rendering, for one resume against many job descriptions or many resumes against one.
+
+    Expects {"resume_data": ..., "job_descriptions": [...]} or
+    {"resumes": [...], "job_description": ...}, plus an optional "top_missing"
+    (default 10). Results are ranked by score; "index" points into the input list.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    try:
+        data = json.loads(request.body.decode('utf-8'))
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON data'}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({'error': 'Expected a JSON object'}, status=400)
+
+    top_missing = data.get('top_missing', 10)
+    if not isinstance(top_missing, int) or isinstance(top_missing, bool) or top_missing < 0:
+        return JsonResponse({'error': "'top_missing' must be a non-negative integer"}, status=400)
+    one_resume = isinstance(data.get('job_descriptions'), list)
+    items = data['job_descriptions'] if one_resume else data.get('resumes')
+    if not isinstance(items, list):
+        return JsonResponse({'error': "Provide 'job_descriptions' or 'resumes' as a list"}, status=400)
+    max_items = getattr(settings, 'ATS_BATCH_MAX_ITEMS', 5000)
+    if len(items) > max_items:
+        return JsonResponse({'error': f'At most {max_items} items per batch'}, status=400)
+
+    legacy = getattr(settings, 'ATS_LEGACY_MATCHING', False)
+    try:
+        if one_resume:
+            results = score_resume_against_jobs(data.get('resume_data', {}), items, top_missing, legacy)
+        else:
+            results = score_resumes_against_job(items, data.get('job_description', ""), top_missing, legacy)
+    except (AttributeError, TypeError) as e:
+        return JsonResponse({'error': f'Invalid batch item: {e}'}, status=400)
+    results = [{'index': index, **result} for index, result in enumerate(results)]
+    results.sort(key=lambda result: -result['score'])
+    return JsonResponse({'results': results, 'status': 'success'})
+
+
+def positive_int_param(request, name, default):
+    """Returns a positive integer query parameter, or None if it is not one."""
+    try:
+        value = int(request.GET.get(name, default))
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
+def job_market_data():
+    """Returns the loaded job market data, or a 503 response if it is not available yet."""
+    service = get_job_market_service()
+    data = service.data
+    if data is None:
+        return None, JsonResponse({'error': service.last_error or 'Job data is still loading'}, status=503)
+    return data, None
+
+
+def search_jobs_by_skill(request):
+    """Job titles mentioning the given skills, like skills.py's find_jobs_by_skill.
+
+    Query parameters: skills (comma-separated), mode ('substring' or 'exact'),
+    match ('any' or 'all') and limit (default 100). Titles are ranked by how
+    many of the skills they mention.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    skills = [skill for skill in request.GET.get('skills', '').split(',') if skill.strip()]
+    if not skills:
+        return JsonResponse({'error': "'skills' must list at least one skill"}, status=400)
+    limit = positive_int_param(request, 'limit', 100)
+    if limit is None:
+        return JsonResponse({'error': "'limit' must be a positive integer"}, status=400)
+    data, error_response = job_market_data()
+    if error_response is not None:
+        return error_response
+
+    with timed('search'):
+        try:
+            jobs = data.find_jobs(skills, mode=request.GET.get('mode', 'substring'),
+                                  match=request.GET.get('match', 'any'))
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse({
+        'count': len(jobs),
+        'jobs': [{'title': title, 'matched_skills': matched} for title, matched in jobs[:limit]],
+    })
+
+
+def list_sectors(request):
+    """Sectors in the job data with their number of postings."""
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    data, error_response = job_market_data()
+    if error_response is not None:
+        return error_response
+    return JsonResponse({'sectors': [{'name': name, 'jobs': jobs} for name, jobs in data.sectors()]})
+
+
+def sector_demand(request, sector):
+    """Most demanded job titles and skills in a sector, like get_demanding_data_by_sector."""
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    top_n = positive_int_param(request, 'top_n', 10)
+    if top_n is None:
+        return JsonResponse({'error': "'top_n' must be a positive integer"}, status=400)
+    data, error_response = job_market_data()
+    if error_response is not None:
+        return error_response
+
+    demand = data.sector_demand(sector, top_n)
+    if demand is None:
+        return JsonResponse({'error': f'No job postings found for the sector: {sector}'}, status=404)
+    top_jobs, top_skills = demand
+    return JsonResponse({'sector': data.rollups[sector.lower()]['name'], 'top_jobs': top_jobs, 'top_skills': top_skills})
+
+
+def related_skills(request):
+    """Skills most often listed together with ?skill=, overall or within ?sector=.
+
+    Optional parameters: top_k (default 10), by ('lift', 'pmi' or 'count')
+    and min_count, the fewest jobs a pair must share.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    skill = request.GET.get('skill', '').strip().lower()
+    if not skill:
+        return JsonResponse({'error': "'skill' is required"}, status=400)
+    top_k = positive_int_param(request, 'top_k', 10)
+    if top_k is None:
+        return JsonResponse({'error': "'top_k' must be a positive integer"}, status=400)
+    min_count = None
+    if 'min_count' in request.GET:
+        min_count = positive_int_param(request, 'min_count', 1)
+        if min_count is None:
+            return JsonResponse({'error': "'min_count' must be a positive integer"}, status=400)
+    data, error_response = job_market_data()
+    if error_response is not None:
+        return error_response
+
+    sector = request.GET.get('sector')
+    cooccurrence = data.cooccurrence
+    if skill not in cooccurrence.skill_ids:
+        return JsonResponse({'error': f'Unknown skill: {skill}'}, status=404)
+    if sector is not None and sector.lower() not in cooccurrence.scopes:
+        return JsonResponse({'error': f'No job postings found for the sector: {sector}'}, status=404)
+    try:
+        related = cooccurrence.related(skill, sector=sector, top_k=top_k, by=request.GET.get('by', 'lift'),
+                                       min_count=min_count)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse({'skill': skill, 'sector': sector, 'related': related})
+
+
+def job_market_status(request):
+    """Reports which version of the job data this process is serving."""
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    return JsonResponse(get_job_market_service().status())
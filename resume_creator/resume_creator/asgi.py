@@ -10,7 +10,9 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 import os
 
 from django.core.asgi import get_asgi_application
+from resume_builder.market import preload_job_market
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'resume_creator.settings')
 
 application = get_asgi_application()
+preload_job_market()
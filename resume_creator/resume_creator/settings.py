@@ -43,6 +43,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'resume_builder.metrics.RequestMetricsMiddleware',  # First, so it times the whole stack
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -83,6 +84,16 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -123,3 +134,66 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Batch resume rendering (/api/create-resumes/batch/)
+# Worker processes shared by batch requests; None uses one per CPU.
+RESUME_RENDER_WORKERS = None
+RESUME_BATCH_MAX_ITEMS = 1000
+
+# Asynchronous resume jobs (/api/resume-jobs/), rendered on the same pool.
+# Jobs are kept in the accepting process's memory for RESUME_JOB_TTL seconds,
+# dropping the oldest finished ones once their PDFs exceed RESUME_JOB_MAX_BYTES.
+# Status and PDF requests must then reach the process that accepted the job,
+# so run a single worker process, or set RESUME_JOB_CACHE to a CACHES alias
+# backed by a shared store (Redis, Memcached, database) that every worker
+# reads jobs from.
+RESUME_JOB_MAX_PENDING = 100
+RESUME_JOB_TTL = 600
+RESUME_JOB_MAX_BYTES = 50 * 1024 * 1024
+RESUME_JOB_CACHE = None
+# Longest long-poll a status request may ask for with ?wait=SECONDS.
+RESUME_JOB_MAX_WAIT = 30
+
+# ATS scoring matches keywords as whole tokens. True restores the original
+# substring matching and reproduces its scores exactly, including in
+# /api/ats/score-batch/, which then scores each pair on its own.
+ATS_LEGACY_MATCHING = False
+
+# Job description profiles used for ATS scoring are cached per process in an
+# LRU of ATS_PROFILE_CACHE_SIZE entries. Set ATS_PROFILE_CACHE to a CACHES
+# alias backed by a shared store (Redis, Memcached, file-based) to share them
+# across worker processes as well.
+ATS_PROFILE_CACHE_SIZE = 256
+ATS_PROFILE_CACHE = None
+ATS_PROFILE_CACHE_TIMEOUT = 3600
+
+# Rendered PDFs and their ATS results are cached by a hash of the submitted
+# resume_data and job_description. They are kept on disk in
+# RESUME_RENDER_CACHE_DIR (e.g. BASE_DIR / 'render_cache') under a
+# RESUME_RENDER_CACHE_MAX_BYTES budget, or in the CACHES alias named by
+# RESUME_RENDER_CACHE_ALIAS if that is set. Both are None by default, which
+# disables the cache.
+RESUME_RENDER_CACHE_DIR = None
+RESUME_RENDER_CACHE_MAX_BYTES = 100 * 1024 * 1024
+RESUME_RENDER_CACHE_ALIAS = None
+
+# Most job descriptions or resumes accepted by /api/ats/score-batch/.
+ATS_BATCH_MAX_ITEMS = 5000
+
+# Request metrics (Server-Timing headers and /metrics). A share
+# METRICS_PROFILE_SAMPLE_RATE of requests (0 disables it) runs under cProfile,
+# and profiles of those slower than METRICS_PROFILE_SLOW_MS are saved to
+# METRICS_PROFILE_DIR.
+METRICS_PROFILE_SAMPLE_RATE = 0.0
+METRICS_PROFILE_SLOW_MS = 1000
+METRICS_PROFILE_DIR = BASE_DIR / 'profiles'
+
+# Job market API (/api/jobs/search/, /api/sectors/, /api/skills/related/).
+# The merged job data is loaded in the background when wsgi.py or asgi.py
+# starts a server process (not by other manage.py commands), and reloaded
+# when the file changes, checked every JOB_MARKET_POLL_INTERVAL seconds (0
+# disables it). With JOB_MARKET_PRELOAD = False the first request starts
+# the load instead. The endpoints answer 503 until the data is loaded.
+JOB_MARKET_DATA_PATH = BASE_DIR.parent / 'merged_data.csv'
+JOB_MARKET_POLL_INTERVAL = 30
+JOB_MARKET_PRELOAD = True
@@ -16,8 +16,10 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
+from resume_builder.metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('resume_builder.urls')),  # Correct
+    path('metrics', metrics_view, name='metrics'),
 ]
\ No newline at end of file
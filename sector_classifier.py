@@ -0,0 +1,175 @@
+import argparse
+import random
+import re
+import time
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+# (sector, pattern, exclusion pattern) in priority order: the first rule whose
+# pattern matches and whose exclusion does not wins, as in the original cascade.
+SECTOR_RULES = [
+    ('Technology', r'software|engineer|developer|programmer|tech|it|cloud|data science|ai|machine learning|cybersecurity|\.net',
+     r'(?<!medical\s)nurse|(?<!home\s)health|rn|lpn|cna|medical assistant|therapist|psychologist'),
+    ('Healthcare', r'nurse|doctor|health|medical|pharma|biotech|therapist|assistant|rn|lpn|cna|medical assistant|physician|surgeon|psychiatrist|mammography|care manager|hospice|patient|clinician|caregiver', None),
+    ('Healthcare', r'clinical psychologist|psychologist', None),  # Or consider 'Social Services' based on context
+    ('Finance', r'finance|bank|investment|analyst|trading|financial|accountant|accounting|tax|teller', None),
+    ('Marketing & Sales', r'market|sales|business development|advertising|pr|marketing|sales|events', None),
+    ('Manufacturing & Engineering', r'manufactur|engineer|production|quality|supply chain|mechanical|electrical|civil|welder|fabricator|machinist|qa', None),
+    ('Education', r'educat|teacher|professor|training|instruction|lecturer|faculty|instructor|coach|tutor', None),
+    ('Retail & Customer Service', r'retail|customer service|sales associate|merchandis|store|cashier|clerk|grocery', None),
+    ('Human Resources', r'human resources|hr|talent|recruitment|people', None),
+    ('Legal', r'legal|law|compliance|attorney|paralegal|counsel', None),
+    ('Construction & Architecture', r'construct|architect|civil|structural|builder', None),
+    ('Research & Development', r'research|scientist|laboratory|investigator', None),
+    ('Design', r'design|designer|ux|ui|graphic|creative', None),
+    ('Project Management', r'project manager|program manager|agile|scrum', None),
+    ('IT Support & Operations', r'support|help desk|technician|administrator|operations|office assistant|administrative assistant|secretary|clerical', None),  # Including admin roles here for now
+    ('Management', r'operations manager|branch manager|superintendent|director', None),
+    ('Food & Beverage', r'restaurant|chef|cook|food|beverage|hospitality|waiter|waitress', None),
+    ('Animal Care', r'veterinarian|dentist|animal care', None),
+    ('Logistics & Transportation', r'warehouse|driver|logistics|transportation|supply chain|inventory', None),
+    ('Social Services', r'social worker|social services|case manager', None),
+    ('Non-profit/Volunteer', r'volunteer|non-profit|charity|ngo', None),
+]
+DEFAULT_SECTOR = 'Other'
+
+_COMPILED_RULES = [(sector, re.compile(pattern), re.compile(exclusion) if exclusion else None)
+                   for sector, pattern, exclusion in SECTOR_RULES]
+
+
+@lru_cache(maxsize=100_000)
+def _classify_normalized(title):
+    for sector, pattern, exclusion in _COMPILED_RULES:
+        if pattern.search(title) and not (exclusion and exclusion.search(title)):
+            return sector
+    return DEFAULT_SECTOR
+
+
+def infer_sector_from_title(title):
+    return _classify_normalized(str(title).lower())
+
+
+def _factorize(values):
+    """Returns (codes, unique values).
+
+    pandas.factorize hashes all-string arrays only up to the first NUL, so
+    'data' and 'data\x00nurse' would share a code.
+    """
+    positions = {}
+    codes = np.fromiter((positions.setdefault(value, len(positions)) for value in values), dtype=np.int64,
+                        count=len(values))
+    return codes, list(positions)
+
+
+def classify_titles(titles):
+    """Classifies a whole column of job titles into sectors.
+
+    Each distinct normalized title is classified once. Rules run over the
+    column of distinct titles in priority order, and each rule only sees the
+    titles that no earlier rule claimed.
+    """
+    titles = pd.Series(titles)
+    codes, uniques = _factorize(titles.to_numpy(dtype=object))
+    normalized_codes, normalized = _factorize([str(title).lower() for title in uniques])
+    normalized = pd.Series(normalized, dtype=object)
+
+    labels = np.full(len(normalized), DEFAULT_SECTOR, dtype=object)
+    remaining = np.arange(len(normalized))
+    for sector, pattern, exclusion in _COMPILED_RULES:
+        if not len(remaining):
+            break
+        candidates = normalized.iloc[remaining]
+        matched = candidates.str.contains(pattern).to_numpy(dtype=bool)
+        if exclusion is not None:
+            matched = matched & ~candidates.str.contains(exclusion).to_numpy(dtype=bool)
+        labels[remaining[matched]] = sector
+        remaining = remaining[~matched]
+
+    return pd.Series(labels.take(normalized_codes).take(codes), index=titles.index)
+
+
+def _legacy_infer_sector_from_title(title):
+    """The original cascade from load.py, copied verbatim as the reference for the benchmark and tests."""
+    title = str(title).lower()
+    if re.search(r'software|engineer|developer|programmer|tech|it|cloud|data science|ai|machine learning|cybersecurity|\.net', title) and not re.search(r'(?<!medical\s)nurse|(?<!home\s)health|rn|lpn|cna|medical assistant|therapist|psychologist', title):
+        return 'Technology'
+    elif re.search(r'nurse|doctor|health|medical|pharma|biotech|therapist|assistant|rn|lpn|cna|medical assistant|physician|surgeon|psychiatrist|mammography|care manager|hospice|patient|clinician|caregiver', title):
+        return 'Healthcare'
+    elif re.search(r'clinical psychologist|psychologist', title):
+        return 'Healthcare' # Or consider 'Social Services' based on context
+    elif re.search(r'finance|bank|investment|analyst|trading|financial|accountant|accounting|tax|teller', title):
+        return 'Finance'
+    elif re.search(r'market|sales|business development|advertising|pr|marketing|sales|events', title):
+        return 'Marketing & Sales'
+    elif re.search(r'manufactur|engineer|production|quality|supply chain|mechanical|electrical|civil|welder|fabricator|machinist|qa', title):
+        return 'Manufacturing & Engineering'
+    elif re.search(r'educat|teacher|professor|training|instruction|lecturer|faculty|instructor|coach|tutor', title):
+        return 'Education'
+    elif re.search(r'retail|customer service|sales associate|merchandis|store|cashier|clerk|grocery', title):
+        return 'Retail & Customer Service'
+    elif re.search(r'human resources|hr|talent|recruitment|people', title):
+        return 'Human Resources'
+    elif re.search(r'legal|law|compliance|attorney|paralegal|counsel', title):
+        return 'Legal'
+    elif re.search(r'construct|architect|civil|structural|builder', title):
+        return 'Construction & Architecture'
+    elif re.search(r'research|scientist|laboratory|investigator', title):
+        return 'Research & Development'
+    elif re.search(r'design|designer|ux|ui|graphic|creative', title):
+        return 'Design'
+    elif re.search(r'project manager|program manager|agile|scrum', title):
+        return 'Project Management'
+    elif re.search(r'support|help desk|technician|administrator|operations|office assistant|administrative assistant|secretary|clerical', title):
+        return 'IT Support & Operations' # Including admin roles here for now
+    elif re.search(r'operations manager|branch manager|superintendent|director', title):
+        return 'Management'
+    elif re.search(r'restaurant|chef|cook|food|beverage|hospitality|waiter|waitress', title):
+        return 'Food & Beverage'
+    elif re.search(r'veterinarian|dentist|animal care', title):
+        return 'Animal Care'
+    elif re.search(r'warehouse|driver|logistics|transportation|supply chain|inventory', title):
+        return 'Logistics & Transportation'
+    elif re.search(r'social worker|social services|case manager', title):
+        return 'Social Services'
+    elif re.search(r'volunteer|non-profit|charity|ngo', title):
+        return 'Non-profit/Volunteer'
+    return 'Other'
+
+
+def _synthetic_titles(rows, distinct, seed):
+    rng = random.Random(seed)
+    words = ['senior', 'junior', 'lead', 'software', 'engineer', 'registered', 'nurse', 'sales', 'associate',
+             'data', 'analyst', 'project', 'manager', 'warehouse', 'driver', 'teacher', 'chef', 'legal',
+             'counsel', 'graphic', 'designer', 'social', 'worker', 'help', 'desk', 'volunteer', 'clerk']
+    vocabulary = [' '.join(rng.choice(words) for _ in range(rng.randint(1, 4))) for _ in range(distinct)]
+    return pd.Series([rng.choice(vocabulary) for _ in range(rows)])
+
+
+def benchmark(rows=2_000_000, distinct=50_000, seed=42):
+    titles = _synthetic_titles(rows, distinct, seed)
+
+    start = time.perf_counter()
+    legacy = titles.apply(_legacy_infer_sector_from_title)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = classify_titles(titles)
+    compiled_seconds = time.perf_counter() - start
+
+    if not legacy.equals(compiled):
+        raise AssertionError("classify_titles disagrees with the original cascade")
+
+    print(f"Rows: {rows}, distinct titles: {distinct}")
+    print(f"Row-by-row apply: {legacy_seconds:.2f}s")
+    print(f"classify_titles:  {compiled_seconds:.2f}s")
+    print(f"Speedup: {legacy_seconds / compiled_seconds:.1f}x")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the compiled sector classifier against the original cascade.")
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--distinct', type=int, default=50_000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    benchmark(args.rows, args.distinct, args.seed)
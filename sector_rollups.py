@@ -0,0 +1,183 @@
+import json
+import os
+import pandas as pd
+from snapshot import artifact_path, data_fingerprint, load_columns
+
+ROLLUPS_VERSION = 2
+# Title and skill counts per sector that lookups can ask for. Twice as many
+# are kept, so new rows can reorder the top ones without a rebuild.
+ROLLUP_TOP_K = 100
+
+_rollup_cache = {}
+
+
+def _skill_rows(merged_data):
+    """Returns one row per (sector key, skill) occurrence, split like get_demanding_data_by_sector."""
+    skills = merged_data['skills'].dropna()
+    skills = skills[skills.map(lambda value: isinstance(value, str))]
+    exploded = skills.str.split(',').explode().str.strip().str.lower()
+    return pd.DataFrame({'sector': merged_data['Sector'].str.lower().loc[exploded.index],
+                         'value': exploded.to_numpy()})
+
+
+def _count_by_sector(pairs, top_k):
+    """Counts values per sector, sorted by count with ties in first-seen order.
+
+    Keeps the top_k counts of each sector (all of them if top_k is None)
+    with the highest count left out, 0 when nothing was.
+    """
+    counts = pairs.groupby(['sector', 'value'], sort=False, observed=True).size()
+    result = {}
+    for sector, sector_counts in counts.groupby(level='sector', sort=False, observed=True):
+        sector_counts = sector_counts.droplevel('sector').sort_values(ascending=False, kind='stable')
+        floor = int(sector_counts.iloc[top_k]) if top_k is not None and len(sector_counts) > top_k else 0
+        result[sector] = ([[value, int(count)] for value, count in sector_counts.iloc[:top_k].items()], floor)
+    return result
+
+
+def build_rollups(merged_data, top_k=ROLLUP_TOP_K):
+    """Aggregates job counts and top job title and skill counts per sector.
+
+    Sectors are keyed by their lowercased name. Each sector stores its
+    number of jobs and its title and skill counts as lists of [value, count]
+    sorted by descending count, so a top-n lookup is a slice. The first
+    top_k entries are exact; 2 * top_k are kept, and titles_floor and
+    skills_floor bound the count of every value left out, which
+    update_rollups needs to merge new rows exactly. top_k=None keeps every
+    value.
+    """
+    merged_data = merged_data[merged_data['Sector'].notna()].reset_index(drop=True)
+    sector_keys = merged_data['Sector'].str.lower()
+    title_pairs = pd.DataFrame({'sector': sector_keys, 'value': merged_data['job_title']}).dropna()
+    kept = None if top_k is None else 2 * top_k
+    title_counts = _count_by_sector(title_pairs, kept)
+    skill_counts = _count_by_sector(_skill_rows(merged_data), kept)
+
+    groups = merged_data.groupby(sector_keys, sort=False)['Sector']
+    names = groups.first()
+    jobs = groups.size()
+    rollups = {}
+    for sector, name in names.items():
+        titles, titles_floor = title_counts.get(sector, ([], 0))
+        skills, skills_floor = skill_counts.get(sector, ([], 0))
+        rollups[sector] = {
+            'name': name,
+            'top_k': top_k,
+            'jobs': int(jobs[sector]),
+            'titles': titles,
+            'titles_floor': titles_floor,
+            'skills': skills,
+            'skills_floor': skills_floor,
+        }
+    return rollups
+
+
+def _merge_counts(sorted_counts, floor, new_counts, top_k):
+    """Adds new_counts to the 2 * top_k counts sorted_counts. Returns (counts, floor), or None.
+
+    A value left out of sorted_counts may have had any count up to floor,
+    so its merged count is unknown. The merge is exact only if no such
+    value could reach the new top_k; otherwise it returns None.
+    """
+    counts = dict((value, count) for value, count in sorted_counts)
+    unknown_bound = floor
+    for value, count in new_counts:
+        if value in counts:
+            counts[value] += count
+        elif floor:
+            unknown_bound = max(unknown_bound, floor + count)
+        else:
+            counts[value] = count
+    merged = sorted(([value, count] for value, count in counts.items()), key=lambda item: -item[1])
+    new_floor = unknown_bound
+    if len(merged) > 2 * top_k:
+        new_floor = max(new_floor, merged[2 * top_k][1])
+        merged = merged[:2 * top_k]
+    if floor and merged[top_k - 1][1] <= unknown_bound:
+        return None
+    return merged, new_floor
+
+
+def update_rollups(rollups, new_rows, top_k=ROLLUP_TOP_K):
+    """Folds newly appended postings into existing rollups without rebuilding them.
+
+    Only the sectors that appear in new_rows are touched. Returns None when
+    the truncated counts cannot tell which values are now in a sector's
+    top_k; the rollups must then be rebuilt from the data.
+    """
+    for sector, delta in build_rollups(new_rows, top_k=None).items():
+        current = rollups.get(sector)
+        if current is None:
+            current = rollups[sector] = {'name': delta['name'], 'top_k': top_k, 'jobs': 0,
+                                         'titles': [], 'titles_floor': 0, 'skills': [], 'skills_floor': 0}
+        current['jobs'] += delta['jobs']
+        for key in ('titles', 'skills'):
+            merged = _merge_counts(current[key], current[f'{key}_floor'], delta[key], top_k)
+            if merged is None:
+                return None
+            current[key], current[f'{key}_floor'] = merged
+    return rollups
+
+
+def save_rollups(rollups, data_path, top_k=ROLLUP_TOP_K):
+    rollups_path = artifact_path(data_path, 'rollups.json')
+    tmp_path = rollups_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'version': ROLLUPS_VERSION, 'source': data_fingerprint(data_path), 'top_k': top_k,
+                   'sectors': rollups}, f)
+    os.replace(tmp_path, rollups_path)
+    return rollups_path
+
+
+def write_rollups(data_path='merged_data.csv', top_k=ROLLUP_TOP_K):
+    """Builds the sector rollups for data_path and saves them next to it."""
+    merged_data = load_columns(data_path, ['job_title', 'skills', 'Sector'])
+    return save_rollups(build_rollups(merged_data, top_k), data_path, top_k)
+
+
+def append_to_rollups(new_rows, data_path='merged_data.csv'):
+    """Updates the saved rollups after new_rows have been appended to data_path.
+
+    Falls back to a full rebuild when there are no saved rollups to update
+    or the new rows change a sector's top counts in a way the saved counts
+    cannot settle.
+    """
+    rollups_path = artifact_path(data_path, 'rollups.json')
+    try:
+        with open(rollups_path) as f:
+            saved = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return write_rollups(data_path)
+    if saved.get('version') != ROLLUPS_VERSION:
+        return write_rollups(data_path)
+    rollups = update_rollups(saved['sectors'], new_rows, saved['top_k'])
+    if rollups is None:
+        return write_rollups(data_path, saved['top_k'])
+    return save_rollups(rollups, data_path, saved['top_k'])
+
+
+def load_rollups(data_path='merged_data.csv'):
+    """Returns the sector rollups for data_path.
+
+    Uses the saved rollups when they match the current data file, otherwise
+    builds them from the data. The result is cached until the file changes.
+    """
+    key = os.path.abspath(data_path)
+    fingerprint = data_fingerprint(data_path)
+    cached = _rollup_cache.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    rollups = None
+    try:
+        with open(artifact_path(data_path, 'rollups.json')) as f:
+            saved = json.load(f)
+        if saved.get('version') == ROLLUPS_VERSION and saved.get('source') == fingerprint:
+            rollups = saved['sectors']
+    except (FileNotFoundError, ValueError):
+        pass
+    if rollups is None:
+        rollups = build_rollups(load_columns(data_path, ['job_title', 'skills', 'Sector']))
+
+    _rollup_cache[key] = (fingerprint, rollups)
+    return rollups
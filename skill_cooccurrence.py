@@ -0,0 +1,183 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from skill_matrix import load_skill_matrix
+from snapshot import artifact_path, data_fingerprint, load_columns
+
+COOCCURRENCE_VERSION = 1
+RANKINGS = ('lift', 'pmi', 'count')
+# Pairs seen in fewer jobs than this are left out of lift and PMI rankings by
+# default, where a skill that appears once would otherwise rank first.
+DEFAULT_MIN_COUNT = 5
+
+_cooccurrence_cache = {}
+
+
+def _cooccurrence_counts(matrix):
+    """Returns (jobs having both skills, off the diagonal) and (jobs per skill) for a binary job x skill matrix."""
+    matrix = matrix.astype(np.int32)
+    counts = (matrix.T @ matrix).tocsr()
+    skill_counts = counts.diagonal()
+    counts.setdiag(0)
+    counts.eliminate_zeros()
+    return counts, skill_counts
+
+
+class SkillCooccurrence:
+    """How often each pair of skills appears in the same job, overall and within each sector.
+
+    Scope 0 covers all jobs and scope i + 1 the sector sectors[i], keyed by
+    its lowercased name as in the sector rollups. The skill x skill counts of
+    all scopes are stacked into one CSR matrix, scope s holding rows
+    s * V to (s + 1) * V for a vocabulary of V skills, so a query reads one
+    row's slice of the CSR arrays.
+    """
+
+    def __init__(self, vocabulary, sectors, jobs, skill_counts, matrix):
+        self.vocabulary = list(vocabulary)
+        self.skill_ids = {skill: skill_id for skill_id, skill in enumerate(self.vocabulary)}
+        self.sectors = list(sectors)
+        self.scopes = {sector.lower(): scope for scope, sector in enumerate(self.sectors, 1)}
+        self.jobs = np.asarray(jobs, dtype=np.int64)
+        self.skill_counts = np.asarray(skill_counts, dtype=np.int64)
+        self.matrix = matrix.tocsr()
+
+    @classmethod
+    def from_skill_matrix(cls, skill_matrix, sectors):
+        """Counts pairs with one sparse X.T @ X per scope, X being the job x skill matrix of its jobs."""
+        codes, names = pd.factorize(pd.Series(sectors, dtype=object).str.lower())
+        first_names = pd.Series(sectors, dtype=object).groupby(codes).first()
+        matrix = skill_matrix.matrix
+
+        blocks = []
+        skill_counts = []
+        jobs = [matrix.shape[0]]
+        counts, scope_skill_counts = _cooccurrence_counts(matrix)
+        blocks.append(counts)
+        skill_counts.append(scope_skill_counts)
+        # Sorting rows by sector once lets each sector take a contiguous slice.
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+        for code in range(len(names)):
+            rows = order[bounds[code]:bounds[code + 1]]
+            counts, scope_skill_counts = _cooccurrence_counts(matrix[rows])
+            blocks.append(counts)
+            skill_counts.append(scope_skill_counts)
+            jobs.append(len(rows))
+
+        sector_names = [first_names[code] for code in range(len(names))]
+        return cls(skill_matrix.vocabulary, sector_names, jobs, np.vstack(skill_counts),
+                   sparse.vstack(blocks, format='csr'))
+
+    def related(self, skill, sector=None, top_k=10, by='lift', min_count=None):
+        """Returns up to top_k skills most associated with skill, optionally within one sector.
+
+        by='count' ranks by the number of jobs listing both skills; 'lift'
+        (jobs with both relative to what independent skills would give)
+        and 'pmi' (log2 of lift) favour specific over merely common
+        companions, and by default ignore pairs in fewer than
+        DEFAULT_MIN_COUNT jobs. Returns [] for an unknown skill or sector.
+        """
+        if by not in RANKINGS:
+            raise ValueError(f"Unknown ranking: {by}")
+        if min_count is None:
+            min_count = 1 if by == 'count' else DEFAULT_MIN_COUNT
+        skill_id = self.skill_ids.get(skill.strip().lower())
+        scope = 0 if sector is None else self.scopes.get(sector.lower())
+        if skill_id is None or scope is None or top_k <= 0:
+            return []
+
+        row = scope * len(self.vocabulary) + skill_id
+        start, end = self.matrix.indptr[row], self.matrix.indptr[row + 1]
+        neighbours = self.matrix.indices[start:end]
+        counts = self.matrix.data[start:end]
+        keep = counts >= min_count
+        neighbours, counts = neighbours[keep], counts[keep]
+        if not len(neighbours):
+            return []
+
+        skill_counts = self.skill_counts[scope]
+        lift = counts * self.jobs[scope] / (skill_counts[skill_id] * skill_counts[neighbours].astype(np.float64))
+        weights = counts if by == 'count' else lift
+        if len(neighbours) > top_k:
+            # Keep everything tied with the k-th weight so the tie-break below decides.
+            kth = np.partition(-weights, top_k - 1)[top_k - 1]
+            top = -weights <= kth
+            neighbours, counts, lift, weights = neighbours[top], counts[top], lift[top], weights[top]
+        # Ties go to the more common pair, then to the skill seen first in the data.
+        order = np.lexsort((neighbours, -counts, -weights))[:top_k]
+        return [{'skill': self.vocabulary[neighbour], 'jobs': int(count), 'lift': float(pair_lift),
+                 'pmi': float(np.log2(pair_lift))}
+                for neighbour, count, pair_lift in zip(neighbours[order], counts[order], lift[order])]
+
+
+def save_skill_cooccurrence(cooccurrence, data_path):
+    counts_path = artifact_path(data_path, 'skill_cooccurrence.npz')
+    meta_path = artifact_path(data_path, 'skill_cooccurrence.json')
+    with open(counts_path + '.tmp', 'wb') as f:
+        np.savez(f, data=cooccurrence.matrix.data, indices=cooccurrence.matrix.indices,
+                 indptr=cooccurrence.matrix.indptr, shape=np.array(cooccurrence.matrix.shape),
+                 jobs=cooccurrence.jobs, skill_counts=cooccurrence.skill_counts)
+    os.replace(counts_path + '.tmp', counts_path)
+    with open(meta_path + '.tmp', 'w') as f:
+        json.dump({'version': COOCCURRENCE_VERSION, 'source': data_fingerprint(data_path),
+                   'vocabulary': cooccurrence.vocabulary, 'sectors': cooccurrence.sectors}, f)
+    os.replace(meta_path + '.tmp', meta_path)
+    return counts_path
+
+
+def build_skill_cooccurrence(data_path='merged_data.csv'):
+    """Builds the co-occurrence counts from the skill matrix and Sector column of data_path."""
+    sectors = load_columns(data_path, ['Sector'])['Sector']
+    return SkillCooccurrence.from_skill_matrix(load_skill_matrix(data_path), sectors)
+
+
+def write_skill_cooccurrence(data_path='merged_data.csv'):
+    """Builds the skill co-occurrence counts for data_path and saves them next to it."""
+    return save_skill_cooccurrence(build_skill_cooccurrence(data_path), data_path)
+
+
+def load_skill_cooccurrence(data_path='merged_data.csv'):
+    """Returns the SkillCooccurrence for data_path.
+
+    Uses the saved counts when they match the current data file, otherwise
+    builds them from the data. The result is cached until the file changes.
+    """
+    key = os.path.abspath(data_path)
+    fingerprint = data_fingerprint(data_path)
+    cached = _cooccurrence_cache.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    cooccurrence = None
+    try:
+        with open(artifact_path(data_path, 'skill_cooccurrence.json')) as f:
+            saved = json.load(f)
+        if saved.get('version') == COOCCURRENCE_VERSION and saved.get('source') == fingerprint:
+            with np.load(artifact_path(data_path, 'skill_cooccurrence.npz')) as arrays:
+                matrix = sparse.csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']),
+                                           shape=tuple(arrays['shape']))
+                cooccurrence = SkillCooccurrence(saved['vocabulary'], saved['sectors'], arrays['jobs'],
+                                                 arrays['skill_counts'], matrix)
+    except (FileNotFoundError, ValueError):
+        pass
+    if cooccurrence is None:
+        cooccurrence = build_skill_cooccurrence(data_path)
+
+    _cooccurrence_cache[key] = (fingerprint, cooccurrence)
+    return cooccurrence
+
+
+def related_skills(skill, data_path='merged_data.csv', sector=None, top_k=10, by='lift', min_count=None):
+    try:
+        cooccurrence = load_skill_cooccurrence(data_path)
+    except FileNotFoundError:
+        print(f"Error: Could not find data file at: {data_path}")
+        return []
+    except KeyError:
+        print("Error: 'skills' or 'Sector' column not found in the data.")
+        return []
+
+    return cooccurrence.related(skill, sector=sector, top_k=top_k, by=by, min_count=min_count)
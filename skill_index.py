@@ -0,0 +1,138 @@
+import os
+import numpy as np
+import pandas as pd
+from snapshot import data_fingerprint, load_columns
+
+_index_cache = {}
+
+
+def split_skills(skills_text):
+    """Splits a comma-separated skills string into stripped, lowercased tokens."""
+    return [skill.strip().lower() for skill in skills_text.split(',')]
+
+
+class SkillIndex:
+    """In-memory inverted index over the 'skills' column of the merged job data.
+
+    Exact skill tokens map to posting lists of row IDs. A substring query (the
+    behaviour of the original find_jobs_by_skill) is answered from the
+    distinct tokens: a skill without commas or surrounding whitespace occurs
+    in a row's skills text exactly when it occurs in one of the row's tokens,
+    so the skill is looked for in the token vocabulary with a vectorized
+    str.contains and the rows of the matching tokens are gathered with numpy.
+    """
+
+    def __init__(self, job_titles, skills):
+        self.job_titles = list(job_titles)
+        self.skills_text = [text.lower() if isinstance(text, str) else None for text in skills]
+
+        tokens = pd.Series(self.skills_text, dtype=object).dropna().map(split_skills).explode()
+        token_ids, vocabulary = pd.factorize(tokens)
+        self.token_postings = {token: tuple(sorted(set(tokens.index[positions])))
+                               for token, positions in tokens.groupby(tokens, sort=False).indices.items()}
+        # One entry per (row, token) occurrence, for gathering the rows of many tokens at once.
+        self._vocabulary = pd.Series(vocabulary, dtype=object)
+        self._entry_rows = tokens.index.to_numpy(dtype=np.int64)
+        self._entry_tokens = token_ids
+        self._texts = None
+
+    @classmethod
+    def from_dataframe(cls, merged_data):
+        return cls(merged_data['job_title'], merged_data['skills'])
+
+    def __len__(self):
+        return len(self.job_titles)
+
+    def _substring_mask(self, skill):
+        """Returns a boolean mask of the rows whose lowercased skills text contains skill."""
+        if ',' in skill or skill != skill.strip():
+            # Such a skill can span tokens, so the texts themselves are searched.
+            if self._texts is None:
+                self._texts = pd.Series(self.skills_text, dtype=object)
+            return self._texts.str.contains(skill, regex=False, na=False).to_numpy(dtype=bool)
+        matching_tokens = self._vocabulary.str.contains(skill, regex=False).to_numpy(dtype=bool)
+        mask = np.zeros(len(self.skills_text), dtype=bool)
+        mask[self._entry_rows[matching_tokens[self._entry_tokens]]] = True
+        return mask
+
+    def _substring_matches(self, skills, match='any'):
+        """Finds each skill's rows as a mask, then combines the masks with numpy."""
+        masks = [self._substring_mask(skill) for skill in skills]
+        if match == 'all' or len(skills) == 1:
+            return {row_id: list(skills) for row_id in np.flatnonzero(np.logical_and.reduce(masks)).tolist()}
+
+        if len(skills) > 62:
+            matches = {}
+            for skill, mask in zip(skills, masks):
+                for row_id in np.flatnonzero(mask).tolist():
+                    matches.setdefault(row_id, []).append(skill)
+            return matches
+        # Rows matching the same combination of skills are labelled once, then each row gets its own copy.
+        patterns = np.zeros(len(self.skills_text), dtype=np.int64)
+        for bit, mask in enumerate(masks):
+            patterns[mask] |= 1 << bit
+        rows = np.flatnonzero(patterns)
+        patterns = patterns[rows]
+        found_by_pattern = {pattern: [skill for bit, skill in enumerate(skills) if pattern >> bit & 1]
+                            for pattern in np.unique(patterns).tolist()}
+        return {row_id: found_by_pattern[pattern].copy() for row_id, pattern in zip(rows.tolist(), patterns.tolist())}
+
+    def _exact_matches(self, skills):
+        matches = {}
+        for skill in skills:
+            for row_id in self.token_postings.get(skill, ()):
+                matches.setdefault(row_id, []).append(skill)
+        return matches
+
+    def match(self, skills, mode='substring', match='any'):
+        """Maps each matching row ID to the list of requested skills it contains.
+
+        mode='exact' matches whole skill tokens, mode='substring' keeps the
+        original substring semantics. match='all' keeps only rows containing
+        every requested skill.
+        """
+        if mode not in ('exact', 'substring'):
+            raise ValueError(f"Unknown search mode: {mode}")
+        if match not in ('any', 'all'):
+            raise ValueError(f"Unknown match type: {match}")
+
+        skills = list(dict.fromkeys(skills))
+        if not skills:
+            return {}
+        if mode == 'substring':
+            return self._substring_matches(skills, match)
+        matches = self._exact_matches(skills)
+        if match == 'all':
+            matches = {row_id: found for row_id, found in matches.items() if len(found) == len(skills)}
+        return matches
+
+    def search(self, skills, mode='substring', match='any'):
+        """Returns the set of row IDs matching the given lowercased skills."""
+        return set(self.match(skills, mode=mode, match=match))
+
+    def titles(self, row_ids):
+        return sorted({self.job_titles[row_id] for row_id in row_ids})
+
+    def rank(self, matches):
+        """Orders matched job titles by the number of requested skills they contain."""
+        best = {}
+        for row_id, found in matches.items():
+            title = self.job_titles[row_id]
+            if title not in best or len(found) > len(best[title]):
+                best[title] = found
+        return sorted(best.items(), key=lambda item: (-len(item[1]), item[0]))
+
+
+def get_skill_index(data_path='merged_data.csv'):
+    """Returns a cached SkillIndex for data_path, rebuilding it when the file changes."""
+    key = os.path.abspath(data_path)
+    fingerprint = data_fingerprint(data_path)
+
+    cached = _index_cache.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    merged_data = load_columns(data_path, ['job_title', 'skills'])
+    index = SkillIndex.from_dataframe(merged_data)
+    _index_cache[key] = (fingerprint, index)
+    return index
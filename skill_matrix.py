@@ -0,0 +1,155 @@
+import itertools
+import json
+import os
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from snapshot import artifact_path, data_fingerprint, load_columns
+
+SKILL_MATRIX_VERSION = 1
+
+_matrix_cache = {}
+
+
+def _skill_pairs(skills, skill_ids):
+    """Returns (row IDs, skill IDs), one pair per distinct skill of each job.
+
+    Skills missing from skill_ids are added in order of first appearance.
+    IDs come from the dict rather than pandas.factorize, which hashes strings
+    only up to the first NUL, so 'sql' and 'sql\x00python' would share an ID.
+    """
+    skills = pd.Series(skills, dtype=object).reset_index(drop=True)
+    skills = skills[skills.map(lambda value: isinstance(value, str))]
+    exploded = skills.str.split(',').explode().str.strip().str.lower()
+    exploded = exploded[exploded.notna() & (exploded != '')]
+    codes = np.fromiter((skill_ids.setdefault(skill, len(skill_ids)) for skill in exploded), dtype=np.int64,
+                        count=len(exploded))
+    pairs = pd.DataFrame({'row': exploded.index.to_numpy(), 'skill': codes}).drop_duplicates()
+    return pairs['row'].to_numpy(), pairs['skill'].to_numpy()
+
+
+class SkillMatrix:
+    """Canonical skill vocabulary plus a binary CSR job x skill matrix.
+
+    Skills are the comma-separated entries of the 'skills' column, stripped,
+    lowercased and deduplicated per job. Skill IDs are assigned in order of
+    first appearance, so appending jobs never renumbers existing skills.
+    """
+
+    def __init__(self, vocabulary, matrix):
+        self.vocabulary = list(vocabulary)
+        self.skill_ids = {skill: skill_id for skill_id, skill in enumerate(self.vocabulary)}
+        self.matrix = matrix.tocsr()
+
+    @classmethod
+    def from_skills(cls, skills):
+        skill_ids = {}
+        rows, codes = _skill_pairs(skills, skill_ids)
+        matrix = sparse.csr_matrix((np.ones(len(rows), dtype=np.uint8), (rows, codes)),
+                                   shape=(len(skills), len(skill_ids)))
+        return cls(skill_ids, matrix)
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    def append_rows(self, skills):
+        """Adds jobs to the bottom of the matrix, extending the vocabulary as needed."""
+        rows, codes = _skill_pairs(skills, self.skill_ids)
+        self.vocabulary.extend(itertools.islice(self.skill_ids, len(self.vocabulary), None))
+        new_rows = sparse.csr_matrix((np.ones(len(rows), dtype=np.uint8), (rows, codes)),
+                                     shape=(len(skills), len(self.vocabulary)))
+        current = self.matrix
+        current.resize((current.shape[0], len(self.vocabulary)))
+        self.matrix = sparse.vstack([current, new_rows], format='csr')
+        return self
+
+    def ids(self, skills):
+        """Maps skills to their IDs, skipping skills not in the vocabulary."""
+        return [self.skill_ids[skill] for skill in skills if skill in self.skill_ids]
+
+    def counts(self, rows=None):
+        """Returns the number of jobs per skill, optionally within a subset of rows."""
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        return np.asarray(matrix.sum(axis=0)).ravel()
+
+    def most_common(self, top_n=10, rows=None):
+        counts = self.counts(rows)
+        top_n = min(top_n, np.count_nonzero(counts))
+        if top_n <= 0:
+            return []
+        top = np.argpartition(-counts, top_n - 1)[:top_n]
+        top = top[np.argsort(-counts[top], kind='stable')]
+        return [(self.vocabulary[skill_id], int(counts[skill_id])) for skill_id in top]
+
+    def rows_with(self, skills, match='any'):
+        """Returns the row IDs of jobs having any (or all) of the given skills."""
+        ids = self.ids(skills)
+        if match == 'all' and len(ids) < len(set(skills)):
+            return np.empty(0, dtype=np.int64)
+        if not ids:
+            return np.empty(0, dtype=np.int64)
+        hits = np.asarray(self.matrix[:, ids].sum(axis=1)).ravel()
+        return np.flatnonzero(hits == len(ids) if match == 'all' else hits > 0)
+
+
+def save_skill_matrix(skill_matrix, data_path):
+    matrix_path = artifact_path(data_path, 'skills.npz')
+    vocabulary_path = artifact_path(data_path, 'skill_vocab.json')
+    with open(matrix_path + '.tmp', 'wb') as f:
+        sparse.save_npz(f, skill_matrix.matrix)
+    os.replace(matrix_path + '.tmp', matrix_path)
+    with open(vocabulary_path + '.tmp', 'w') as f:
+        json.dump({'version': SKILL_MATRIX_VERSION, 'source': data_fingerprint(data_path),
+                   'vocabulary': skill_matrix.vocabulary}, f)
+    os.replace(vocabulary_path + '.tmp', vocabulary_path)
+    return matrix_path
+
+
+def write_skill_matrix(data_path='merged_data.csv'):
+    """Builds the skill vocabulary and job x skill matrix for data_path and saves them next to it."""
+    skills = load_columns(data_path, ['skills'])['skills']
+    return save_skill_matrix(SkillMatrix.from_skills(skills), data_path)
+
+
+def load_skill_matrix(data_path='merged_data.csv'):
+    """Returns the SkillMatrix for data_path.
+
+    Uses the saved matrix when it matches the current data file, otherwise
+    builds it from the data. The result is cached until the file changes.
+    """
+    key = os.path.abspath(data_path)
+    fingerprint = data_fingerprint(data_path)
+    cached = _matrix_cache.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    skill_matrix = None
+    try:
+        with open(artifact_path(data_path, 'skill_vocab.json')) as f:
+            saved = json.load(f)
+        if saved.get('version') == SKILL_MATRIX_VERSION and saved.get('source') == fingerprint:
+            skill_matrix = SkillMatrix(saved['vocabulary'], sparse.load_npz(artifact_path(data_path, 'skills.npz')))
+    except (FileNotFoundError, ValueError):
+        pass
+    if skill_matrix is None:
+        skill_matrix = SkillMatrix.from_skills(load_columns(data_path, ['skills'])['skills'])
+
+    _matrix_cache[key] = (fingerprint, skill_matrix)
+    return skill_matrix
+
+
+def append_to_skill_matrix(new_skills, data_path='merged_data.csv'):
+    """Updates the saved matrix after jobs with new_skills have been appended to data_path.
+
+    Falls back to a full rebuild when there is no saved matrix to extend.
+    """
+    try:
+        with open(artifact_path(data_path, 'skill_vocab.json')) as f:
+            saved = json.load(f)
+        if saved.get('version') != SKILL_MATRIX_VERSION:
+            return write_skill_matrix(data_path)
+        skill_matrix = SkillMatrix(saved['vocabulary'], sparse.load_npz(artifact_path(data_path, 'skills.npz')))
+    except (FileNotFoundError, ValueError):
+        return write_skill_matrix(data_path)
+    return save_skill_matrix(skill_matrix.append_rows(new_skills), data_path)
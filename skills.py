@@ -1,40 +1,98 @@
-import pandas as pd
+import argparse
+from batch_queries import count_param, run_batch
+from recommend import get_recommender
+from skill_index import get_skill_index
 
-def find_jobs_by_skill(skills_input, data_path='merged_data.csv'):
+def find_jobs_with_matched_skills(skills_input, data_path='merged_data.csv', mode='substring', match='any'):
     try:
-        merged_data = pd.read_csv(data_path)
+        index = get_skill_index(data_path)
     except FileNotFoundError:
         print(f"Error: Could not find data file at: {data_path}")
         return []
+    except KeyError:
+        print("Error: 'skills' column not found in the data.")
+        return []
+
+    search_skills = [skill.lower().strip() for skill in skills_input.split(',')]
+
+    matches = index.match(search_skills, mode=mode, match=match)
 
-    if 'skills' not in merged_data.columns:
+    return index.rank(matches)
+
+def find_jobs_by_skill(skills_input, data_path='merged_data.csv', mode='substring', match='any'):
+    return [job for job, _ in find_jobs_with_matched_skills(skills_input, data_path, mode=mode, match=match)]
+
+def recommend_jobs(skills_input, data_path='merged_data.csv', top_k=10):
+    try:
+        recommender = get_recommender(data_path)
+    except FileNotFoundError:
+        print(f"Error: Could not find data file at: {data_path}")
+        return []
+    except KeyError:
         print("Error: 'skills' column not found in the data.")
         return []
 
     search_skills = [skill.lower().strip() for skill in skills_input.split(',')]
-    
-    matching_jobs = set()
-    for skill in search_skills:
-        jobs_with_skill = merged_data[merged_data['skills'].str.lower().str.contains(skill, na=False)]
 
-        matching_jobs.update(jobs_with_skill['job_title'].unique())
+    return recommender.recommend(search_skills, top_k=top_k)
 
-    return sorted(list(matching_jobs))
+def batch_answerer(data_path='merged_data.csv'):
+    """Returns a function answering one batch query against the data loaded once.
 
-if __name__ == '__main__':
-    data_path = 'merged_data.csv'  
+    A query is {"skills": "a, b" or ["a", "b"], "mode": ..., "match": ...,
+    "limit": ...} with the defaults of find_jobs_with_matched_skills and no
+    limit. The answer holds the number of matching titles and the ranked
+    titles with the skills each one matched.
+    """
+    index = get_skill_index(data_path)
+
+    def answer(query):
+        skills = query.get('skills')
+        if isinstance(skills, str):
+            skills = skills.split(',')
+        if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+            raise ValueError("'skills' must be a comma-separated string or a list of skills")
+        limit = count_param(query, 'limit')
+        search_skills = [skill.lower().strip() for skill in skills]
+        jobs = index.rank(index.match(search_skills, mode=query.get('mode', 'substring'),
+                                      match=query.get('match', 'any')))
+        return {'count': len(jobs),
+                'jobs': [{'title': job, 'matched_skills': matched} for job, matched in jobs[:limit]]}
 
+    return answer
+
+def interactive(data_path='merged_data.csv'):
     while True:
         user_skills_input = input("Enter one or more skills (comma-separated) to find related jobs (or 'exit' to quit): ")
         if user_skills_input.lower() == 'exit':
             break
 
-        related_jobs = find_jobs_by_skill(user_skills_input)
+        related_jobs = find_jobs_with_matched_skills(user_skills_input, data_path)
 
         if related_jobs:
             print(f"\nJobs mentioning any of the skills: '{user_skills_input}':")
-            for job in related_jobs:
-                print(f"- {job}")
+            for job, matched_skills in related_jobs:
+                print(f"- {job} ({', '.join(matched_skills)})")
         else:
             print(f"\nNo jobs found mentioning any of the skills: '{user_skills_input}'.")
         print("\n")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Find jobs mentioning the given skills.")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="Answer the JSONL queries in FILE ('-' for stdin) instead of prompting, "
+                             'one per line like {"skills": "python, sql", "match": "all"}.')
+    parser.add_argument('--output', default='-', help="File for the JSONL results of --batch (default: stdout).")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes for --batch (default: 1, 0 for all cores).")
+    parser.add_argument('--data', default='merged_data.csv')
+    args = parser.parse_args()
+
+    if args.batch is None:
+        interactive(args.data)
+    else:
+        try:
+            run_batch(batch_answerer, args.data, args.batch, args.output, args.workers)
+        except FileNotFoundError as e:
+            print(f"Error: Could not find file: {e.filename}")
+            exit(1)
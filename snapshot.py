@@ -0,0 +1,311 @@
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_VERSION = 2
+DICTIONARY_COLUMNS = ('job_title', 'Sector')
+# Strings pandas.read_csv parses as missing, so the snapshot reads back like the CSV.
+CSV_NA_VALUES = frozenset(['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+                           '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None',
+                           'n/a', 'nan', 'null'])
+# Element types of the raw column files. They carry no header, so rows can be
+# appended to them in place.
+FILE_DTYPES = {'data': np.uint8, 'offsets': np.int64, 'valid': np.bool_, 'codes': np.int32,
+               'dictionary.data': np.uint8, 'dictionary.offsets': np.int64, 'dictionary.hashes': np.uint64}
+
+
+def artifact_path(data_path, suffix):
+    """Returns the path of a file derived from data_path, e.g. merged_data.snapshot."""
+    root, _ = os.path.splitext(data_path)
+    return f"{root}.{suffix}"
+
+
+def data_fingerprint(data_path):
+    """Identifies one version of the data file by its size and modification time."""
+    stat = os.stat(data_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _is_present(value):
+    return isinstance(value, str) and value not in CSV_NA_VALUES
+
+
+def _encode_strings(values, start=0):
+    """Packs strings into one UTF-8 buffer, the end offset of each value and a validity mask.
+
+    Each value is followed by a NUL terminator, which lets readers split the
+    buffer in one pass when no value contains NUL itself; the offsets stay
+    authoritative. Offsets count from start, the length of the buffer being
+    appended to.
+    """
+    valid = np.array([_is_present(value) for value in values], dtype=bool)
+    encoded = [value.encode('utf-8') if present else b'' for value, present in zip(values, valid)]
+    ends = start + np.cumsum([len(value) + 1 for value in encoded], dtype=np.int64)
+    return b''.join(value + b'\x00' for value in encoded), ends, valid
+
+
+def _decode_strings(data, offsets, valid=None):
+    """Materializes the values between consecutive offsets as an object array, NaN where not valid."""
+    offsets = np.asarray(offsets)
+    if len(offsets) < 2:
+        return np.array([], dtype=object)
+    buffer = bytes(data[offsets[0]:offsets[-1]])
+    if buffer.count(b'\x00') == len(offsets) - 1:
+        # No value contains NUL, so splitting on the terminators cuts at the offsets.
+        values = buffer.decode('utf-8').split('\x00')[:-1]
+    else:
+        bounds = (offsets - offsets[0]).tolist()
+        values = [buffer[start:end - 1].decode('utf-8') for start, end in zip(bounds, bounds[1:])]
+    values = np.array(values, dtype=object)
+    if valid is not None:
+        values[~np.asarray(valid)] = np.nan
+    return values
+
+
+def _factorize(values):
+    """Returns (codes, unique values) for strings, -1 marking missing ones.
+
+    Unlike pandas.factorize, keeps values that differ only after a NUL apart.
+    """
+    positions = {}
+    codes = np.array([positions.setdefault(value, len(positions)) if _is_present(value) else -1
+                      for value in values], dtype=np.int32)
+    return codes, np.array(list(positions), dtype=object)
+
+
+def _hash_strings(values):
+    return pd.util.hash_array(np.asarray(values, dtype=object))
+
+
+def _column_file(snapshot_dir, column, name):
+    return os.path.join(snapshot_dir, f"{column}.{name}")
+
+
+def _write_column_files(snapshot_dir, column, arrays, mode):
+    for name, array in arrays.items():
+        with open(_column_file(snapshot_dir, column, name), mode) as f:
+            f.write(array if isinstance(array, bytes) else np.asarray(array, dtype=FILE_DTYPES[name]).tobytes())
+
+
+def _map_column_file(snapshot_dir, column, name, count):
+    """Memory-maps the first count elements of a column file."""
+    dtype = FILE_DTYPES[name]
+    if not count:
+        # Empty files cannot be memory-mapped.
+        return np.empty(0, dtype=dtype)
+    return np.memmap(_column_file(snapshot_dir, column, name), dtype=dtype, mode='r', shape=(count,))
+
+
+def _truncate_column_files(snapshot_dir, column, counts):
+    """Cuts column files back to the lengths meta.json records, dropping rows of an interrupted append."""
+    for name, count in counts.items():
+        with open(_column_file(snapshot_dir, column, name), 'r+b') as f:
+            f.truncate(count * np.dtype(FILE_DTYPES[name]).itemsize)
+
+
+def write_snapshot(merged_df, data_path):
+    """Writes a columnar snapshot of merged_df next to the CSV it was saved to.
+
+    Each column is a set of headerless files that are memory-mapped on load.
+    Columns listed in DICTIONARY_COLUMNS are stored as int32 codes plus a
+    dictionary of unique values; other columns as a packed string buffer.
+    Strings are stored Arrow-style: one UTF-8 buffer, an offsets array
+    marking where each value starts and ends, and a validity mask. The snapshot
+    records the fingerprint of data_path so readers can detect when the CSV
+    has been rewritten without the snapshot.
+    """
+    snapshot_dir = artifact_path(data_path, 'snapshot')
+    tmp_dir = snapshot_dir + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    columns = {}
+    dictionary_sizes = {}
+    for column in merged_df.columns:
+        values = merged_df[column].to_numpy(dtype=object)
+        if column in DICTIONARY_COLUMNS:
+            codes, uniques = _factorize(values)
+            data, ends, _ = _encode_strings(list(uniques))
+            _write_column_files(tmp_dir, column, {
+                'codes': codes,
+                'dictionary.data': data,
+                'dictionary.offsets': np.concatenate([[0], ends]),
+                'dictionary.hashes': _hash_strings(uniques),
+            }, 'wb')
+            columns[column] = 'dictionary'
+            dictionary_sizes[column] = len(uniques)
+        else:
+            data, ends, valid = _encode_strings(values)
+            _write_column_files(tmp_dir, column, {'data': data, 'offsets': np.concatenate([[0], ends]),
+                                                  'valid': valid}, 'wb')
+            columns[column] = 'string'
+
+    meta = {
+        'version': SNAPSHOT_VERSION,
+        'rows': len(merged_df),
+        'columns': columns,
+        'dictionary_sizes': dictionary_sizes,
+        'source': data_fingerprint(data_path),
+    }
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+
+    old_dir = snapshot_dir + '.old'
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(snapshot_dir):
+        os.rename(snapshot_dir, old_dir)
+    os.rename(tmp_dir, snapshot_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return snapshot_dir
+
+
+def _read_column_file(snapshot_dir, column, name, count, start=0):
+    """Reads count elements of a column file from element start, without memory-mapping it.
+
+    The append paths use this, since a mapped file cannot be truncated on
+    every platform.
+    """
+    dtype = np.dtype(FILE_DTYPES[name])
+    return np.fromfile(_column_file(snapshot_dir, column, name), dtype=dtype, count=count,
+                       offset=start * dtype.itemsize)
+
+
+def _append_dictionary_column(snapshot_dir, column, values, rows, size):
+    """Appends codes for values, adding the values not yet in the dictionary. Returns the new size, or None.
+
+    Existing values are found by their stored hashes, so only the entries a
+    new value collides with are decoded. Returns None if two different
+    strings share a hash; pandas hashes strings only up to the first NUL.
+    """
+    end = int(_read_column_file(snapshot_dir, column, 'dictionary.offsets', 1, size)[0])
+    hashes = _read_column_file(snapshot_dir, column, 'dictionary.hashes', size)
+
+    codes, uniques = _factorize(values)
+    unique_hashes = _hash_strings(uniques)
+    order = np.argsort(hashes, kind='stable')
+    positions = np.searchsorted(hashes[order], unique_hashes)
+    found = positions < size
+    found[found] = hashes[order[positions[found]]] == unique_hashes[found]
+
+    unique_codes = np.empty(len(uniques), dtype=np.int64)
+    for index in np.flatnonzero(found):
+        code = int(order[positions[index]])
+        offsets = _read_column_file(snapshot_dir, column, 'dictionary.offsets', 2, code)
+        data = _read_column_file(snapshot_dir, column, 'dictionary.data', int(offsets[1] - offsets[0]), int(offsets[0]))
+        if _decode_strings(data, offsets - offsets[0])[0] != uniques[index]:
+            return None
+        unique_codes[index] = code
+    added = np.flatnonzero(~found)
+    unique_codes[added] = size + np.arange(len(added))
+
+    _truncate_column_files(snapshot_dir, column, {'codes': rows, 'dictionary.data': end,
+                                                  'dictionary.offsets': size + 1, 'dictionary.hashes': size})
+    added_data, added_ends, _ = _encode_strings([uniques[index] for index in added], end)
+    _write_column_files(snapshot_dir, column, {
+        # Code -1 (missing) picks the trailing -1.
+        'codes': np.append(unique_codes, -1)[codes],
+        'dictionary.data': added_data,
+        'dictionary.offsets': added_ends,
+        'dictionary.hashes': unique_hashes[added],
+    }, 'ab')
+    return size + len(added)
+
+
+def append_snapshot(new_rows, data_path, previous_fingerprint):
+    """Appends new_rows to the snapshot after they have been appended to the CSV at data_path.
+
+    previous_fingerprint is the CSV's fingerprint before the append; the
+    existing snapshot is only extended if it matched that version, and only
+    the new rows are encoded and written. meta.json is replaced last, so an
+    interrupted append leaves a snapshot readers ignore and the next append
+    truncates. Falls back to rewriting the snapshot from the CSV when the
+    snapshot is missing, stale or has other columns.
+    """
+    snapshot_dir = artifact_path(data_path, 'snapshot')
+    meta_path = os.path.join(snapshot_dir, 'meta.json')
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+    except (FileNotFoundError, ValueError):
+        meta = None
+    if (meta is None or meta.get('version') != SNAPSHOT_VERSION or meta.get('source') != previous_fingerprint
+            or list(meta['columns']) != list(new_rows.columns)):
+        return write_snapshot(load_columns(data_path), data_path)
+
+    rows = meta['rows']
+    for column, kind in meta['columns'].items():
+        values = new_rows[column].to_numpy(dtype=object)
+        if kind == 'dictionary':
+            size = _append_dictionary_column(snapshot_dir, column, values, rows, meta['dictionary_sizes'][column])
+            if size is None:
+                return write_snapshot(load_columns(data_path), data_path)
+            meta['dictionary_sizes'][column] = size
+        else:
+            end = int(_read_column_file(snapshot_dir, column, 'offsets', 1, rows)[0])
+            _truncate_column_files(snapshot_dir, column, {'data': end, 'offsets': rows + 1, 'valid': rows})
+            data, ends, valid = _encode_strings(values, end)
+            _write_column_files(snapshot_dir, column, {'data': data, 'offsets': ends, 'valid': valid}, 'ab')
+
+    meta['rows'] = rows + len(new_rows)
+    meta['source'] = data_fingerprint(data_path)
+    with open(meta_path + '.tmp', 'w') as f:
+        json.dump(meta, f)
+    os.replace(meta_path + '.tmp', meta_path)
+    return snapshot_dir
+
+
+def read_snapshot_meta(data_path):
+    """Returns the snapshot metadata, or None if there is no up-to-date snapshot."""
+    meta_path = os.path.join(artifact_path(data_path, 'snapshot'), 'meta.json')
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if meta.get('version') != SNAPSHOT_VERSION or meta.get('source') != data_fingerprint(data_path):
+        return None
+    return meta
+
+
+def _read_snapshot_column(snapshot_dir, column, meta):
+    rows = meta['rows']
+    if meta['columns'][column] == 'dictionary':
+        size = meta['dictionary_sizes'][column]
+        offsets = _map_column_file(snapshot_dir, column, 'dictionary.offsets', size + 1)
+        dictionary = _decode_strings(_map_column_file(snapshot_dir, column, 'dictionary.data', int(offsets[-1])),
+                                     offsets)
+        # Only the dictionary is decoded; the codes stay memory-mapped and -1 reads as missing.
+        return pd.Categorical.from_codes(_map_column_file(snapshot_dir, column, 'codes', rows),
+                                         categories=pd.Index(dictionary, dtype=object))
+    offsets = _map_column_file(snapshot_dir, column, 'offsets', rows + 1)
+    return _decode_strings(_map_column_file(snapshot_dir, column, 'data', int(offsets[-1])), offsets,
+                           _map_column_file(snapshot_dir, column, 'valid', rows))
+
+
+def load_columns(data_path='merged_data.csv', columns=None):
+    """Loads the requested columns of the merged job data.
+
+    Reads the memory-mapped snapshot when it matches the current CSV and falls
+    back to parsing the CSV otherwise. Only the requested columns are
+    decoded, and dictionary columns come back as pandas Categoricals. Raises
+    FileNotFoundError if the CSV does not exist and KeyError if a requested
+    column is missing.
+    """
+    meta = read_snapshot_meta(data_path)
+    if meta is None:
+        if columns is None:
+            merged_data = pd.read_csv(data_path)
+        else:
+            merged_data = pd.read_csv(data_path, usecols=lambda column: column in columns)
+    else:
+        snapshot_dir = artifact_path(data_path, 'snapshot')
+        wanted = meta['columns'] if columns is None else [column for column in columns if column in meta['columns']]
+        merged_data = pd.DataFrame({column: _read_snapshot_column(snapshot_dir, column, meta) for column in wanted},
+                                   index=pd.RangeIndex(meta['rows']))
+
+    for column in columns or ():
+        if column not in merged_data.columns:
+            raise KeyError(column)
+    return merged_data
@@ -0,0 +1,69 @@
+import json
+import pandas as pd
+import pytest
+import demanding_jobs_skills
+import skills
+from batch_queries import run_batch
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    path = tmp_path / 'merged_data.csv'
+    pd.DataFrame({
+        'job_title': ['Data Analyst', 'Python Developer', 'Nurse'],
+        'skills': ['python, sql', 'python, docker', 'patient care'],
+        'Sector': ['Technology', 'Technology', 'Healthcare'],
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+def run(make_answer, data_path, tmp_path, lines, workers=1):
+    queries_file = tmp_path / 'queries.jsonl'
+    output_file = tmp_path / 'results.jsonl'
+    queries_file.write_text('\n'.join(lines) + '\n')
+    answered, errors = run_batch(make_answer, data_path, str(queries_file), str(output_file), workers)
+    records = [json.loads(line) for line in output_file.read_text().splitlines()]
+    assert answered == len(records) and errors == sum('error' in record for record in records)
+    return records
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_bad_skill_queries_fail_alone(data_path, tmp_path, workers):
+    records = run(skills.batch_answerer, data_path, tmp_path, [
+        '{"skills": "python", "limit": 1}',
+        '{"skills": [1, 2]}',
+        'not json',
+        '{"skills": ["sql", null]}',
+        '{"skills": "python", "limit": -1}',
+        '{"skills": "python", "limit": true}',
+        '{"skills": "python", "limit": "5"}',
+        '{"skills": "python", "mode": "regex"}',
+        '{"skills": "python", "limit": null}',
+        '[]',
+    ], workers)
+
+    assert [record['line'] for record in records] == list(range(1, 11))
+    assert records[0]['result'] == {'count': 2, 'jobs': [{'title': 'Data Analyst', 'matched_skills': ['python']}]}
+    assert records[1]['error'] == records[3]['error'] == (
+        "'skills' must be a comma-separated string or a list of skills")
+    assert records[2]['error'].startswith('Invalid JSON')
+    assert records[4]['error'] == records[5]['error'] == records[6]['error'] == (
+        "'limit' must be a non-negative integer or null")
+    assert records[7]['error'] == 'Unknown search mode: regex'
+    assert records[8]['result']['count'] == 2 and len(records[8]['result']['jobs']) == 2
+    assert records[9]['error'] == 'Expected a JSON object'
+
+
+def test_bad_sector_queries_fail_alone(data_path, tmp_path):
+    records = run(demanding_jobs_skills.batch_answerer, data_path, tmp_path, [
+        '{"sector": "technology", "top_n": 1}',
+        '{"sector": ["Technology"]}',
+        '{"sector": "Healthcare", "top_n": null}',
+        '{"sector": "Healthcare", "top_n": false}',
+        '{"sector": "Mining"}',
+    ])
+
+    assert records[0]['result'] == {'top_jobs': {'Data Analyst': 1}, 'top_skills': {'python': 2}}
+    assert records[1]['error'] == "'sector' must be a string"
+    assert records[2]['error'] == records[3]['error'] == "'top_n' must be a non-negative integer"
+    assert records[4]['error'] == 'No job postings found for the sector: Mining'
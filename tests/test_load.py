@@ -0,0 +1,111 @@
+import os
+import pandas as pd
+import pytest
+import load
+import title_dedup
+import synthetic
+from sector_rollups import build_rollups, load_rollups
+from snapshot import load_columns
+
+
+def write_source(path, titles, skills, mode='w'):
+    pd.DataFrame({'job_title': titles, 'skills': skills}).to_csv(path, mode=mode, header=mode == 'w', index=False)
+
+
+def sorted_rows(frame):
+    return frame.astype(object).sort_values('job_title', na_position='first').reset_index(drop=True)
+
+
+def fail_on_rebuild(monkeypatch):
+    """Makes the test fail if an incremental run rebuilds or rewrites the whole output."""
+    def fail(*args, **kwargs):
+        raise AssertionError("incremental run rewrote the whole output")
+    monkeypatch.setattr(load, '_rebuild_with_manifest', fail)
+    monkeypatch.setattr(load, 'write_snapshot', fail)
+
+
+def test_incremental_run_matches_a_full_run(tmp_path, monkeypatch):
+    postings = synthetic.job_postings(4_000)
+    first, second = str(tmp_path / 'first.csv'), str(tmp_path / 'second.csv')
+    sources = [{'path': path, 'title_column': 'job_title', 'skills_column': 'skills'} for path in (first, second)]
+    output_file = str(tmp_path / 'merged_data.csv')
+    old_first, old_second = postings.iloc[:1_000], postings.iloc[500:2_000]
+    old_first.to_csv(first, index=False)
+    old_second.to_csv(second, index=False)
+    load.run_incremental_etl(sources, output_file)
+
+    # New rows of the first source must not claim titles the second one contributed.
+    new_first = postings.iloc[2_000:3_000]
+    new_first = new_first[~new_first['job_title'].isin(old_second['job_title'])]
+    new_first.to_csv(first, mode='a', header=False, index=False)
+    postings.iloc[2_500:].to_csv(second, mode='a', header=False, index=False)
+    with monkeypatch.context() as patch:
+        fail_on_rebuild(patch)
+        new_rows = load.run_incremental_etl(sources, output_file)
+    assert len(new_rows) > 0
+
+    expected_file = str(tmp_path / 'expected.csv')
+    load.run_etl(sources, expected_file)
+    merged, expected = pd.read_csv(output_file), pd.read_csv(expected_file)
+    pd.testing.assert_frame_equal(sorted_rows(merged), sorted_rows(expected))
+    pd.testing.assert_frame_equal(load_columns(output_file).astype(object), merged.astype(object))
+    assert load_rollups(output_file) == build_rollups(merged)
+
+
+def test_titles_read_back_as_missing_keep_their_origin(tmp_path, monkeypatch):
+    first, second = str(tmp_path / 'first.csv'), str(tmp_path / 'second.csv')
+    sources = [{'path': path, 'title_column': 'job_title', 'skills_column': 'skills'} for path in (first, second)]
+    output_file = str(tmp_path / 'merged_data.csv')
+    # A missing source title stays missing in the output.
+    write_source(first, ['nurse'], ['care'])
+    write_source(second, [None, 'welder'], ['misc', 'welding'])
+    load.run_incremental_etl(sources, output_file)
+
+    write_source(second, [None, 'chef'], ['other', 'cooking'], mode='a')
+    with monkeypatch.context() as patch:
+        fail_on_rebuild(patch)
+        load.run_incremental_etl(sources, output_file)
+    assert pd.read_csv(output_file, keep_default_na=False)['job_title'].tolist() == ['nurse', '', 'welder', 'chef']
+
+    # The first source now claims the missing title, which the second source contributed.
+    write_source(first, [None], ['care'], mode='a')
+    rebuilds = []
+    monkeypatch.setattr(load, '_rebuild_with_manifest', lambda *args: rebuilds.append(args))
+    load.run_incremental_etl(sources, output_file)
+    assert len(rebuilds) == 1
+
+
+def test_streaming_run_matches_a_full_run(tmp_path):
+    sources = synthetic.write_sources(str(tmp_path), 3_000)
+    expected_file, output_file = str(tmp_path / 'expected.csv'), str(tmp_path / 'merged_data.csv')
+    load.run_etl(sources, expected_file)
+
+    load.run_streaming_etl(sources, output_file, chunk_rows=250)
+    assert not os.path.exists(output_file + '.tmp')
+    pd.testing.assert_frame_equal(pd.read_csv(output_file), pd.read_csv(expected_file))
+
+
+def test_streaming_run_spilled_to_sqlite_matches_a_full_run(tmp_path, monkeypatch):
+    sources = synthetic.write_sources(str(tmp_path), 3_000)
+    expected_file, output_file = str(tmp_path / 'expected.csv'), str(tmp_path / 'merged_data.csv')
+    load.run_etl(sources, expected_file)
+
+    # A 1 MB budget with 5 KB per title leaves room for about 100 titles in memory.
+    monkeypatch.setattr(title_dedup, 'BYTES_PER_HASH', 5 * 1024)
+    spills = []
+    spill = title_dedup.TitleDeduper._spill
+    monkeypatch.setattr(title_dedup.TitleDeduper, '_spill', lambda self: spills.append(spill(self)))
+    load.run_streaming_etl(sources, output_file, memory_budget_mb=1, chunk_rows=250)
+    assert len(spills) == 1
+    assert not [name for name in os.listdir(tmp_path) if name.startswith('title_dedup_')]
+    pd.testing.assert_frame_equal(pd.read_csv(output_file), pd.read_csv(expected_file))
+
+
+@pytest.mark.parametrize('near_dedupe_threshold', [None, 0.85])
+def test_parallel_run_matches_a_full_run(tmp_path, near_dedupe_threshold):
+    sources = synthetic.write_sources(str(tmp_path), 3_000)
+    expected = load.run_etl(sources, str(tmp_path / 'expected.csv'), near_dedupe_threshold)
+    merged = load.run_parallel_etl(sources, str(tmp_path / 'merged_data.csv'), 2, near_dedupe_threshold)
+    pd.testing.assert_frame_equal(merged, expected)
+    with open(tmp_path / 'merged_data.csv') as output, open(tmp_path / 'expected.csv') as expected_output:
+        assert output.read() == expected_output.read()
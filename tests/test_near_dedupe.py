@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import near_dedupe
+import synthetic
+from near_dedupe import cluster_titles, merge_near_duplicates, minhash_signatures
+
+FRAME = pd.DataFrame({
+    'job_title': ['Senior Software Engineer', 'Sr. Software Eng', 'Software Engineer, Senior', 'Registered Nurse',
+                  'Nurse Registered', 'Data Analyst', 'Senior Data Analyst', '???'],
+    'skills': ['Python, SQL', 'sql, Docker', None, 'patient care', 'Patient Care, triage', 'excel', 'tableau', None],
+})
+
+
+def test_abbreviation_and_word_order_variants_cluster():
+    canonical, similarity = cluster_titles(FRAME['job_title'])
+    assert canonical.tolist() == [0, 0, 0, 3, 3, 5, 6, 7]
+    assert similarity.tolist() == [1.0] * len(FRAME)
+
+
+def test_kept_rows_union_the_cluster_skills():
+    reduced, _ = merge_near_duplicates(FRAME)
+    assert reduced.index.tolist() == [0, 3, 5, 6, 7]
+    assert reduced['skills'].tolist()[:4] == ['Python, SQL, Docker', 'patient care, triage', 'excel', 'tableau']
+    assert pd.isna(reduced.loc[7, 'skills'])
+
+
+def test_cluster_map_lists_each_title_of_a_multi_title_cluster():
+    _, cluster_map = merge_near_duplicates(FRAME)
+    assert cluster_map.to_dict('list') == {
+        'job_title': ['Senior Software Engineer', 'Sr. Software Eng', 'Software Engineer, Senior', 'Registered Nurse',
+                      'Nurse Registered'],
+        'canonical_title': ['Senior Software Engineer'] * 3 + ['Registered Nurse'] * 2,
+        'similarity': [1.0] * 5,
+    }
+
+
+def test_signatures_are_uint32_and_titles_without_words_get_the_marker():
+    signatures = minhash_signatures(FRAME['job_title'])
+    assert signatures.dtype == np.uint32
+    assert (signatures[7] == near_dedupe.NO_WORDS).all()
+    assert (signatures[:7, 0] != near_dedupe.NO_WORDS).all()
+
+
+def test_block_size_does_not_change_the_clusters(monkeypatch):
+    titles = synthetic.job_postings(3_000)['job_title'].tolist()
+    expected = cluster_titles(titles)
+    monkeypatch.setattr(near_dedupe, 'BLOCK_ROWS', 128)
+    canonical, similarity = cluster_titles(titles)
+    assert (canonical == expected[0]).all() and (similarity == expected[1]).all()
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+from recommend import SkillRecommender
+from skill_matrix import SkillMatrix
+from skills import recommend_jobs
+
+JOBS = pd.DataFrame({
+    'job_title': ['Data Analyst', 'Python Developer', 'Registered Nurse', 'Nurse Practitioner', 'Accountant'],
+    'skills': ['python, sql, excel', 'python, docker, sql', 'patient care, triage', 'patient care, prescribing',
+               'excel, bookkeeping'],
+    'Sector': ['Technology', 'Technology', 'Healthcare', 'Healthcare', 'Finance'],
+})
+
+
+def brute_force_scores(jobs, skills):
+    """Cosine similarity of smoothed TF-IDF vectors, computed densely."""
+    vocabulary = sorted({skill.strip() for text in jobs['skills'] for skill in text.split(',')})
+    matrix = np.array([[skill in {s.strip() for s in text.split(',')} for skill in vocabulary]
+                       for text in jobs['skills']], dtype=float)
+    idf = np.log((1 + len(matrix)) / (1 + matrix.sum(axis=0))) + 1
+    weighted = matrix * idf
+    query = np.array([skill in skills for skill in vocabulary]) * idf
+    return weighted @ query / (np.linalg.norm(weighted, axis=1) * np.linalg.norm(query))
+
+
+@pytest.fixture
+def recommender():
+    return SkillRecommender(SkillMatrix.from_skills(JOBS['skills']), JOBS['job_title'])
+
+
+def test_scores_match_a_dense_computation(recommender):
+    skills = ['python', 'sql', 'patient care']
+    expected = brute_force_scores(JOBS, skills)
+    recommended = dict(recommender.recommend(skills, top_k=len(JOBS)))
+    assert recommended.keys() == {title for title, score in zip(JOBS['job_title'], expected) if score > 0}
+    for title, score in zip(JOBS['job_title'], expected):
+        assert recommended.get(title, 0.0) == pytest.approx(score, abs=1e-6)
+
+
+def test_skills_of_one_sector_rank_its_jobs_first(recommender):
+    recommended = recommender.recommend(['patient care', 'triage'])
+    assert recommended[0] == ('Registered Nurse', 1.0)
+    assert [title for title, _ in recommended] == ['Registered Nurse', 'Nurse Practitioner']
+    sectors = dict(zip(JOBS['job_title'], JOBS['Sector']))
+    assert {sectors[title] for title, _ in recommender.recommend(['python', 'docker'])} == {'Technology'}
+
+
+def test_unknown_skills_are_left_out_of_the_query(recommender):
+    assert recommender.recommend(['patient care', 'cobol']) == recommender.recommend(['patient care'])
+    assert recommender.recommend(['cobol']) == []
+
+
+def test_top_k_keeps_the_best_scores_with_ties_in_row_order(recommender):
+    # The Accountant lists fewer skills than the Data Analyst, so excel weighs more there.
+    assert [title for title, _ in recommender.recommend(['excel'], top_k=1)] == ['Accountant']
+    assert [title for title, _ in recommender.recommend(['python'])] == ['Data Analyst', 'Python Developer']
+    assert recommender.recommend(['python'], top_k=0) == []
+
+
+def test_recommend_jobs_reads_the_data_file(tmp_path):
+    data_path = str(tmp_path / 'merged_data.csv')
+    JOBS.to_csv(data_path, index=False)
+    assert recommend_jobs(' Patient Care,TRIAGE ', data_path, top_k=1) == [('Registered Nurse', 1.0)]
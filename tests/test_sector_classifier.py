@@ -0,0 +1,51 @@
+import itertools
+import numpy as np
+import pandas as pd
+import pytest
+from sector_classifier import _legacy_infer_sector_from_title, classify_titles, infer_sector_from_title
+
+TITLES = [
+    'Software Engineer', 'SOFTWARE ENGINEER', 'registered nurse', 'IT nurse', 'medical nurse developer',
+    'home health IT specialist', 'health IT specialist', 'RN case manager', 'clinical psychologist',
+    'psychologist', 'therapist developer', 'medical assistant', 'pharmacy technician', 'data analyst',
+    'financial analyst', 'bank teller', 'tax accountant', 'sales engineer', 'sales associate',
+    'marketing manager', 'PR director', 'civil engineer', 'civil construction manager', 'quality assurance',
+    'qa tester', 'mechanical designer', 'welder', 'supply chain analyst', 'supply chain coordinator',
+    'teacher', 'sales coach', 'store clerk', 'cashier', 'HR generalist', 'people partner', 'talent acquisition',
+    'paralegal', 'compliance officer', 'structural builder', 'research scientist', 'lab investigator',
+    'graphic designer', 'ux researcher', 'project manager', 'program manager', 'scrum master',
+    'help desk', 'office assistant', 'operations manager', 'branch manager', 'superintendent', 'director',
+    'chef', 'line cook', 'waitress', 'veterinarian', 'dentist', 'animal care attendant', 'warehouse driver',
+    'logistics coordinator', 'social worker', 'volunteer coordinator', 'non-profit fundraiser', 'ngo liaison',
+    'charity shop', 'barista', '', ' ', 'nan', 'None', 'Ελληνικά', 'naïve café owner', 'c#/.net lead',
+    'AI researcher', 'it', 'rn', 'data\x00nurse', 'data',
+]
+KEYWORDS = [
+    'software', 'engineer', 'it', 'ai', '.net', 'nurse', 'medical', 'home', 'health', 'rn', 'therapist',
+    'psychologist', 'clinical', 'assistant', 'doctor', 'analyst', 'bank', 'tax', 'sales', 'pr', 'market',
+    'civil', 'quality', 'qa', 'supply chain', 'teacher', 'coach', 'retail', 'store', 'clerk', 'hr', 'people',
+    'legal', 'law', 'construct', 'architect', 'research', 'scientist', 'design', 'ux', 'ui', 'project manager',
+    'scrum', 'support', 'operations', 'operations manager', 'director', 'chef', 'food', 'veterinarian',
+    'warehouse', 'driver', 'social worker', 'case manager', 'volunteer', 'charity', 'manager', 'senior',
+]
+
+
+def overlapping_titles():
+    """Titles built from every ordered pair of rule keywords, so several rules match the same title."""
+    return [f'{first} {second}' for first, second in itertools.permutations(KEYWORDS, 2)]
+
+
+@pytest.mark.parametrize('title', TITLES + [None, np.nan, 42])
+def test_infer_sector_matches_the_original_cascade(title):
+    assert infer_sector_from_title(title) == _legacy_infer_sector_from_title(title)
+
+
+def test_classify_titles_matches_the_original_cascade():
+    titles = pd.Series(TITLES + [None, np.nan, 42] + overlapping_titles() + TITLES, dtype=object)
+    expected = titles.map(_legacy_infer_sector_from_title)
+    pd.testing.assert_series_equal(classify_titles(titles), expected)
+
+
+def test_classify_titles_keeps_the_index():
+    titles = pd.Series(['chef', 'teacher'], index=[10, 3])
+    assert classify_titles(titles).to_dict() == {10: 'Food & Beverage', 3: 'Education'}
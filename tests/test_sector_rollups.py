@@ -0,0 +1,84 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from demanding_jobs_skills import sector_demand
+from sector_rollups import append_to_rollups, build_rollups, update_rollups, write_rollups
+from snapshot import artifact_path
+
+SECTORS = ['Technology', 'Healthcare', 'Non-profit/Volunteer']
+
+
+def postings(rows, seed):
+    """Postings whose titles and skills follow a long-tailed distribution, like real ones."""
+    rng = np.random.default_rng(seed)
+    weights = 1 / np.arange(1, 201)
+    weights /= weights.sum()
+    skills = [', '.join(f'skill {skill}' for skill in rng.choice(200, 3, replace=False, p=weights)) for _ in range(rows)]
+    return pd.DataFrame({'job_title': [f'title {title}' for title in rng.choice(200, rows, p=weights)],
+                         'skills': skills, 'Sector': rng.choice(SECTORS, rows)})
+
+
+def assert_exact_top_k(rollups, merged_data, top_k):
+    full = build_rollups(merged_data, top_k=None)
+    assert rollups.keys() == full.keys()
+    for sector, rollup in rollups.items():
+        assert rollup['jobs'] == full[sector]['jobs']
+        for key in ('titles', 'skills'):
+            true_counts = dict(full[sector][key])
+            assert [count for _, count in rollup[key][:top_k]] == [count for _, count in full[sector][key][:top_k]]
+            assert all(true_counts[value] == count for value, count in rollup[key])
+            listed = {value for value, _ in rollup[key]}
+            assert all(count <= rollup[f'{key}_floor'] for value, count in true_counts.items() if value not in listed)
+
+
+def test_build_keeps_top_k_and_job_totals():
+    merged_data = postings(2_000, seed=1)
+    rollups = build_rollups(merged_data, top_k=5)
+    assert_exact_top_k(rollups, merged_data, 5)
+    assert sum(rollup['jobs'] for rollup in rollups.values()) == len(merged_data)
+    assert all(len(rollup['titles']) == 10 for rollup in rollups.values())
+
+
+@pytest.mark.parametrize('new_rows', [20, 300])
+def test_update_is_exact_or_asks_for_a_rebuild(new_rows):
+    results = []
+    for seed in range(10):
+        merged_data = postings(2_000 + new_rows, seed=seed)
+        rollups = update_rollups(build_rollups(merged_data.iloc[:2_000], top_k=5), merged_data.iloc[2_000:], top_k=5)
+        if rollups is not None:
+            assert_exact_top_k(rollups, merged_data, 5)
+        results.append(rollups is not None)
+    assert any(results)
+
+
+def test_update_with_complete_counts_is_exact():
+    old_rows, new_rows = postings(500, seed=7), postings(500, seed=8)
+    rollups = update_rollups(build_rollups(old_rows, top_k=None), new_rows, top_k=1_000)
+    assert_exact_top_k(rollups, pd.concat([old_rows, new_rows], ignore_index=True), 1_000)
+
+
+def test_sector_demand_returns_at_most_top_k():
+    rollups = build_rollups(postings(2_000, seed=3), top_k=5)
+    titles, skills = sector_demand(rollups, 'non-profit/volunteer', top_n=50)
+    assert len(titles) == len(skills) == 5
+
+
+def test_ambiguous_update_falls_back_to_a_rebuild(tmp_path):
+    data_path = str(tmp_path / 'merged_data.csv')
+    old_rows = pd.DataFrame({'job_title': ['nurse'] * 3 + ['doctor'] * 2 + ['medic'], 'skills': 'care',
+                             'Sector': 'Healthcare'})
+    new_rows = pd.DataFrame({'job_title': ['medic'] * 3, 'skills': 'care', 'Sector': 'Healthcare'})
+    old_rows.to_csv(data_path, index=False)
+    write_rollups(data_path, top_k=1)
+
+    # medic, left out with a count of at most 1, may now lead nurse.
+    assert update_rollups(build_rollups(old_rows, top_k=1), new_rows, top_k=1) is None
+
+    new_rows.to_csv(data_path, mode='a', header=False, index=False)
+    append_to_rollups(new_rows, data_path)
+    with open(artifact_path(data_path, 'rollups.json')) as f:
+        saved = json.load(f)
+    assert saved['top_k'] == 1
+    assert saved['sectors']['healthcare']['titles'] == [['medic', 4], ['nurse', 3]]
+    assert saved['sectors']['healthcare']['jobs'] == 9
@@ -0,0 +1,84 @@
+import itertools
+import math
+from collections import Counter
+import numpy as np
+import pandas as pd
+import pytest
+from skill_cooccurrence import SkillCooccurrence
+from skill_matrix import SkillMatrix
+
+SECTORS = ['Technology', 'Healthcare', 'technology', 'Finance']
+
+
+def job_skills(skills_text):
+    if not isinstance(skills_text, str):
+        return set()
+    return {skill.strip().lower() for skill in skills_text.split(',')} - {''}
+
+
+def brute_force(jobs):
+    """Counts jobs per skill and per skill pair by walking every job's skill set."""
+    skill_counts, pair_counts = Counter(), Counter()
+    for skills in jobs:
+        skill_counts.update(skills)
+        pair_counts.update(itertools.permutations(skills, 2))
+    return skill_counts, pair_counts
+
+
+@pytest.fixture(scope='module')
+def postings():
+    rng = np.random.default_rng(7)
+    vocabulary = [f'skill {skill}' for skill in range(12)]
+    skills = [', '.join(rng.choice(vocabulary, rng.integers(0, 5), replace=False)) for _ in range(400)]
+    skills[3] = None
+    skills[5] = 'Skill 1, skill 1 , SKILL 2'
+    return pd.DataFrame({'skills': skills, 'Sector': rng.choice(SECTORS, len(skills))})
+
+
+@pytest.mark.parametrize('sector', [None, 'Technology', 'technology', 'HEALTHCARE', 'Finance'])
+def test_counts_lift_and_pmi_match_a_brute_force_count(postings, sector):
+    cooccurrence = SkillCooccurrence.from_skill_matrix(SkillMatrix.from_skills(postings['skills']),
+                                                       postings['Sector'])
+    in_scope = postings if sector is None else postings[postings['Sector'].str.lower() == sector.lower()]
+    skill_counts, pair_counts = brute_force(in_scope['skills'].map(job_skills))
+    jobs = len(in_scope)
+
+    for skill in cooccurrence.vocabulary:
+        related = cooccurrence.related(skill, sector=sector, top_k=100, by='count', min_count=1)
+        expected = {other: count for (first, other), count in pair_counts.items() if first == skill}
+        assert {entry['skill']: entry['jobs'] for entry in related} == expected
+        assert [entry['jobs'] for entry in related] == sorted(expected.values(), reverse=True)
+        for entry in related:
+            lift = entry['jobs'] * jobs / (skill_counts[skill] * skill_counts[entry['skill']])
+            assert entry['lift'] == pytest.approx(lift)
+            assert entry['pmi'] == pytest.approx(math.log2(lift))
+
+
+def test_sectors_are_stacked_after_the_overall_scope(postings):
+    cooccurrence = SkillCooccurrence.from_skill_matrix(SkillMatrix.from_skills(postings['skills']),
+                                                       postings['Sector'])
+    vocabulary_size = len(cooccurrence.vocabulary)
+    # Sectors keep the spelling and order of their first appearance.
+    first_spellings = postings['Sector'].groupby(postings['Sector'].str.lower(), sort=False).first()
+    assert cooccurrence.sectors == first_spellings.tolist()
+    assert cooccurrence.matrix.shape == ((len(cooccurrence.sectors) + 1) * vocabulary_size, vocabulary_size)
+    assert cooccurrence.jobs[0] == len(postings)
+    assert cooccurrence.jobs[1:].sum() == len(postings)
+
+    overall = cooccurrence.matrix[:vocabulary_size]
+    by_sector = sum(cooccurrence.matrix[scope * vocabulary_size:(scope + 1) * vocabulary_size]
+                    for scope in range(1, len(cooccurrence.sectors) + 1))
+    assert (overall != by_sector).nnz == 0
+    assert (cooccurrence.skill_counts[0] == cooccurrence.skill_counts[1:].sum(axis=0)).all()
+    for sector, scope in cooccurrence.scopes.items():
+        assert cooccurrence.jobs[scope] == (postings['Sector'].str.lower() == sector).sum()
+
+
+def test_min_count_and_unknown_names(postings):
+    cooccurrence = SkillCooccurrence.from_skill_matrix(SkillMatrix.from_skills(postings['skills']),
+                                                       postings['Sector'])
+    assert all(entry['jobs'] >= 5 for entry in cooccurrence.related('skill 1'))
+    assert cooccurrence.related('no such skill') == []
+    assert cooccurrence.related('skill 1', sector='Mining') == []
+    with pytest.raises(ValueError):
+        cooccurrence.related('skill 1', by='jaccard')
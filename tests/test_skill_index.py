@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+import synthetic
+from skill_index import SkillIndex
+
+SKILLS = ['Python, SQL', 'sql,  Power BI ', 'C++, .NET', 'r, go', None, 'docker, kubernetes', '', 'Excel,R']
+QUERIES = [['python'], ['sql'], ['power bi'], ['ower b'], ['c++'], ['.net'], ['r'], ['go'], ['c'], [''],
+           ['python', ''], ['python', 'sql'], ['python, sql'], ['sql, '], [' sql'], ['nosuchskill'],
+           ['kubernetes', 'r', 'go']]
+
+
+def baseline_matches(skills_text, skills, match='any'):
+    """The original substring semantics: pandas str.contains on each lowercased skills string."""
+    lowered = pd.Series(skills_text, dtype=object).str.lower()
+    masks = [lowered.str.contains(skill, regex=False, na=False).to_numpy(dtype=bool) for skill in skills]
+    combined = np.logical_and.reduce(masks) if match == 'all' else np.logical_or.reduce(masks)
+    return {int(row_id): [skill for skill, mask in zip(skills, masks) if mask[row_id]]
+            for row_id in np.flatnonzero(combined)}
+
+
+@pytest.mark.parametrize('match', ['any', 'all'])
+@pytest.mark.parametrize('skills', QUERIES)
+def test_substring_matches_baseline(skills, match):
+    index = SkillIndex([f'job {row_id}' for row_id in range(len(SKILLS))], SKILLS)
+    assert index.match(skills, match=match) == baseline_matches(SKILLS, skills, match)
+
+
+def test_substring_matches_baseline_on_synthetic_data():
+    postings = synthetic.job_postings(5_000)
+    index = SkillIndex.from_dataframe(postings)
+    for skills in [['kubernetes'], ['r'], ['python', ''], ['go', 'c'], ['power bi', 'sql', 'excel'], ['ql, ex']]:
+        assert index.match(skills) == baseline_matches(postings['skills'], skills)
+
+
+def test_substring_matches_baseline_on_many_rows():
+    postings = synthetic.job_postings(100_000)
+    index = SkillIndex.from_dataframe(postings)
+    for skills in [['kubernetes'], ['r'], ['python', ''], ['go', 'c'], ['power bi', 'sql', 'excel']]:
+        for match in ['any', 'all']:
+            assert index.match(skills, match=match) == baseline_matches(postings['skills'], skills, match)
+
+
+@pytest.mark.parametrize('match', ['any', 'all'])
+@pytest.mark.parametrize('skills', [['sql'], ['p', 'l']])
+def test_every_row_gets_its_own_found_list(skills, match):
+    index = SkillIndex([f'job {row_id}' for row_id in range(len(SKILLS))], SKILLS)
+    matches = index.match(skills, match=match)
+    assert len(matches) > 1
+    first, *others = matches.values()
+    first.append('changed')
+    assert all('changed' not in found for found in others)
+    assert index.match(skills, match=match) == baseline_matches(SKILLS, skills, match)
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+from skill_matrix import SkillMatrix
+
+SKILLS = pd.Series(['Python, SQL', ' sql ,Docker, python', None, '', 'SQL\x00Python, sql\x00docker', 'r', 'docker,,docker'])
+
+
+def dense(skills):
+    """Hand-built job x skill matrix, with skills numbered in order of first appearance."""
+    vocabulary = {}
+    rows = []
+    for skills_text in skills:
+        found = set()
+        if isinstance(skills_text, str):
+            for skill in skills_text.split(','):
+                skill = skill.strip().lower()
+                if skill:
+                    found.add(vocabulary.setdefault(skill, len(vocabulary)))
+        rows.append(found)
+    expected = np.zeros((len(rows), len(vocabulary)), dtype=np.uint8)
+    for row_id, found in enumerate(rows):
+        expected[row_id, list(found)] = 1
+    return list(vocabulary), expected
+
+
+def test_rows_and_columns_match_a_hand_built_matrix():
+    skill_matrix = SkillMatrix.from_skills(SKILLS)
+    vocabulary, expected = dense(SKILLS)
+    assert skill_matrix.vocabulary == vocabulary == ['python', 'sql', 'docker', 'sql\x00python', 'sql\x00docker', 'r']
+    assert skill_matrix.shape == expected.shape
+    assert (skill_matrix.matrix.toarray() == expected).all()
+    assert skill_matrix.counts().tolist() == expected.sum(axis=0).tolist() == [2, 2, 2, 1, 1, 1]
+    assert skill_matrix.counts(rows=[0, 1]).tolist() == [2, 2, 1, 0, 0, 0]
+
+
+def test_appended_rows_match_a_full_build():
+    skill_matrix = SkillMatrix.from_skills(SKILLS[:3]).append_rows(SKILLS[3:])
+    vocabulary, expected = dense(SKILLS)
+    assert skill_matrix.vocabulary == vocabulary
+    assert skill_matrix.skill_ids == {skill: skill_id for skill_id, skill in enumerate(vocabulary)}
+    assert (skill_matrix.matrix.toarray() == expected).all()
+
+
+def test_rows_with():
+    skill_matrix = SkillMatrix.from_skills(SKILLS)
+    assert skill_matrix.rows_with(['python', 'docker']).tolist() == [0, 1, 6]
+    assert skill_matrix.rows_with(['python', 'docker'], match='all').tolist() == [1]
+    assert skill_matrix.rows_with(['python', 'cobol'], match='all').tolist() == []
+    assert skill_matrix.most_common(2) == [('python', 2), ('sql', 2)]
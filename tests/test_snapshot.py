@@ -0,0 +1,113 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+import synthetic
+from snapshot import (append_snapshot, artifact_path, data_fingerprint, load_columns, read_snapshot_meta,
+                      write_snapshot)
+
+ROWS = pd.DataFrame({
+    'job_title': ['data analyst', 'café manager', 'null', 'data analyst', None, 'welder'],
+    'skills': ['python, sql', 'ü, menu', '', 'n/a', 'excel', None],
+    'Sector': ['Technology', 'Hospitality', None, 'Technology', 'Non-profit/Volunteer', 'Manufacturing'],
+})
+
+
+def as_objects(frame):
+    return frame.astype(object).where(frame.notna(), np.nan)
+
+
+def write_csv(frame, data_path):
+    frame.to_csv(data_path, index=False)
+    return pd.read_csv(data_path)
+
+
+def test_snapshot_reads_back_like_the_csv(tmp_path):
+    data_path = str(tmp_path / 'merged_data.csv')
+    csv = write_csv(pd.concat([ROWS, synthetic.job_postings(500).assign(Sector='Technology')]), data_path)
+    write_snapshot(csv, data_path)
+
+    snapshot = load_columns(data_path)
+    assert read_snapshot_meta(data_path) is not None
+    assert isinstance(snapshot['job_title'].dtype, pd.CategoricalDtype)
+    assert isinstance(snapshot['Sector'].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(as_objects(snapshot), as_objects(csv))
+    pd.testing.assert_frame_equal(as_objects(load_columns(data_path, ['Sector', 'skills'])),
+                                  as_objects(csv[['Sector', 'skills']]))
+
+
+def test_values_containing_nul_do_not_shift_later_rows(tmp_path):
+    data_path = str(tmp_path / 'merged_data.csv')
+    frame = pd.DataFrame({'job_title': ['a\x00b', 'c'], 'skills': ['x\x00y, z', 'w'], 'Sector': ['IT\x00', 'IT']})
+    write_csv(frame, data_path)
+    write_snapshot(frame, data_path)
+
+    assert load_columns(data_path).astype(object).to_dict('list') == frame.to_dict('list')
+
+
+def test_append_matches_a_full_rewrite(tmp_path):
+    data_path = str(tmp_path / 'merged_data.csv')
+    write_snapshot(write_csv(ROWS, data_path), data_path)
+    previous = data_fingerprint(data_path)
+
+    new_rows = pd.DataFrame({'job_title': ['welder', 'nurse', 'NA'], 'skills': ['welding', None, 'care'],
+                             'Sector': ['Manufacturing', 'Healthcare', None]})
+    new_rows.to_csv(data_path, mode='a', header=False, index=False)
+    csv = pd.read_csv(data_path)
+    append_snapshot(csv.iloc[len(ROWS):].reset_index(drop=True), data_path, previous)
+
+    assert read_snapshot_meta(data_path) is not None
+    pd.testing.assert_frame_equal(as_objects(load_columns(data_path)), as_objects(csv))
+    assert list(load_columns(data_path, ['Sector'])['Sector'].cat.categories) == [
+        'Technology', 'Hospitality', 'Non-profit/Volunteer', 'Manufacturing', 'Healthcare']
+
+
+def test_append_rows_with_only_missing_dictionary_values(tmp_path):
+    data_path = str(tmp_path / 'merged_data.csv')
+    write_snapshot(write_csv(ROWS, data_path), data_path)
+    previous = data_fingerprint(data_path)
+
+    pd.DataFrame({'job_title': ['nurse'], 'skills': ['care'], 'Sector': [None]}).to_csv(
+        data_path, mode='a', header=False, index=False)
+    csv = pd.read_csv(data_path)
+    append_snapshot(csv.iloc[len(ROWS):].reset_index(drop=True), data_path, previous)
+
+    pd.testing.assert_frame_equal(as_objects(load_columns(data_path)), as_objects(csv))
+
+
+def test_append_drops_the_rows_of_an_interrupted_append(tmp_path):
+    data_path = str(tmp_path / 'merged_data.csv')
+    write_snapshot(write_csv(ROWS, data_path), data_path)
+    previous = data_fingerprint(data_path)
+    # An append that wrote column data but never got to replace meta.json.
+    with open(os.path.join(artifact_path(data_path, 'snapshot'), 'skills.data'), 'ab') as f:
+        f.write(b'partial\x00')
+
+    pd.DataFrame({'job_title': ['nurse'], 'skills': ['care'], 'Sector': ['Healthcare']}).to_csv(
+        data_path, mode='a', header=False, index=False)
+    csv = pd.read_csv(data_path)
+    append_snapshot(csv.iloc[len(ROWS):].reset_index(drop=True), data_path, previous)
+
+    pd.testing.assert_frame_equal(as_objects(load_columns(data_path)), as_objects(csv))
+
+
+def test_append_to_a_stale_snapshot_rewrites_it(tmp_path):
+    data_path = str(tmp_path / 'merged_data.csv')
+    write_snapshot(write_csv(ROWS, data_path), data_path)
+
+    pd.DataFrame({'job_title': ['nurse'], 'skills': ['care'], 'Sector': ['Healthcare']}).to_csv(
+        data_path, mode='a', header=False, index=False)
+    csv = pd.read_csv(data_path)
+    append_snapshot(csv.iloc[len(ROWS):].reset_index(drop=True), data_path, {'size': 0, 'mtime_ns': 0})
+
+    assert read_snapshot_meta(data_path)['rows'] == len(csv)
+    pd.testing.assert_frame_equal(as_objects(load_columns(data_path)), as_objects(csv))
+
+
+@pytest.mark.parametrize('columns', [['job_title'], ['skills']])
+def test_missing_column_raises_key_error(tmp_path, columns):
+    data_path = str(tmp_path / 'merged_data.csv')
+    csv = write_csv(ROWS[['Sector']], data_path)
+    write_snapshot(csv, data_path)
+    with pytest.raises(KeyError):
+        load_columns(data_path, columns)
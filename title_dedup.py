@@ -0,0 +1,72 @@
+import os
+import sqlite3
+import tempfile
+import numpy as np
+import pandas as pd
+from etl_manifest import hash_titles
+
+# A sorted uint64 array costs 8 bytes per title; merging a chunk in needs
+# roughly three times that while the old and new arrays coexist.
+BYTES_PER_HASH = 24
+
+
+class TitleDeduper:
+    """Remembers which job titles have been seen, within a fixed memory budget.
+
+    Titles are kept as 64-bit hashes in a sorted NumPy array. Once the array
+    would exceed memory_budget bytes, the hashes spill to an on-disk SQLite
+    table and membership checks go to disk from then on.
+    """
+
+    def __init__(self, memory_budget, spill_dir=None):
+        self.max_hashes = max(1, memory_budget // BYTES_PER_HASH)
+        self.spill_dir = spill_dir
+        self._seen = np.empty(0, dtype=np.uint64)
+        self._db = None
+        self._db_path = None
+
+    def __len__(self):
+        if self._db is not None:
+            return self._db.execute('SELECT COUNT(*) FROM seen').fetchone()[0]
+        return len(self._seen)
+
+    def _spill(self):
+        fd, self._db_path = tempfile.mkstemp(prefix='title_dedup_', suffix='.sqlite3', dir=self.spill_dir)
+        os.close(fd)
+        self._db = sqlite3.connect(self._db_path)
+        self._db.execute('PRAGMA journal_mode=OFF')
+        self._db.execute('PRAGMA synchronous=OFF')
+        self._db.execute('CREATE TABLE seen (hash INTEGER PRIMARY KEY) WITHOUT ROWID')
+        self._db.executemany('INSERT INTO seen VALUES (?)', ((int(h),) for h in self._seen.view(np.int64)))
+        self._db.commit()
+        self._seen = np.empty(0, dtype=np.uint64)
+
+    def first_occurrences(self, titles):
+        """Returns a boolean mask of titles not seen before, and records them.
+
+        Within titles, only the first occurrence of a repeated title is kept,
+        matching drop_duplicates(keep='first') across all chunks.
+        """
+        hashes = hash_titles(titles)
+        keep = ~pd.Series(hashes).duplicated(keep='first').to_numpy()
+
+        if self._db is None and len(self._seen) + keep.sum() > self.max_hashes:
+            self._spill()
+
+        if self._db is None:
+            keep &= ~np.isin(hashes, self._seen, assume_unique=False)
+            self._seen = np.union1d(self._seen, hashes[keep])
+            return keep
+
+        cursor = self._db.cursor()
+        for position in np.flatnonzero(keep):
+            cursor.execute('INSERT OR IGNORE INTO seen VALUES (?)', (int(hashes[position:position + 1].view(np.int64)[0]),))
+            keep[position] = cursor.rowcount == 1
+        self._db.commit()
+        return keep
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            os.remove(self._db_path)
+            self._db = None